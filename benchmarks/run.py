@@ -0,0 +1,189 @@
+"""
+Benchmark suite for beauti-tex project generation.
+
+Measures the generation path from configuration loading to written
+projects and stores the results as JSON, so runs of different releases
+can be compared.
+
+Benchmarks:
+- get_config: cached and cold (cache invalidated) loading
+- safe_name: sanitizing a single name
+- safe_names: sanitizing and deduplicating 10,000 names
+- render: rendering `main.tex` and the package preamble
+- make_project: creating N projects one by one
+- make_projects: creating N projects with the batch API
+
+Configurations with increasing numbers of chapters and packages are
+generated on the fly.
+
+Usage:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --sizes 1,100 --compare results.json
+
+With `--compare`, the run exits with status 1 if a benchmark is slower
+than the baseline by more than `--threshold` (default 1.25 = 25 %).
+"""
+
+from pathlib import Path
+from contextlib import redirect_stdout
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import beauti_tex
+from beauti_tex import cache
+from beauti_tex.config import get_config
+from beauti_tex.latex.preamble import _render as render_preamble_items
+from beauti_tex.proj_builder import make_project, make_projects, _context, _load_templates
+from beauti_tex.utils import safe_name, safe_names
+
+TEMPLATES = Path(beauti_tex.__file__).parent / "templates"
+
+# (chapters, packages) of the generated configurations
+SHAPES = [(4, 15), (40, 100), (400, 1000)]
+
+
+def write_config(folder:Path, chapters:int, packages:int)->Path:
+    """Write an INI file with the given number of chapters and packages."""
+    path = folder / f"config-{chapters}-{packages}.ini"
+    lines = [
+        "[project]",
+        "style=IMRaD",
+        "folders=chapters,tables,figures",
+        "chapters=" + ",".join(f"chapter{i}" for i in range(chapters)),
+        f"templates={TEMPLATES}",
+        "size=12",
+        "clas=scrreprt",
+        "",
+        "[packages]",
+        *(f"pkg{i} = \\usepackage{{pkg{i}}}" for i in range(packages)),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def measure(func, *, repeat:int, number:int=1)->dict:
+    """Run `func` `number` times per round for `repeat` rounds and return timings per call."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_s": min(rounds),
+        "mean_s": statistics.fmean(rounds),
+        "median_s": statistics.median(rounds),
+    }
+
+
+def run(sizes:list[int], repeat:int, tmp:Path)->list[dict]:
+    """Run all benchmarks and return one result dict per benchmark."""
+    results = []
+
+    def add(name, params, timing, items=1):
+        timing["per_item_s"] = timing["min_s"] / items
+        results.append({"name": name, "params": params, **timing})
+        print(f"{name:<14} {json.dumps(params):<40} {timing['min_s'] * 1000:10.3f} ms", file=sys.stderr)
+
+    add("safe_name", {}, measure(lambda: safe_name('My "Paper": draft v1.'), repeat=repeat, number=10000))
+    names = [f"Student {i % 5000}" for i in range(10000)]
+    add("safe_names", {"names": len(names)}, measure(lambda: safe_names(names), repeat=repeat, number=10), items=len(names))
+
+    for chapters, packages in SHAPES:
+        params = {"chapters": chapters, "packages": packages}
+        ini = write_config(tmp, chapters, packages)
+        add("get_config", {**params, "cached": True}, measure(lambda: get_config(ini), repeat=repeat, number=100))
+
+        def cold():
+            cache.invalidate()
+            get_config(ini)
+        add("get_config", {**params, "cached": False}, measure(cold, repeat=repeat, number=20))
+
+        cfg = get_config(ini)
+        templates = _load_templates(cfg)
+        context = _context("Bench", cfg, {})
+        add("render", {**params, "part": "main.tex"},
+            measure(lambda: templates["main.tex"].render(context), repeat=repeat, number=1000))
+
+        # bypass the memoization to measure the rendering itself
+        items = tuple(cfg.packages.items())
+        add("render", {**params, "part": "preamble"},
+            measure(lambda: render_preamble_items.__wrapped__(items), repeat=repeat, number=100))
+
+    ini = write_config(tmp, *SHAPES[0])
+    for size in sizes:
+        def single():
+            out = Path(tempfile.mkdtemp(dir=tmp))
+            with redirect_stdout(io.StringIO()):
+                for i in range(size):
+                    make_project(f"p{i}", proj_path=out, cfg_path=ini)
+        add("make_project", {"projects": size}, measure(single, repeat=max(1, repeat // 2)), items=size)
+
+        def batch():
+            out = Path(tempfile.mkdtemp(dir=tmp))
+            make_projects([{"name": f"p{i}"} for i in range(size)], proj_path=out, cfg_path=ini, workers=8)
+        add("make_projects", {"projects": size, "workers": 8}, measure(batch, repeat=max(1, repeat // 2)), items=size)
+    return results
+
+
+def compare(results:list[dict], baseline:list[dict], threshold:float)->list[str]:
+    """Return a message for every benchmark slower than `threshold` times the baseline."""
+    base = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = base.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if old and r["min_s"] > old["min_s"] * threshold:
+            regressions.append(
+                f"{r['name']} {r['params']}: {old['min_s'] * 1000:.3f} ms -> {r['min_s'] * 1000:.3f} ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark beauti-tex project generation")
+    parser.add_argument("--sizes", default="1,100,10000",
+                        help="Comma separated project counts for make_project (default: 1,100,10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark (default: 5)")
+    parser.add_argument("--output", "-o", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Allowed slowdown factor against the baseline (default: 1.25)")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(sizes, args.repeat, Path(tmp))
+
+    report = {
+        "beauti_tex": beauti_tex.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text())["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
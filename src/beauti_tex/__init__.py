@@ -6,8 +6,16 @@ project creation and configuration management.
 
 Public API:
     - make_project: Create a structured LaTeX project.
+    - make_projects: Create many projects in parallel from specs.
+    - update_project: Re-render an existing project incrementally.
+    - async_make_project, async_make_projects: asyncio variants of the above.
     - Config: Dataclass representing project configuration.
-    - get_config: Load configuration from INI files.
+    - get_config: Load configuration from INI files or a JSON snapshot.
+    - dump_config: Write a merged configuration as JSON snapshot.
+    - ConfigError: Raised for invalid configuration files.
+
+The public names are loaded lazily on first access, so importing the
+package (e.g. for the CLI) does not pull in the project builder.
 
 Version:
     0.1.0
@@ -15,7 +23,32 @@ Version:
 
 __version__ = "0.1.0"
 
-from .proj_builder import make_project
-from .config import Config, get_config
+import importlib
+
+# public name -> submodule that defines it
+_LAZY = {
+    "make_project": "proj_builder",
+    "make_projects": "proj_builder",
+    "update_project": "proj_builder",
+    "async_make_project": "aio",
+    "async_make_projects": "aio",
+    "Config": "config",
+    "get_config": "config",
+    "dump_config": "config",
+    "ConfigError": "config",
+}
+
+__all__=["make_project","make_projects","update_project","async_make_project","async_make_projects","Config","get_config","dump_config","ConfigError"]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__=["make_project","Config","get_config"]
\ No newline at end of file
+def __dir__():
+    return sorted({*globals(), *_LAZY})
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+asyncio API for beauti-tex.
+
+Coroutines for generating projects from async applications (aiohttp,
+FastAPI, ...) without blocking the event loop. Projects are written by
+the same `beauti_tex.output.write_plan` as in the synchronous API, run in
+a worker thread with an executor that writes the files of a project
+concurrently. The output is identical to `make_project` / `make_projects`.
+
+Concurrency is bounded by a semaphore. Pass one shared
+`asyncio.Semaphore` as `limit` to bound all generations of a server.
+
+Included functions:
+- async_make_project(proj_name, *, proj_path=None, cfg_path=None, meta=None, precompile=False, backend=None, link_assets=False, limit=8) -> None
+    Create one project.
+- async_make_projects(specs, *, proj_path=None, cfg_path=None, precompile=False, backend=None, link_assets=False, limit=8) -> list[ProjectResult]
+    Create many projects concurrently.
+- async_write_plan(plan, target, *, limit=8, store=None) -> Path
+    Atomically write a plan to disk with concurrent file writes.
+
+Examples:
+>>> import asyncio
+>>> from beauti_tex.aio import async_make_project
+>>> asyncio.run(async_make_project("MyPaper"))
+"""
+
+from pathlib import Path
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+import asyncio
+from .output import DiskBackend, OutputBackend, ProjectPlan, write_plan
+from .proj_builder import ProjectResult, _Job, _prepare_batch, _prepare_project, _store
+from .store import AssetStore
+
+
+def _semaphore(limit:int|asyncio.Semaphore)->asyncio.Semaphore:
+    if isinstance(limit, asyncio.Semaphore):
+        return limit
+    if limit < 1:
+        raise ValueError("limit must be at least 1.")
+    return asyncio.Semaphore(limit)
+
+
+class _LoopExecutor(Executor):
+    """
+    Executor for `write_plan` that runs each call in its own thread pool,
+    holding the semaphore of the event loop `loop` while the call runs.
+
+    `submit` is called from the thread running `write_plan`, never from the loop.
+    """
+
+    def __init__(self, loop:asyncio.AbstractEventLoop, sem:asyncio.Semaphore):
+        self.loop = loop
+        self.sem = sem
+        # separate from the loop's default executor, which runs write_plan itself
+        self.pool = ThreadPoolExecutor(thread_name_prefix="beauti-tex-write")
+
+    async def _run(self, fn:Callable, args:tuple):
+        async with self.sem:
+            return await self.loop.run_in_executor(self.pool, fn, *args)
+
+    def submit(self, fn:Callable, /, *args, **kwargs)->Future:
+        if kwargs:
+            raise TypeError("keyword arguments are not supported")
+        return asyncio.run_coroutine_threadsafe(self._run(fn, args), self.loop)
+
+    def shutdown(self, wait:bool=True, *, cancel_futures:bool=False)->None:
+        self.pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+async def _write_plan(plan:ProjectPlan, target:Path, store:AssetStore|None, executor:_LoopExecutor)->Path:
+    return await asyncio.to_thread(write_plan, plan, target, store=store, executor=executor)
+
+
+async def async_write_plan(plan:ProjectPlan, target:Path|str, *, limit:int|asyncio.Semaphore=8, store:AssetStore|None=None)->Path:
+    """
+    Atomically create the folder `target` from `plan` without blocking the loop.
+
+    Runs `beauti_tex.output.write_plan` in a worker thread, with the files
+    written concurrently in further threads.
+
+    Args:
+        plan (ProjectPlan): Directories and files to create.
+        target (Path | str): The project folder, which must not exist yet.
+        limit (int | asyncio.Semaphore): Maximum number of concurrent file writes.
+        store (AssetStore | None): Link the static files from this store.
+
+    Returns:
+        Path: The created project folder.
+
+    Raises:
+        FileExistsError: If the project folder already exists.
+        PermissionError: If the parent folder is not writable.
+    """
+    executor = _LoopExecutor(asyncio.get_running_loop(), _semaphore(limit))
+    try:
+        return await _write_plan(plan, Path(target), store, executor)
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def _write(backend:OutputBackend, name:str, plan:ProjectPlan, executor:_LoopExecutor)->None:
+    if isinstance(backend, DiskBackend):
+        await _write_plan(plan, backend.base/name, backend.store, executor)
+    else:
+        async with executor.sem:
+            await asyncio.to_thread(backend.write, name, plan)
+
+
+async def async_make_project(proj_name:str,*,proj_path:Path|str|None=None,cfg_path:Path|str|None=None,meta:Mapping[str, str]|None=None,precompile:bool=False,backend:OutputBackend|None=None,link_assets:bool|AssetStore=False,bib_master:Path|str|None=None,bib_keys:Iterable[str]|None=None,limit:int|asyncio.Semaphore=8)->None:
+    """
+    Create a LaTeX project without blocking the event loop.
+
+    Takes the same arguments as `make_project`, plus `limit`.
+
+    Args:
+        proj_name (str): Name of the project / main folder.
+        proj_path (Path | str | None): Optional base directory. Default is the current working directory.
+        cfg_path (Path | str | None): Optional path to a configuration INI file.
+        meta (Mapping[str, str] | None): Optional titlepage fields.
+        precompile (bool): Also set up a precompiled preamble.
+        backend (OutputBackend | None): Where to write the project. Default is the disk.
+        link_assets (bool | AssetStore): Link static files from an asset store.
+        bib_master (Path | str | None): Shared `.bib` library to seed `literature.bib` from.
+        bib_keys (Iterable[str] | None): Citation keys to copy from `bib_master`.
+        limit (int | asyncio.Semaphore): Maximum number of concurrent file writes.
+
+    Raises:
+        FileExistsError: If the project folder already exists.
+        FileNotFoundError: If template files are not found.
+    """
+    executor = _LoopExecutor(asyncio.get_running_loop(), _semaphore(limit))
+    try:
+        name, plan = await asyncio.to_thread(_prepare_project, proj_name, cfg_path, meta, precompile, bib_master, bib_keys)
+        await _write(backend or DiskBackend(proj_path, store=_store(link_assets)), name, plan, executor)
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def async_make_projects(specs:Iterable[Mapping[str, object]],*,proj_path:Path|str|None=None,cfg_path:Path|str|None=None,precompile:bool=False,backend:OutputBackend|None=None,link_assets:bool|AssetStore=False,limit:int|asyncio.Semaphore=8)->list[ProjectResult]:
+    """
+    Create many LaTeX projects concurrently without blocking the event loop.
+
+    Takes the same specs as `make_projects`. A failing project does not
+    abort the others.
+
+    Args:
+        specs (Iterable[Mapping[str, object]]): One mapping per project, see `make_projects`.
+        proj_path (Path | str | None): Default base directory for all projects.
+        cfg_path (Path | str | None): Default configuration INI file for all projects.
+        precompile (bool): Set up a precompiled preamble in every project.
+        backend (OutputBackend | None): Where to write the projects. Default is the disk.
+        link_assets (bool | AssetStore): Link static files from an asset store.
+        limit (int | asyncio.Semaphore): Maximum number of concurrent file writes.
+
+    Returns:
+        list[ProjectResult]: One result per spec, in the order of `specs`.
+    """
+    executor = _LoopExecutor(asyncio.get_running_loop(), _semaphore(limit))
+    results, jobs = await asyncio.to_thread(_prepare_batch, list(specs), proj_path, cfg_path, precompile, backend, link_assets)
+
+    async def build(job:_Job)->None:
+        async with executor.sem:
+            plan = await asyncio.to_thread(job.plan)
+        await _write(job.backend, job.name, plan, executor)
+
+    try:
+        outcomes = await asyncio.gather(
+            *(build(job) for job in jobs if job is not None), return_exceptions=True,
+        )
+    finally:
+        executor.shutdown(wait=False)
+    outcomes = iter(outcomes)
+    for result, job in zip(results, jobs):
+        if job is not None:
+            error = next(outcomes)
+            if isinstance(error, BaseException):
+                if not isinstance(error, Exception):
+                    raise error
+                result.error = error
+    return results
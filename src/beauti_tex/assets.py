@@ -0,0 +1,453 @@
+"""
+Figure preprocessing for generated projects.
+
+Raw figures (multi-megapixel PNG screenshots, SVG drawings) make every
+LaTeX build slow. `process_figures` finds the images a project includes
+with `\\includegraphics` and writes print-ready versions to
+`build/figures`:
+
+- PNG images wider than `width` inches at `dpi` are downsampled with a
+  box filter and tagged with the target resolution,
+- SVG drawings are converted to PDF with `rsvg-convert` or `inkscape`,
+  if one of them is installed,
+- other formats (PDF, JPEG, EPS) are used as they are.
+
+PNG files are decoded and encoded in pure Python, so no imaging library
+is needed. Images are processed in a process pool and the results are
+kept in a cache keyed by the SHA-256 of the source, the DPI and the
+width, so an unchanged figure is never processed twice, in any project.
+
+The default configuration sets `\\graphicspath{{build/figures/}{figures/}}`,
+so LaTeX picks the processed version if there is one and the original
+otherwise. LaTeX looks for an image relative to the project folder before
+it searches `\\graphicspath`, so a PNG included with its folder
+(`\\includegraphics{figures/plot.png}`) or stored next to `main.tex` always
+resolves to the original. Such figures are reported as "original" and not
+processed; include them without the folder to use a processed copy.
+
+`build/figures/.beauti-tex-figures.json` lists the files the command
+wrote, so outputs of figures that are no longer included are removed
+without touching other files in the folder.
+
+Included classes:
+- FigureResult
+    Outcome for one figure.
+
+Included functions:
+- find_figures(project, main="main.tex") -> tuple[dict[str, Path], list[str]]
+    Images included by a project and the missing ones.
+- downsample_png(data, *, dpi=300, width=6.5) -> bytes
+    Downsample a PNG image in pure Python.
+- process_figures(project, *, dpi=300, width=6.5, workers=None, cache_dir=None, main="main.tex") -> list[FigureResult]
+    Process all figures of a project.
+
+Examples:
+>>> from beauti_tex.assets import process_figures
+>>> [r.status for r in process_figures("MyPaper", dpi=150)]
+['converted', 'cached', 'original']
+"""
+
+from pathlib import Path
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from .latex.deps import DependencyGraph, GRAPHICS_EXTENSIONS, _COMMENT, parse_refs
+
+#: Folder of the processed figures in a project.
+OUTPUT_DIR = "build/figures"
+#: Files written to `OUTPUT_DIR` by the last run, relative to the project.
+MANIFEST = ".beauti-tex-figures.json"
+
+DEFAULT_DPI = 300
+#: Widest figure in inches; the text width of an A4 or letter page with default margins.
+DEFAULT_WIDTH = 6.5
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Channels per pixel by PNG color type
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_EXTENSIONS = (*GRAPHICS_EXTENSIONS, ".svg")
+
+
+class PNGError(ValueError):
+    """Raised for PNG images that cannot be decoded."""
+
+
+@dataclass
+class FigureResult:
+    """
+    Outcome for one figure.
+
+    Attributes:
+        source (str): The image, relative to the project.
+        output (str | None): The processed image, relative to the project, or None.
+        status (str): "converted" (processed now), "cached" (taken from the cache),
+            "original" (used as it is) or "failed".
+        message (str): Reason for "original" and "failed".
+    """
+    source: str
+    output: str|None
+    status: str
+    message: str = ""
+
+
+def default_cache()->Path:
+    """Return the figure cache, `$XDG_CACHE_HOME/beauti-tex/figures`."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home()/".cache"
+    return Path(cache)/"beauti-tex"/"figures"
+
+
+# --------------------------------
+# PNG decoding and encoding
+# --------------------------------
+
+def _chunks(data:bytes)->Iterator[tuple[bytes, bytes]]:
+    if not data.startswith(_PNG_SIGNATURE):
+        raise PNGError("Not a PNG image.")
+    pos = len(_PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _unfilter(raw:bytes, height:int, stride:int, bpp:int)->list[bytearray]:
+    """Undo the per-row PNG filters."""
+    rows = []
+    prev = bytearray(stride)
+    pos = 0
+    for _ in range(height):
+        kind = raw[pos]
+        row = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if kind == 1:
+            for i in range(bpp, stride):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif kind == 2:
+            row = bytearray((a + b) & 0xFF for a, b in zip(row, prev))
+        elif kind == 3:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                a = row[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        elif kind != 0:
+            raise PNGError(f"Unknown filter type {kind}.")
+        rows.append(row)
+        prev = row
+    return rows
+
+
+def _decode(data:bytes)->tuple[int, int, int, list[bytearray]]:
+    """Decode a PNG into width, height, channels and 8 bit rows (palettes are expanded)."""
+    header = None
+    palette = b""
+    alpha = b""
+    idat = []
+    for kind, body in _chunks(data):
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            alpha = body
+        elif kind == b"IDAT":
+            idat.append(body)
+    if header is None:
+        raise PNGError("PNG image without header.")
+    width, height, depth, color, _, _, interlace = header
+    if interlace:
+        raise PNGError("Interlaced PNG images are not supported.")
+    if color not in _CHANNELS or depth not in (1, 2, 4, 8, 16):
+        raise PNGError(f"Unsupported PNG format (color type {color}, bit depth {depth}).")
+    channels = _CHANNELS[color]
+    bits = channels*depth
+    stride = (width*bits + 7)//8
+    rows = _unfilter(zlib.decompress(b"".join(idat)), height, stride, max(1, bits//8))
+
+    if depth == 16:
+        rows = [row[::2] for row in rows]
+    elif depth < 8:
+        scale = 1 if color == 3 else 255//((1 << depth) - 1)
+        mask = (1 << depth) - 1
+        per_byte = 8//depth
+        rows = [
+            bytearray(((byte >> (8 - depth*(k + 1))) & mask)*scale for byte in row for k in range(per_byte))[:width]
+            for row in rows
+        ]
+    if color == 3:
+        colors = len(palette)//3
+        alpha = alpha.ljust(colors, b"\xff")[:colors] if alpha else b""
+        if alpha:
+            table = [palette[3*i:3*i + 3] + alpha[i:i + 1] for i in range(colors)]
+            channels = 4
+        else:
+            table = [palette[3*i:3*i + 3] for i in range(colors)]
+            channels = 3
+        rows = [bytearray(b"".join(table[i] for i in row)) for row in rows]
+    return width, height, channels, rows
+
+
+def _chunk(kind:bytes, body:bytes)->bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+def _encode(width:int, height:int, channels:int, rows:list[bytes], dpi:int)->bytes:
+    color = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    ppm = round(dpi/0.0254)
+    raw = b"".join(b"\x00" + bytes(row) for row in rows)
+    return b"".join((
+        _PNG_SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0)),
+        _chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1)),
+        _chunk(b"IDAT", zlib.compress(raw, 9)),
+        _chunk(b"IEND", b""),
+    ))
+
+
+def downsample_png(data:bytes, *, dpi:int=DEFAULT_DPI, width:float=DEFAULT_WIDTH)->bytes:
+    """
+    Downsample a PNG image to at most `width` inches at `dpi`.
+
+    The image is reduced by an integer factor with a box filter (the
+    average of every factor x factor block). Images that are small enough
+    are returned unchanged.
+
+    Args:
+        data (bytes): The PNG image.
+        dpi (int): Target resolution in dots per inch.
+        width (float): Widest printed size in inches.
+
+    Returns:
+        bytes: The downsampled 8 bit PNG image, or `data` itself.
+
+    Raises:
+        PNGError: If the image cannot be decoded, e.g. an interlaced PNG.
+    """
+    w, h, channels, rows = _decode(data)
+    factor = math.ceil(w/(dpi*width))
+    if factor <= 1:
+        return data
+    out_w = math.ceil(w/factor)
+    pad = [0]*(out_w*factor - w)
+    out_rows = []
+    for y in range(0, h, factor):
+        block = rows[y:y + factor]
+        sums = list(map(sum, zip(*block))) if len(block) > 1 else list(block[0])
+        # pixels per output pixel; the last column may be narrower
+        counts = [factor*len(block)]*out_w
+        counts[-1] = (factor - len(pad))*len(block)
+        out = bytearray(out_w*channels)
+        for ch in range(channels):
+            channel = sums[ch::channels] + pad
+            totals = map(sum, zip(*(channel[k::factor] for k in range(factor))))
+            out[ch::channels] = bytes(map(lambda total, n: (total + n//2)//n, totals, counts))
+        out_rows.append(out)
+    return _encode(out_w, len(out_rows), channels, out_rows, dpi)
+
+
+# --------------------------------
+# finding and processing figures
+# --------------------------------
+
+def find_figures(project:Path|str, main:str="main.tex")->tuple[dict[str, Path], list[str]]:
+    """
+    Find the images a project includes with `\\includegraphics`.
+
+    Images are resolved like graphicx does, trying the `\\graphicspath`
+    folders (except `build/figures`) and the extensions pdflatex accepts;
+    SVG files are found as well, since they are converted to PDF.
+
+    Args:
+        project (Path | str): The project folder.
+        main (str): Name of the main document.
+
+    Returns:
+        tuple[dict[str, Path], list[str]]: The output name of every found image
+            (relative to the graphics path it was found in) mapped to its file,
+            and the arguments of `\\includegraphics` that match no file.
+
+    Raises:
+        FileNotFoundError: If `main` does not exist.
+    """
+    project = Path(project)
+    graph = DependencyGraph.scan(project, main)
+    refs = []
+    for rel in graph.dependencies():
+        if rel.endswith(".tex"):
+            text = (project/rel).read_text(encoding="utf-8", errors="replace")
+            refs += parse_refs("\n".join(_COMMENT.sub("", line) for line in text.splitlines()))
+    folders = [""] + [arg for kind, arg in refs if kind == "graphicspath" and arg.rstrip("/") != OUTPUT_DIR]
+
+    found, missing = {}, []
+    for kind, arg in refs:
+        if kind != "graphics":
+            continue
+        extensions = ("",) if Path(arg).suffix else _EXTENSIONS
+        match = next(
+            ((arg + ext, project/folder/(arg + ext)) for folder in folders for ext in extensions
+             if (project/folder/(arg + ext)).is_file()),
+            None,
+        )
+        if match is None:
+            missing.append(arg)
+        else:
+            found.setdefault(Path(match[0]).as_posix(), match[1])
+    return found, list(dict.fromkeys(missing))
+
+
+def _svg_command(source:Path, dest:Path)->list[str]|None:
+    if shutil.which("rsvg-convert"):
+        return ["rsvg-convert", "-f", "pdf", "-o", str(dest), str(source)]
+    if shutil.which("inkscape"):
+        return ["inkscape", str(source), "--export-type=pdf", f"--export-filename={dest}"]
+    return None
+
+
+def _process(source:Path, cached:Path, dpi:int, width:float)->str:
+    """Process one figure into `cached`; return an error message or ""."""
+    tmp = cached.with_name(f".{cached.name}.{os.getpid()}.tmp")
+    try:
+        if source.suffix.lower() == ".svg":
+            cmd = _svg_command(source, tmp)
+            if cmd is None:
+                return "no SVG converter found (install rsvg-convert or inkscape)"
+            proc = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, timeout=300)
+            if proc.returncode != 0 or not tmp.is_file():
+                return proc.stderr.decode(errors="replace").strip() or f"{cmd[0]} failed"
+        else:
+            tmp.write_bytes(downsample_png(source.read_bytes(), dpi=dpi, width=width))
+        os.replace(tmp, cached)
+        return ""
+    except (OSError, ValueError, IndexError, zlib.error, subprocess.SubprocessError) as e:
+        return str(e)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _install(cached:Path, dest:Path)->None:
+    """Copy a cached figure into the project unless it is already there, keeping mtimes stable."""
+    data = cached.read_bytes()
+    if dest.is_file() and dest.read_bytes() == data:
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _prune(project:Path, keep:set[str])->None:
+    """Remove outputs of earlier runs that are not in `keep` and record `keep` in the manifest."""
+    output_dir = project/OUTPUT_DIR
+    manifest = output_dir/MANIFEST
+    try:
+        previous = set(json.loads(manifest.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        previous = set()
+    for rel in previous - keep:
+        # only files below the output folder, even if the manifest was edited
+        if Path(rel).parts[:2] == Path(OUTPUT_DIR).parts and ".." not in Path(rel).parts:
+            (project/rel).unlink(missing_ok=True)
+    if not keep and not output_dir.is_dir():
+        return
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp = manifest.with_name(f"{MANIFEST}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(sorted(keep), indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp, manifest)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def process_figures(project:Path|str, *, dpi:int=DEFAULT_DPI, width:float=DEFAULT_WIDTH, workers:int|None=None, cache_dir:Path|str|None=None, main:str="main.tex")->list[FigureResult]:
+    """
+    Process the figures of a project into `build/figures`.
+
+    Figures missing from the cache are processed in a process pool. Outputs
+    of earlier runs that no longer belong to a figure are removed, so a
+    stale version never shadows the original; other files in `build/figures`
+    are left alone. PNG figures that LaTeX finds relative to the project
+    folder, before it searches `\\graphicspath`, are used as they are.
+
+    Args:
+        project (Path | str): The project folder.
+        dpi (int): Target resolution in dots per inch.
+        width (float): Widest printed size of a figure in inches.
+        workers (int | None): Number of processes, default the number of CPUs.
+        cache_dir (Path | str | None): Cache folder, default `default_cache()`.
+        main (str): Name of the main document.
+
+    Returns:
+        list[FigureResult]: One result per figure, in the order they are included.
+
+    Raises:
+        FileNotFoundError: If `main` does not exist.
+        ValueError: If `dpi` or `width` is not positive.
+    """
+    if dpi <= 0 or width <= 0:
+        raise ValueError("dpi and width must be positive.")
+    project = Path(project)
+    cache = Path(cache_dir) if cache_dir is not None else default_cache()
+    cache.mkdir(parents=True, exist_ok=True)
+    figures, _ = find_figures(project, main)
+
+    results = {}
+    targets = {}
+    jobs = {}
+    for name, source in figures.items():
+        suffix = source.suffix.lower()
+        if suffix not in (".png", ".svg"):
+            results[name] = FigureResult(name, None, "original", f"{suffix[1:].upper()} is used as it is")
+            continue
+        if suffix != ".svg" and source == project/name:
+            # LaTeX tries the path itself before \graphicspath, so a processed copy would never be used
+            results[name] = FigureResult(name, None, "original",
+                                         "found relative to the project folder, which LaTeX searches before "
+                                         "\\graphicspath; include it without its folder to use a processed copy")
+            continue
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        out_suffix = ".pdf" if suffix == ".svg" else ".png"
+        cached = cache/f"{digest}-{dpi}dpi-{width:g}in{out_suffix}"
+        targets[name] = cached
+        output = Path(OUTPUT_DIR, name).with_suffix(out_suffix).as_posix()
+        if cached.is_file():
+            results[name] = FigureResult(name, output, "cached")
+        else:
+            jobs[name] = output
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(_process, figures[name], targets[name], dpi, width) for name in jobs}
+            errors = {name: future.result() for name, future in futures.items()}
+    else:
+        errors = {name: _process(figures[name], targets[name], dpi, width) for name in jobs}
+    for name, output in jobs.items():
+        if errors[name]:
+            results[name] = FigureResult(name, None, "failed", errors[name])
+        else:
+            results[name] = FigureResult(name, output, "converted")
+
+    keep = set()
+    for name, result in results.items():
+        if result.output is not None:
+            _install(targets[name], project/result.output)
+            keep.add(result.output)
+    _prune(project, keep)
+    return [results[name] for name in figures]
@@ -0,0 +1,309 @@
+"""
+Compile generated projects in parallel.
+
+`build_projects` runs the LaTeX compiler over many project folders with
+a pool of workers. Every project gets a timeout, and projects whose
+sources did not change since their last successful build are skipped:
+the SHA-256 of all source files is stored in `.beauti-tex-build.json`
+after a successful build. It is taken before the compiler starts, so a
+source saved while LaTeX runs is built again next time. Auxiliary files,
+hidden files and `_minted` caches written by the compiler are not part
+of the hash. The LaTeX log of every build is condensed
+into a `LogSummary` with the errors, warnings and bad boxes.
+
+By default a project is compiled with its `latex-build.sh` (see
+`--precompile`) if it has one, otherwise with
+`latexmk -pdf -interaction=nonstopmode -halt-on-error main.tex`.
+
+Included classes:
+- LogSummary
+    Errors, warnings and bad boxes of a LaTeX log.
+- BuildResult
+    Outcome of building one project.
+
+Included functions:
+- find_projects(paths) -> list[Path]
+    Expand folders into the project folders they contain.
+- source_hash(project, main="main.tex") -> str
+    Hash of all source files of a project.
+- summarize_log(text) -> LogSummary
+    Condense a LaTeX log.
+- build_project(project, *, command=None, timeout=600.0, force=False, main="main.tex") -> BuildResult
+    Build one project.
+- build_projects(projects, *, workers=4, ...) -> list[BuildResult]
+    Build many projects in parallel.
+
+Examples:
+>>> from beauti_tex.build import build_projects, find_projects
+>>> results = build_projects(find_projects(["papers"]), workers=8, timeout=120)
+>>> [r.status for r in results]
+['built', 'skipped']
+"""
+
+from pathlib import Path
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import contextvars
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import time
+from .latex.precompile import SCRIPT_NAME
+from .profiling import stage
+
+#: Build state of a project, written after a successful build.
+BUILD_STATE = ".beauti-tex-build.json"
+
+DEFAULT_COMMAND = ("latexmk", "-pdf", "-interaction=nonstopmode", "-halt-on-error")
+
+# Auxiliary files written by LaTeX and latexmk, never part of the sources
+_AUX_SUFFIXES = frozenset({
+    ".aux", ".log", ".fls", ".fdb_latexmk", ".out", ".toc", ".lof", ".lot", ".bbl", ".blg",
+    ".bcf", ".xml", ".synctex", ".gz", ".fmt", ".nav", ".snm", ".idx", ".ind", ".ilg",
+})
+
+# Number of error lines kept in a summary
+_MAX_ERRORS = 10
+
+
+@dataclass
+class LogSummary:
+    """
+    Condensed LaTeX log.
+
+    Attributes:
+        errors (list[str]): Error messages (lines starting with "!") with their line number, if known.
+        warnings (int): Number of LaTeX and package warnings.
+        badboxes (int): Number of overfull and underfull boxes.
+    """
+    errors: list[str] = field(default_factory=list)
+    warnings: int = 0
+    badboxes: int = 0
+
+    def __str__(self)->str:
+        return f"{len(self.errors)} errors, {self.warnings} warnings, {self.badboxes} bad boxes"
+
+
+@dataclass
+class BuildResult:
+    """
+    Outcome of building one project.
+
+    Attributes:
+        project (Path): The project folder.
+        status (str): "built", "skipped", "failed" or "timeout".
+        duration (float): Wall time of the compiler in seconds.
+        returncode (int | None): Exit status of the compiler, None if it did not finish.
+        summary (LogSummary): Summary of the LaTeX log (or the compiler output if there is no log).
+        source_hash (str): Hash of the sources that were built.
+    """
+    project: Path
+    status: str
+    duration: float = 0.0
+    returncode: int | None = None
+    summary: LogSummary = field(default_factory=LogSummary)
+    source_hash: str = ""
+
+    @property
+    def ok(self)->bool:
+        """bool: True if the project was built or is up to date."""
+        return self.status in ("built", "skipped")
+
+
+def find_projects(paths:Iterable[Path|str], main:str="main.tex")->list[Path]:
+    """
+    Expand folders into project folders.
+
+    A folder containing `main` is a project, otherwise its direct sub
+    folders containing `main` are.
+
+    Args:
+        paths (Iterable[Path | str]): Project folders or folders of projects.
+        main (str): Name of the main document.
+
+    Returns:
+        list[Path]: Project folders without duplicates, in the given order.
+    """
+    projects = {}
+    for path in map(Path, paths):
+        if (path/main).is_file():
+            projects[path] = None
+        elif path.is_dir():
+            projects.update((p, None) for p in sorted(path.iterdir()) if (p/main).is_file())
+    return list(projects)
+
+
+def _is_source(rel:Path, main:str)->bool:
+    if any(part.startswith((".", "_minted")) for part in rel.parts):
+        return False
+    if rel.suffix in _AUX_SUFFIXES:
+        return False
+    # main.pdf, main.dvi, ... are outputs of the build
+    return not (len(rel.parts) == 1 and rel.stem == Path(main).stem and rel.suffix != ".tex")
+
+
+def source_hash(project:Path|str, main:str="main.tex")->str:
+    """
+    Return the SHA-256 of all source files of a project.
+
+    Hidden files, auxiliary files, `_minted` caches and the outputs of `main` are ignored;
+    file names are part of the hash.
+    """
+    project = Path(project)
+    digest = hashlib.sha256()
+    files = []
+    for root, dirs, names in os.walk(project):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            rel = Path(root, name).relative_to(project)
+            if _is_source(rel, main):
+                files.append(rel)
+    for rel in sorted(files):
+        digest.update(rel.as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256((project/rel).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def summarize_log(text:str)->LogSummary:
+    """
+    Condense a LaTeX log into errors, warnings and bad boxes.
+
+    Args:
+        text (str): Content of a `.log` file or compiler output.
+
+    Returns:
+        LogSummary: The summary; at most 10 errors are kept.
+    """
+    summary = LogSummary()
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("! "):
+            if len(summary.errors) < _MAX_ERRORS:
+                where = next((l.split(" ", 1)[0] for l in lines[i + 1:i + 8] if l.startswith("l.")), "")
+                summary.errors.append(f"{line[2:].strip()} ({where})" if where else line[2:].strip())
+        elif "Warning:" in line and ("LaTeX" in line or line.startswith("Package") or line.startswith("Class")):
+            summary.warnings += 1
+        elif line.startswith(("Overfull \\", "Underfull \\")):
+            summary.badboxes += 1
+    return summary
+
+
+def _command(project:Path, command:Sequence[str]|None, main:str)->list[str]:
+    if command is not None:
+        return [*command, main]
+    if (project/SCRIPT_NAME).is_file():
+        return ["sh", SCRIPT_NAME]
+    return [*DEFAULT_COMMAND, main]
+
+
+def _run(cmd:list[str], cwd:Path, timeout:float)->tuple[int|None, str]:
+    """Run the compiler, killing its whole process group on timeout."""
+    posix = os.name == "posix"
+    with subprocess.Popen(
+        cmd, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        start_new_session=posix,
+    ) as proc:
+        try:
+            out, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            if posix:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+            out, _ = proc.communicate()
+            return None, out.decode(errors="replace")
+    return proc.returncode, out.decode(errors="replace")
+
+
+def build_project(project:Path|str, *, command:Sequence[str]|None=None, timeout:float=600.0, force:bool=False, main:str="main.tex")->BuildResult:
+    """
+    Build one project unless its sources are unchanged since the last successful build.
+
+    Args:
+        project (Path | str): The project folder.
+        command (Sequence[str] | None): Compiler command; the name of the main document
+            is appended. Default is `latex-build.sh` if present, else latexmk.
+        timeout (float): Seconds before the compiler is killed.
+        force (bool): Build even if the sources are unchanged.
+        main (str): Name of the main document.
+
+    Returns:
+        BuildResult: The outcome, including a summary of the LaTeX log.
+
+    Raises:
+        FileNotFoundError: If the compiler executable does not exist.
+    """
+    project = Path(project)
+    digest = source_hash(project, main)
+    state_file = project/BUILD_STATE
+    if not force and state_file.is_file():
+        try:
+            state = json.loads(state_file.read_text())
+        except ValueError:
+            state = {}
+        if state.get("source_hash") == digest:
+            return BuildResult(project, "skipped", source_hash=digest)
+
+    with stage("compile"):
+        start = time.perf_counter()
+        returncode, output = _run(_command(project, command, main), project, timeout)
+        duration = time.perf_counter() - start
+
+    log = project/Path(main).with_suffix(".log")
+    text = log.read_text(encoding="utf-8", errors="replace") if log.is_file() else output
+    summary = summarize_log(text)
+    if returncode is None:
+        status = "timeout"
+    elif returncode == 0:
+        status = "built"
+        # the hash from before the compile, so sources saved while LaTeX ran are built next time
+        state_file.write_text(json.dumps({"source_hash": digest, "duration": duration}) + "\n")
+    else:
+        status = "failed"
+        if not summary.errors:
+            summary.errors.append(output.strip().splitlines()[-1] if output.strip() else f"exit status {returncode}")
+    return BuildResult(project, status, duration, returncode, summary, digest)
+
+
+def build_projects(projects:Iterable[Path|str], *, workers:int=4, command:Sequence[str]|None=None, timeout:float=600.0, force:bool=False, main:str="main.tex", on_result:Callable[[BuildResult], None]|None=None)->list[BuildResult]:
+    """
+    Build many projects in parallel.
+
+    A failing project does not stop the others. Projects are scheduled in
+    the given order, so put the slowest first to shorten the total time.
+
+    Args:
+        projects (Iterable[Path | str]): Project folders, see `find_projects`.
+        workers (int): Number of projects compiled at the same time.
+        command (Sequence[str] | None): Compiler command, see `build_project`.
+        timeout (float): Seconds per project before its compiler is killed.
+        force (bool): Build even if the sources are unchanged.
+        main (str): Name of the main document.
+        on_result (Callable[[BuildResult], None] | None): Called with every result
+            as soon as its project is done, e.g. to print progress.
+
+    Returns:
+        list[BuildResult]: One result per project, in the order of `projects`.
+
+    Raises:
+        ValueError: If `workers` is less than 1.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    def build(project:Path|str)->BuildResult:
+        try:
+            result = build_project(project, command=command, timeout=timeout, force=force, main=main)
+        except OSError as e:
+            result = BuildResult(Path(project), "failed", summary=LogSummary(errors=[str(e)]))
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # every build runs in a copy of this context, so profiling hooks see its stages
+        futures = [pool.submit(contextvars.copy_context().run, build, project) for project in projects]
+        return [future.result() for future in futures]
@@ -0,0 +1,186 @@
+"""
+Process-wide caches for beauti-tex.
+
+Parsed configurations and compiled templates are kept in memory and
+reused as long as the files they were built from are unchanged. A file
+counts as unchanged if its path, modification time and size (and
+optionally a hash of its content) are the same as when it was loaded.
+
+Included classes:
+- FileCache
+    Thread-safe LRU cache of values derived from files.
+
+Included functions:
+- load_template(path: Path | str) -> Template
+    Return the compiled template for a file, reading it only when it changed.
+- load_asset(path: Path | str) -> bytes
+    Return the raw content of a static template asset.
+- load_layout(path: Path | str) -> Layout
+    Return the compiled project layout of a layout file.
+- invalidate(path: Path | str | None = None) -> None
+    Drop cached configs and templates.
+
+Examples:
+>>> from beauti_tex.cache import load_template
+>>> t = load_template("templates/main.tex")
+>>> t is load_template("templates/main.tex")
+True
+"""
+
+from pathlib import Path
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Generic, TypeVar
+import hashlib
+import threading
+from .latex.template import Template
+from .layout import Layout
+from .styles import registry
+
+T = TypeVar("T")
+
+
+class FileCache(Generic[T]):
+    """
+    Thread-safe LRU cache of values derived from one or more files.
+
+    Entries are looked up by the list of source paths and are reloaded
+    when any source file changed its modification time or size.
+
+    Attributes:
+        maxsize (int): Maximum number of cached entries.
+        hash_content (bool): Also compare a SHA-256 of the file contents.
+            This catches edits that keep mtime and size but costs a read.
+    """
+
+    def __init__(self, maxsize:int=128, *, hash_content:bool=False):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.hash_content = hash_content
+        self._entries: OrderedDict[tuple[str, ...], tuple[tuple, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _signature(self, paths:tuple[str, ...])->tuple:
+        signature = []
+        for path in paths:
+            try:
+                st = Path(path).stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{path} not found!") from None
+            sig = (st.st_mtime_ns, st.st_size)
+            if self.hash_content:
+                sig += (hashlib.sha256(Path(path).read_bytes()).hexdigest(),)
+            signature.append(sig)
+        return tuple(signature)
+
+    def get(self, paths:Path|str|Sequence[Path|str], loader:Callable[[], T])->T:
+        """
+        Return the cached value for `paths`, calling `loader` if it is stale.
+
+        Args:
+            paths (Path | str | Sequence[Path | str]): Source file(s) of the value.
+            loader (Callable[[], T]): Builds the value from the source files.
+
+        Returns:
+            T: The cached or freshly loaded value.
+
+        Raises:
+            FileNotFoundError: If one of the source files does not exist.
+        """
+        if isinstance(paths, (str, Path)):
+            paths = (paths,)
+        key = tuple(str(Path(p).absolute()) for p in paths)
+        signature = self._signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, path:Path|str|None=None)->None:
+        """
+        Drop cached entries.
+
+        Args:
+            path (Path | str | None): Only drop entries built from this file.
+                                      If omitted, the whole cache is cleared.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = str(Path(path).absolute())
+            for key in [k for k in self._entries if path in k]:
+                del self._entries[key]
+
+    def __len__(self)->int:
+        return len(self._entries)
+
+
+#: Parsed configurations, keyed by the default and user INI files.
+config_cache: FileCache = FileCache(maxsize=32)
+#: Compiled templates, keyed by the template file.
+template_cache: FileCache[Template] = FileCache(maxsize=256)
+
+
+def load_template(path:Path|str)->Template:
+    """
+    Return the compiled template for `path`.
+
+    The file is only read and compiled again if it changed since the
+    last call.
+
+    Args:
+        path (Path | str): Path to the template file.
+
+    Returns:
+        Template: The compiled template.
+
+    Raises:
+        FileNotFoundError: If the template file does not exist.
+    """
+    return template_cache.get(path, lambda: Template.from_file(path))
+
+
+def load_asset(path:Path|str)->bytes:
+    """
+    Return the content of a static asset file, such as a logo in `templates/assets`.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    return template_cache.get(path, lambda: Path(path).read_bytes())
+
+
+def load_layout(path:Path|str)->Layout:
+    """
+    Return the compiled layout for `path`, parsing it only when it changed.
+
+    Raises:
+        FileNotFoundError: If the layout file does not exist.
+        LayoutError: If the layout is invalid.
+    """
+    return template_cache.get(path, lambda: Layout.from_file(path))
+
+
+def invalidate(path:Path|str|None=None)->None:
+    """
+    Drop cached configurations and templates.
+
+    Args:
+        path (Path | str | None): Only drop entries built from this file.
+                                  If omitted, all caches are cleared and
+                                  the style folders are scanned again.
+    """
+    config_cache.invalidate(path)
+    template_cache.invalidate(path)
+    if path is None:
+        registry.refresh()
@@ -0,0 +1,207 @@
+"""
+Check generated projects for drift from their templates.
+
+`check_projects` walks any number of project trees and reports
+
+- `placeholder`: unfilled `<<NAME>>` placeholders, e.g. `<<TITLE>>` left
+  over from `titlepage.tex`,
+- `missing-file`: files referenced with `\\input`, `\\include`,
+  `\\includegraphics` or `\\addbibresource` that do not exist,
+- `empty-preamble`: a `pak.tex` without any package.
+
+It is built as a generator pipeline: project folders are discovered
+lazily, checked in a process pool with a bounded number of projects in
+flight, and findings are yielded as soon as a project is done. Files are
+scanned through `mmap`, so neither the number of projects nor the size of
+a file affects the memory use.
+
+Included classes:
+- Finding
+    One problem found in a project.
+
+Included functions:
+- walk_projects(paths, main="main.tex") -> Iterator[Path]
+    Lazily find project folders below the given paths.
+- check_project(project, main="main.tex") -> list[Finding]
+    Check one project.
+- check_projects(paths, *, workers=None, main="main.tex") -> Iterator[Finding]
+    Check all projects below the given paths in parallel.
+
+Examples:
+>>> from beauti_tex.check import check_projects
+>>> for finding in check_projects(["papers"]):
+...     print(finding.to_json())
+{"project": "papers/A", "file": "chapters/titlepage.tex", "line": 7, "code": "placeholder", "message": "Unfilled placeholder <<TITLE>>"}
+"""
+
+from pathlib import Path
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+import json
+import mmap
+import os
+import re
+from .latex.deps import DependencyGraph
+from .latex.template import _PLACEHOLDER
+
+_PLACEHOLDER_BYTES = re.compile(_PLACEHOLDER.pattern.encode())
+# Anything but whitespace and comments counts as content of pak.tex
+_CONTENT = re.compile(rb"^[ \t]*[^%\s]", re.MULTILINE)
+
+PREAMBLE = "pak.tex"
+
+
+@dataclass(frozen=True)
+class Finding:
+    """
+    One problem found in a project.
+
+    Attributes:
+        project (str): The project folder.
+        file (str): File relative to the project, with '/'.
+        line (int): Line number, 0 if the finding concerns the whole file.
+        code (str): "placeholder", "missing-file", "empty-preamble" or "unreadable".
+        message (str): Human readable description.
+    """
+    project: str
+    file: str
+    line: int
+    code: str
+    message: str
+
+    def to_json(self)->str:
+        """Return the finding as one line of JSON."""
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+def walk_projects(paths:Iterable[Path|str], main:str="main.tex")->Iterator[Path]:
+    """
+    Lazily yield every folder below `paths` that contains `main`.
+
+    Hidden folders and the sub folders of a project are not searched.
+
+    Args:
+        paths (Iterable[Path | str]): Folders to search.
+        main (str): Name of the main document of a project.
+
+    Yields:
+        Path: Project folders, depth first in name order.
+    """
+    for path in paths:
+        pending = [Path(path)]
+        while pending:
+            folder = pending.pop()
+            if (folder/main).is_file():
+                yield folder
+                continue
+            try:
+                with os.scandir(folder) as entries:
+                    subdirs = sorted(
+                        e.name for e in entries if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")
+                    )
+            except (NotADirectoryError, FileNotFoundError, PermissionError):
+                continue
+            pending += [folder/name for name in reversed(subdirs)]
+
+
+def _tex_files(project:Path)->Iterator[str]:
+    for root, dirs, names in os.walk(project):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(names):
+            if name.endswith(".tex"):
+                yield Path(root, name).relative_to(project).as_posix()
+
+
+def _scan(path:Path)->tuple[list[tuple[int, str]], bool]:
+    """Return the placeholders with their line numbers and whether the file has content."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [], False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            found = []
+            line, pos = 1, 0
+            for m in _PLACEHOLDER_BYTES.finditer(data):
+                line += data[pos:m.start()].count(b"\n")
+                pos = m.start()
+                found.append((line, m.group(1).decode()))
+            return found, _CONTENT.search(data) is not None
+
+
+def check_project(project:Path|str, main:str="main.tex")->list[Finding]:
+    """
+    Check one project for unfilled placeholders, missing files and an empty preamble.
+
+    Args:
+        project (Path | str): The project folder.
+        main (str): Name of the main document.
+
+    Returns:
+        list[Finding]: The findings of every file, then the missing files.
+    """
+    project = Path(project)
+    name = str(project)
+    findings = []
+    for rel in _tex_files(project):
+        try:
+            placeholders, content = _scan(project/rel)
+        except OSError as e:
+            findings.append(Finding(name, rel, 0, "unreadable", str(e)))
+            continue
+        findings += [
+            Finding(name, rel, line, "placeholder", f"Unfilled placeholder <<{placeholder}>>")
+            for line, placeholder in placeholders
+        ]
+        if rel == PREAMBLE and not content:
+            findings.append(Finding(name, rel, 0, "empty-preamble", f"{PREAMBLE} loads no packages"))
+
+    try:
+        graph = DependencyGraph.scan(project, main)
+    except FileNotFoundError as e:
+        return findings + [Finding(name, main, 0, "missing-file", str(e))]
+    for rel, deps in graph.files.items():
+        findings += [
+            Finding(name, rel, 0, "missing-file", f"References missing file {dep}")
+            for dep in deps if dep in graph.missing
+        ]
+    return findings
+
+
+def check_projects(paths:Iterable[Path|str], *, workers:int|None=None, main:str="main.tex")->Iterator[Finding]:
+    """
+    Check all projects below `paths`, yielding findings as projects finish.
+
+    Projects are checked in a process pool; at most four projects per
+    worker are in flight, so memory use stays flat for any number of
+    projects. Findings are yielded in the order the projects are found.
+
+    Args:
+        paths (Iterable[Path | str]): Project folders or folders containing projects.
+        workers (int | None): Number of processes, default the number of CPUs.
+            With 1 the projects are checked in this process.
+        main (str): Name of the main document of a project.
+
+    Yields:
+        Finding: The findings of every project.
+
+    Raises:
+        ValueError: If `workers` is less than 1.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    projects = walk_projects(paths, main)
+    if workers == 1:
+        for project in projects:
+            yield from check_project(project, main)
+        return
+
+    window = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for project in projects:
+            window.append(pool.submit(check_project, project, main))
+            if len(window) >= 4*workers:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
@@ -2,18 +2,88 @@
 Command-line interface for the beauti-tex package.
 
 This module defines the CLI using argparse and connects user commands
-to the internal project-building functionality.
+to the internal project-building functionality. Handlers import their
+dependencies when they run, so `--help` and argument errors stay fast.
 """
-from pathlib import Path
 import argparse
-from .proj_builder import make_project
+import os
+import sys
+
+
+class _Archive:
+    """Context manager opening an archive backend for `path`, or None without a path.
+
+    The format is chosen by the suffix. The archive file is closed on exit
+    and removed again if generation raised.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.backend = None
+
+    def __enter__(self):
+        if not self.path:
+            return None
+        from .output import archive_backend
+        name = str(self.path).lower()
+        for fmt in ("zip", "tar.gz", "tgz", "tar.bz2", "tar.xz", "tar"):
+            if name.endswith("." + fmt):
+                break
+        else:
+            raise SystemExit(f"Unsupported archive format: {self.path}")
+        self.file = open(self.path, "wb")
+        try:
+            self.backend = archive_backend(self.file, fmt)
+        except BaseException:
+            self._discard()
+            raise
+        return self.backend
+
+    def _discard(self):
+        self.file.close()
+        os.unlink(self.path)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.file is None:
+            return
+        try:
+            self.backend.close()
+        except BaseException:
+            self._discard()
+            raise
+        if exc_type is not None:
+            self._discard()
+        else:
+            self.file.close()
+
+
+def _daemon(args, op, params):
+    """Run `op` in a running daemon and return its result, or None to run in-process.
+
+    Profiling and archives always run in-process.
+    """
+    if args.no_daemon or args.profile or getattr(args, "archive", None):
+        return None
+    from pathlib import Path
+    from .daemon import DaemonUnavailable, request
+    # the daemon has its own working directory
+    params["proj_path"] = str(Path(params.get("proj_path") or ".").resolve())
+    for key in ("cfg_path", "bib_master"):
+        if params.get(key):
+            params[key] = str(Path(params[key]).resolve())
+    try:
+        return request(op, params)
+    except DaemonUnavailable:
+        return None
 
 
 def make_cli(args):
     """Handle the `make-project` CLI command.
 
     This function serves as a thin adapter between the argparse
-    namespace and the internal `make_project` function.
+    namespace and the internal `make_project` function. If a daemon
+    (`beauti-tex serve`) is running, the project is generated there.
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments with
@@ -21,12 +91,419 @@ def make_cli(args):
             - name (str): Name of the LaTeX project.
             - project_path (str | None): Target directory for the project.
             - config_path (str | None): Path to a configuration file.
+            - title, author, mnr, study_program (str | None): Titlepage fields.
+            - precompile (bool): Set up a precompiled preamble.
+            - archive (str | None): Write a zip/tar archive instead of a folder.
+            - link_assets (bool): Link static files from the asset store.
+            - bib_master (str | None): Library to seed `literature.bib` from.
+            - bib_keys (str | None): Comma separated keys to copy from `bib_master`.
+    """
+    meta = {
+        "title": args.title,
+        "author": args.author,
+        "mnr": args.mnr,
+        "stprog": args.study_program,
+    }
+    meta = {k: v for k, v in meta.items() if v is not None}
+    params = {
+        "name": args.name,
+        "proj_path": args.project_path,
+        "cfg_path": args.config_path,
+        "meta": meta,
+        "precompile": args.precompile,
+        "link_assets": args.link_assets,
+        "bib_master": args.bib_master,
+        "bib_keys": [k.strip() for k in args.bib_keys.split(",") if k.strip()] if args.bib_keys else None,
+    }
+    if _daemon(args, "make-project", params) is not None:
+        print("Latex Project Created!")
+        return
+
+    from .proj_builder import make_project
+    with _Archive(args.archive) as backend:
+        make_project(
+            args.name,
+            proj_path=args.project_path,
+            cfg_path=args.config_path,
+            meta=meta,
+            precompile=args.precompile,
+            backend=backend,
+            link_assets=args.link_assets,
+            bib_master=params["bib_master"],
+            bib_keys=params["bib_keys"],
+        )
+
+
+def make_many_cli(args):
+    """Handle the `make-projects` CLI command.
+
+    Reads the manifest, builds all projects with `make_projects` (in the
+    daemon, if one is running) and prints one line per project. Exits with
+    status 1 if any project failed.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - manifest (str): Path to a CSV or JSON manifest.
+            - workers (int): Number of worker threads.
+            - project_path (str | None): Default target directory.
+            - config_path (str | None): Default configuration file.
+            - precompile (bool): Set up a precompiled preamble.
+            - archive (str | None): Write all projects into one zip/tar archive.
+            - link_assets (bool): Link static files from the asset store.
+    """
+    from .proj_builder import make_projects, load_manifest
+    from pathlib import Path
+    specs = load_manifest(args.manifest)
+    params = {
+        "specs": [
+            {**spec, **{k: str(Path(spec[k]).resolve()) for k in ("path", "config") if spec.get(k)}}
+            for spec in specs
+        ],
+        "workers": args.workers,
+        "proj_path": args.project_path,
+        "cfg_path": args.config_path,
+        "precompile": args.precompile,
+        "link_assets": args.link_assets,
+    }
+    results = _daemon(args, "make-projects", params)
+    if results is None:
+        with _Archive(args.archive) as backend:
+            results = make_projects(
+                specs,
+                workers=args.workers,
+                proj_path=args.project_path,
+                cfg_path=args.config_path,
+                precompile=args.precompile,
+                backend=backend,
+                link_assets=args.link_assets,
+            )
+        results = [{"name": r.name, "path": r.path, "error": r.error} for r in results]
+    failed = 0
+    for result in results:
+        if result["error"] is None:
+            print(f"created {result['path']}")
+        else:
+            failed += 1
+            print(f"failed  {result['name']}: {result['error']}")
+    print(f"{len(results) - failed} of {len(results)} projects created.")
+    if failed:
+        raise SystemExit(1)
+
+
+def update_cli(args):
+    """Handle the `update-project` CLI command.
+
+    Re-renders an existing project with `update_project` (in the daemon,
+    if one is running) and prints which files were written and which were
+    skipped because they were edited by the user.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - name (str): Name of the LaTeX project.
+            - project_path (str | None): Directory containing the project.
+            - config_path (str | None): Path to a configuration file.
     """
-    make_project(
-        args.name,
-        proj_path=args.project_path,
-        cfg_path=args.config_path,
+    params = {"name": args.name, "proj_path": args.project_path, "cfg_path": args.config_path}
+    result = _daemon(args, "update-project", params)
+    if result is None:
+        from dataclasses import asdict
+        from .proj_builder import update_project
+        result = asdict(update_project(
+            args.name,
+            proj_path=args.project_path,
+            cfg_path=args.config_path,
+        ))
+    for name in result["written"]:
+        print(f"updated {name}")
+    for name in result["skipped"]:
+        print(f"skipped {name} (edited)")
+    print(f"{len(result['written'])} updated, {len(result['unchanged'])} unchanged, {len(result['skipped'])} skipped.")
+
+
+def styles_cli(args):
+    """Handle the `styles` CLI command.
+
+    Prints the name and template folder of every available style.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments (unused).
+    """
+    from .styles import registry
+    for name, style in sorted(registry.styles().items()):
+        print(f"{name:<20} {style.path}")
+
+
+def build_cli(args):
+    """Handle the `build` CLI command.
+
+    Compiles the projects in parallel with `build_projects`, printing one
+    line per project as soon as it is done. Exits with status 1 if any
+    project failed or timed out.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - paths (list[str]): Project folders or folders of projects.
+            - workers (int): Number of parallel builds.
+            - timeout (float): Seconds per project.
+            - command (str | None): Compiler command, e.g. "pdflatex -interaction=nonstopmode".
+            - force (bool): Build unchanged projects as well.
+            - main (str): Name of the main document.
+            - report (str | None): Write all results as JSON to this file.
+    """
+    import json
+    import shlex
+    import threading
+    from dataclasses import asdict
+    from .build import build_projects, find_projects
+    projects = find_projects(args.paths, args.main)
+    if not projects:
+        raise SystemExit(f"No projects with a {args.main} found.")
+    lock = threading.Lock()
+
+    def report(result):
+        with lock:
+            if result.status == "skipped":
+                print(f"skipped {result.project} (unchanged)")
+            elif result.status == "built":
+                print(f"built   {result.project} ({result.duration:.1f}s, {result.summary})")
+            else:
+                print(f"{result.status:<7} {result.project}: {'; '.join(result.summary.errors) or result.status}")
+
+    results = build_projects(
+        projects,
+        workers=args.workers,
+        command=shlex.split(args.command) if args.command else None,
+        timeout=args.timeout,
+        force=args.force,
+        main=args.main,
+        on_result=report,
     )
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump([{**asdict(r), "project": str(r.project)} for r in results], f, indent=2)
+    counts = {status: sum(r.status == status for r in results) for status in ("built", "skipped", "failed", "timeout")}
+    print(", ".join(f"{n} {status}" for status, n in counts.items()) + ".")
+    if counts["failed"] or counts["timeout"]:
+        raise SystemExit(1)
+
+
+def deps_cli(args):
+    """Handle the `deps` CLI command.
+
+    Scans the `\\input` chain of every project and prints Make rules, or
+    with `--stale` the files that changed after the PDF was built. Missing
+    files are reported on stderr.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - paths (list[str]): Project folders or folders of projects.
+            - main (str): Name of the main document.
+            - output (str | None): Write the Make rules to this file instead of stdout.
+            - stale (bool): List stale dependencies instead of Make rules.
+            - no_cache (bool): Scan all files, ignoring `.beauti-tex-deps.json`.
+    """
+    from .build import find_projects
+    from .latex.deps import scan_dependencies
+    projects = find_projects(args.paths, args.main)
+    if not projects:
+        raise SystemExit(f"No projects with a {args.main} found.")
+    rules = []
+    for project in projects:
+        graph = scan_dependencies(project, args.main, cache=not args.no_cache)
+        for rel in sorted(graph.missing):
+            print(f"{project}: missing {rel}", file=sys.stderr)
+        if args.stale:
+            rules += [f"{(project/rel).as_posix()}\n" for rel in graph.stale()]
+        else:
+            rules.append(graph.to_make())
+    if args.output:
+        with open(args.output, "w") as f:
+            f.writelines(rules)
+    else:
+        sys.stdout.writelines(rules)
+
+
+def check_cli(args):
+    """Handle the `check` CLI command.
+
+    Streams the findings of all projects as JSON lines to stdout and a
+    summary to stderr. Exits with status 1 if anything was found.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - paths (list[str]): Folders to search for projects.
+            - workers (int | None): Number of processes.
+            - main (str): Name of the main document.
+    """
+    from .check import check_projects
+    count = 0
+    for finding in check_projects(args.paths, workers=args.workers, main=args.main):
+        print(finding.to_json())
+        count += 1
+    sys.stdout.flush()
+    print(f"{count} findings.", file=sys.stderr)
+    if count:
+        raise SystemExit(1)
+
+
+def bib_cli(args):
+    """Handle the `bib` CLI command and its actions.
+
+    - `index LIBRARY`: build or refresh the index of a library.
+    - `get LIBRARY KEY...`: print entries looked up through the index.
+    - `dedupe FILE`: remove entries with a duplicate key or DOI.
+    - `trim [PROJECT]`: keep only the cited entries, adding missing ones from `--master`.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - action (str): One of "index", "get", "dedupe", "trim".
+            - library, keys, file, output, project, master, main: Arguments of the action.
+    """
+    from .latex import bib
+    if args.action == "index":
+        index = bib.BibIndex.open(args.library)
+        print(f"{len(index)} entries indexed in {bib.index_file(index.path)}")
+    elif args.action == "get":
+        index = bib.BibIndex.open(args.library)
+        found = index.read(args.keys)
+        sys.stdout.write("".join(entry.strip() + "\n\n" for entry in found.values()))
+        missing = [key for key in args.keys if key not in found]
+        if missing:
+            raise SystemExit(f"Unknown key(s): {', '.join(missing)}")
+    elif args.action == "dedupe":
+        removed = bib.dedupe(args.file, args.output)
+        print(f"Removed {removed} duplicate entries.")
+    else:
+        try:
+            kept, missing = bib.trim(args.project, master=args.master, main=args.main)
+        except FileNotFoundError as e:
+            raise SystemExit(str(e))
+        print(f"Kept {len(kept)} cited entries.")
+        if missing:
+            print(f"Cited but not found: {', '.join(missing)}", file=sys.stderr)
+
+
+def assets_cli(args):
+    """Handle the `assets` CLI command.
+
+    Processes the figures of every project into `build/figures` and prints
+    one line per figure. Exits with status 1 if a figure failed.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - paths (list[str]): Project folders or folders of projects.
+            - dpi (int): Target resolution.
+            - width (float): Widest figure in inches.
+            - workers (int | None): Number of processes.
+            - cache (str | None): Cache folder.
+            - main (str): Name of the main document.
+    """
+    from .assets import find_figures, process_figures
+    from .build import find_projects
+    projects = find_projects(args.paths, args.main)
+    if not projects:
+        raise SystemExit(f"No projects with a {args.main} found.")
+    failed = 0
+    for project in projects:
+        _, missing = find_figures(project, args.main)
+        for name in missing:
+            print(f"missing   {project}: {name}", file=sys.stderr)
+        for result in process_figures(
+            project, dpi=args.dpi, width=args.width, workers=args.workers, cache_dir=args.cache, main=args.main,
+        ):
+            detail = f" -> {result.output}" if result.output else f" ({result.message})"
+            print(f"{result.status:<9} {project}: {result.source}{detail}")
+            failed += result.status == "failed"
+    if failed:
+        raise SystemExit(1)
+
+
+def table_cli(args):
+    """Handle the `table` CLI command.
+
+    Converts a CSV file into a LaTeX table, by default
+    `tables/<name of the CSV file>.tex`.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - csv (str): The CSV file.
+            - output (str | None): The `.tex` file to write.
+            - style (str): "longtable" or "tabular".
+            - caption, label, align (str | None): Table options.
+            - no_header (bool): The first row is data, not column titles.
+            - chunk_rows (int | None): Rows per chunk file.
+            - landscape (bool): Rotate the table.
+            - delimiter (str): CSV field delimiter.
+    """
+    from pathlib import Path
+    from .latex.tables import csv_to_table
+    output = args.output or str(Path("tables")/(Path(args.csv).stem + ".tex"))
+    try:
+        result = csv_to_table(
+            args.csv,
+            output,
+            style=args.style,
+            caption=args.caption,
+            label=args.label,
+            align=args.align,
+            header=not args.no_header,
+            chunk_rows=args.chunk_rows,
+            landscape=args.landscape,
+            delimiter=args.delimiter,
+        )
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+    chunks = f" in {len(result.files) - 1} chunks" if len(result.files) > 1 else ""
+    print(f"Wrote {result.rows} rows to {output}{chunks}.")
+
+
+def config_cli(args):
+    """Handle the `config` CLI command and its actions.
+
+    - `dump [CONFIG]`: validate and merge a configuration with the defaults
+      and write it as JSON snapshot, which `--config-path` also accepts.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - action (str): "dump".
+            - config (str | None): Configuration INI file (default: only the defaults).
+            - output (str | None): Write the snapshot here instead of stdout.
+    """
+    from .config import ConfigError, dump_config, get_config
+    try:
+        text = dump_config(get_config(args.config, frozen=True), args.output)
+    except (ConfigError, FileNotFoundError) as e:
+        raise SystemExit(str(e))
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        print(f"Wrote config snapshot to {args.output}")
+
+
+def serve_cli(args):
+    """Handle the `serve` CLI command.
+
+    Runs the generation daemon until it is interrupted.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments with
+            the following attributes:
+            - socket (str | None): Socket path, default `beauti_tex.daemon.default_socket()`.
+    """
+    from .daemon import serve
+    try:
+        serve(args.socket)
+    except FileExistsError as e:
+        raise SystemExit(str(e))
 
 
 def main():
@@ -40,6 +517,31 @@ def main():
         description="Use beauti-tex from the terminal"
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown of the command",
+    )
+
+    parser.add_argument(
+        "--profile-format",
+        choices=["text", "json", "chrome"],
+        default="text",
+        help="Format of the profile: text table, JSON or Chrome trace (default: text)",
+    )
+
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        help="Write the profile to this file instead of stderr",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always generate in this process, even if a beauti-tex daemon is running",
+    )
+
     # Container for subcommands (e.g. make-project)
     subparsers = parser.add_subparsers(
         dest="command",
@@ -73,15 +575,492 @@ def main():
     parser_make.add_argument(
         "--config-path", "-cp",
         default=None,
-        help="Path to a configuration file",
+        help="Path to a configuration file or a snapshot from `config dump`",
+    )
+
+    parser_make.add_argument(
+        "--title",
+        default=None,
+        help="Title on the titlepage (default: the project name)",
+    )
+
+    parser_make.add_argument(
+        "--author",
+        default=None,
+        help="Author on the titlepage",
+    )
+
+    parser_make.add_argument(
+        "--mnr",
+        default=None,
+        help="Matriculation number on the titlepage",
+    )
+
+    parser_make.add_argument(
+        "--study-program",
+        default=None,
+        help="Study program on the titlepage",
+    )
+
+    parser_make.add_argument(
+        "--precompile",
+        action="store_true",
+        help="Split the static preamble into a precompiled format (needs mylatexformat)",
+    )
+
+    parser_make.add_argument(
+        "--archive", "-a",
+        default=None,
+        help="Write the project into a .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz archive instead of folders",
+    )
+
+    parser_make.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="Reflink static files (build script, template assets) from the asset store instead of copying them",
+    )
+
+    parser_make.add_argument(
+        "--bib-master",
+        default=None,
+        help="Shared .bib library to seed literature.bib from (see `beauti-tex bib`)",
+    )
+
+    parser_make.add_argument(
+        "--bib-keys",
+        default=None,
+        help="Comma separated citation keys to copy from --bib-master",
     )
 
     # Assign the handler function for this subcommand
     parser_make.set_defaults(func=make_cli)
 
+    # --------------------------------
+    # make-projects command definition
+    # --------------------------------
+    parser_many = subparsers.add_parser(
+        "make-projects",
+        help="Generate many projects from a CSV or JSON manifest",
+    )
+
+    parser_many.add_argument(
+        "--manifest", "-m",
+        help="CSV or JSON file with one project (name, path, config, overrides) per entry",
+        required=True,
+    )
+
+    parser_many.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=4,
+        help="Number of parallel workers (default: 4)",
+    )
+
+    parser_many.add_argument(
+        "--project-path", "-pp",
+        default=None,
+        help="Default target directory for projects without a path",
+    )
+
+    parser_many.add_argument(
+        "--config-path", "-cp",
+        default=None,
+        help="Default configuration file for projects without a config",
+    )
+
+    parser_many.add_argument(
+        "--precompile",
+        action="store_true",
+        help="Split the static preamble into a precompiled format (needs mylatexformat)",
+    )
+
+    parser_many.add_argument(
+        "--archive", "-a",
+        default=None,
+        help="Write all projects into a .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz archive instead of folders",
+    )
+
+    parser_many.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="Reflink static files (build script, template assets) from the asset store instead of copying them",
+    )
+
+    parser_many.set_defaults(func=make_many_cli)
+
+    # ---------------------------------
+    # update-project command definition
+    # ---------------------------------
+    parser_update = subparsers.add_parser(
+        "update-project",
+        help="Re-render an existing project, rewriting only changed files",
+    )
+
+    parser_update.add_argument(
+        "--name", "-N",
+        help="The name of the project",
+        required=True,
+    )
+
+    parser_update.add_argument(
+        "--project-path", "-pp",
+        default=None,
+        help="Directory containing the project (default: current directory)",
+    )
+
+    parser_update.add_argument(
+        "--config-path", "-cp",
+        default=None,
+        help="Path to a configuration file (default: the one used to create the project)",
+    )
+
+    parser_update.set_defaults(func=update_cli)
+
+    # -------------------------
+    # styles command definition
+    # -------------------------
+    parser_styles = subparsers.add_parser(
+        "styles",
+        help="List the available styles and their template folders",
+    )
+
+    parser_styles.set_defaults(func=styles_cli)
+
+    # ------------------------
+    # build command definition
+    # ------------------------
+    parser_build = subparsers.add_parser(
+        "build",
+        help="Compile generated projects in parallel, skipping unchanged ones",
+    )
+
+    parser_build.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Project folders, or folders containing projects (default: current directory)",
+    )
+
+    parser_build.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Number of projects compiled in parallel (default: number of CPUs)",
+    )
+
+    parser_build.add_argument(
+        "--timeout", "-t",
+        type=float,
+        default=600.0,
+        help="Seconds per project before the compiler is killed (default: 600)",
+    )
+
+    parser_build.add_argument(
+        "--command", "-c",
+        default=None,
+        help="Compiler command, the main document is appended (default: latex-build.sh if present, else latexmk -pdf)",
+    )
+
+    parser_build.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Also build projects whose sources did not change since the last successful build",
+    )
+
+    parser_build.add_argument(
+        "--main",
+        default="main.tex",
+        help="Name of the main document (default: main.tex)",
+    )
+
+    parser_build.add_argument(
+        "--report",
+        default=None,
+        help="Write the results with log summaries as JSON to this file",
+    )
+
+    parser_build.set_defaults(func=build_cli)
+
+    # -----------------------
+    # deps command definition
+    # -----------------------
+    parser_deps = subparsers.add_parser(
+        "deps",
+        help="Print Make rules with the files a project's document depends on",
+    )
+
+    parser_deps.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Project folders, or folders containing projects (default: current directory)",
+    )
+
+    parser_deps.add_argument(
+        "--main",
+        default="main.tex",
+        help="Name of the main document (default: main.tex)",
+    )
+
+    parser_deps.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write the rules to this file, e.g. main.d for `include main.d` (default: stdout)",
+    )
+
+    parser_deps.add_argument(
+        "--stale",
+        action="store_true",
+        help="List the files that changed after the PDF was built instead",
+    )
+
+    parser_deps.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Read every file instead of reusing the scan cache of unchanged files",
+    )
+
+    parser_deps.set_defaults(func=deps_cli)
+
+    # ------------------------
+    # check command definition
+    # ------------------------
+    parser_check = subparsers.add_parser(
+        "check",
+        help="Report unfilled placeholders, missing files and empty preambles as JSON lines",
+    )
+
+    parser_check.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Folders searched for projects (default: current directory)",
+    )
+
+    parser_check.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="Number of processes scanning projects (default: number of CPUs)",
+    )
+
+    parser_check.add_argument(
+        "--main",
+        default="main.tex",
+        help="Name of the main document (default: main.tex)",
+    )
+
+    parser_check.set_defaults(func=check_cli)
+
+    # ----------------------
+    # bib command definition
+    # ----------------------
+    parser_bib = subparsers.add_parser(
+        "bib",
+        help="Index, deduplicate and trim BibTeX bibliographies",
+    )
+
+    bib_actions = parser_bib.add_subparsers(dest="action", required=True)
+
+    bib_index = bib_actions.add_parser("index", help="Build or refresh the key index of a library")
+    bib_index.add_argument("library", help="The .bib library")
+
+    bib_get = bib_actions.add_parser("get", help="Print entries of a library by key")
+    bib_get.add_argument("library", help="The .bib library")
+    bib_get.add_argument("keys", nargs="+", help="Citation keys")
+
+    bib_dedupe = bib_actions.add_parser("dedupe", help="Remove entries with a duplicate key or DOI")
+    bib_dedupe.add_argument("file", help="The .bib file")
+    bib_dedupe.add_argument("--output", "-o", default=None, help="Write the result here (default: in place)")
+
+    bib_trim = bib_actions.add_parser("trim", help="Keep only the entries cited in a project")
+    bib_trim.add_argument("project", nargs="?", default=".", help="The project folder (default: current directory)")
+    bib_trim.add_argument(
+        "--master", "-m",
+        default=None,
+        help="Library to add missing cited entries from (default: the one the project was seeded from)",
+    )
+    bib_trim.add_argument("--main", default="main.tex", help="Name of the main document (default: main.tex)")
+
+    parser_bib.set_defaults(func=bib_cli)
+
+    # -------------------------
+    # assets command definition
+    # -------------------------
+    parser_assets = subparsers.add_parser(
+        "assets",
+        help="Downsample and convert the figures of projects into build/figures",
+    )
+
+    parser_assets.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Project folders, or folders containing projects (default: current directory)",
+    )
+
+    parser_assets.add_argument(
+        "--dpi",
+        type=int,
+        default=300,
+        help="Target resolution of the figures (default: 300)",
+    )
+
+    parser_assets.add_argument(
+        "--width",
+        type=float,
+        default=6.5,
+        help="Widest printed figure in inches (default: 6.5)",
+    )
+
+    parser_assets.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="Number of processes converting figures (default: number of CPUs)",
+    )
+
+    parser_assets.add_argument(
+        "--cache",
+        default=None,
+        help="Cache folder of processed figures (default: ~/.cache/beauti-tex/figures)",
+    )
+
+    parser_assets.add_argument(
+        "--main",
+        default="main.tex",
+        help="Name of the main document (default: main.tex)",
+    )
+
+    parser_assets.set_defaults(func=assets_cli)
+
+    # ------------------------
+    # table command definition
+    # ------------------------
+    parser_table = subparsers.add_parser(
+        "table",
+        help="Convert a CSV file into a booktabs/longtable LaTeX table",
+    )
+
+    parser_table.add_argument(
+        "csv",
+        help="The CSV file",
+    )
+
+    parser_table.add_argument(
+        "--output", "-o",
+        default=None,
+        help="The .tex file to write (default: tables/<csv name>.tex)",
+    )
+
+    parser_table.add_argument(
+        "--style", "-s",
+        choices=["longtable", "tabular"],
+        default="longtable",
+        help="longtable (breaks across pages) or tabular in a table float (default: longtable)",
+    )
+
+    parser_table.add_argument(
+        "--caption",
+        default=None,
+        help="Table caption",
+    )
+
+    parser_table.add_argument(
+        "--label",
+        default=None,
+        help="Label for \\ref, e.g. tab:results",
+    )
+
+    parser_table.add_argument(
+        "--align",
+        default=None,
+        help="Column specification, e.g. lrr (default: numbers right, text left)",
+    )
+
+    parser_table.add_argument(
+        "--no-header",
+        action="store_true",
+        help="The first row is data instead of column titles",
+    )
+
+    parser_table.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="Split the table into files of this many rows that the output file inputs",
+    )
+
+    parser_table.add_argument(
+        "--landscape",
+        action="store_true",
+        help="Rotate the table (pdflscape)",
+    )
+
+    parser_table.add_argument(
+        "--delimiter", "-d",
+        default=",",
+        help="CSV field delimiter (default: ,)",
+    )
+
+    parser_table.set_defaults(func=table_cli)
+
+    # -------------------------
+    # config command definition
+    # -------------------------
+    parser_config = subparsers.add_parser(
+        "config",
+        help="Validate configurations and write merged snapshots",
+    )
+
+    config_actions = parser_config.add_subparsers(dest="action", required=True)
+
+    config_dump = config_actions.add_parser(
+        "dump",
+        help="Write the merged, validated configuration as JSON snapshot",
+    )
+    config_dump.add_argument("config", nargs="?", default=None, help="Configuration INI file (default: only the defaults)")
+    config_dump.add_argument("--output", "-o", default=None, help="Write the snapshot to this file (default: stdout)")
+
+    parser_config.set_defaults(func=config_cli)
+
+    # ------------------------
+    # serve command definition
+    # ------------------------
+    parser_serve = subparsers.add_parser(
+        "serve",
+        help="Run a daemon with warm caches that the other commands use when it is running",
+    )
+
+    parser_serve.add_argument(
+        "--socket", "-s",
+        default=None,
+        help="Unix socket to listen on (default: $BEAUTITEX_SOCKET or $XDG_RUNTIME_DIR/beauti-tex.sock)",
+    )
+
+    parser_serve.set_defaults(func=serve_cli)
+
     # Parse arguments and execute the selected command
     args = parser.parse_args()
-    args.func(args)
+    if not args.profile:
+        args.func(args)
+        return
+
+    from .profiling import Profiler
+    with Profiler() as profiler:
+        try:
+            args.func(args)
+        finally:
+            report = {
+                "text": profiler.format_table,
+                "json": profiler.to_json,
+                "chrome": profiler.to_chrome_trace,
+            }[args.profile_format]()
+            if args.profile_output:
+                with open(args.profile_output, "w") as f:
+                    f.write(report + "\n")
+            else:
+                print(report, file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -5,19 +5,77 @@ This module provides utilities to load project configuration from INI files
 and convert it into a structured `Config` dataclass. It reads default values
 from `default.ini` and optionally merges user-provided configuration.
 
+Every value is checked against `SCHEMA` when the files are loaded: unknown
+sections or keys, values of the wrong type, missing template folders and
+conflicting packages raise a `ConfigError` that names the file, section
+and key. A relative `templates` path is resolved against the folder of the
+file that sets it.
+
+A merged configuration can be written as a JSON snapshot with `dump_config`
+(`beauti-tex config dump`). `get_config` loads a `.json` path as snapshot,
+so batch workers and the daemon can skip merging the INI files.
+
 Included classes:
 - Config
     Dataclass representing the configuration for a LaTeX project.
+- FrozenConfig
+    Immutable, hashable configuration with a precomputed fingerprint.
+- ConfigError
+    Raised for invalid configuration files.
 
 Included functions:
-- get_config(path:Path | str |None=None)->Config
+- get_config(path:Path | str |None=None, *, frozen:bool=False)->Config | FrozenConfig
      Load and parse the configuration for a LaTeX project.
+- dump_config(cfg:Config | FrozenConfig, dest:Path | str | None=None)->str
+     Write a configuration as JSON snapshot.
+
+Parsed configurations are cached per process (see `beauti_tex.cache`),
+so repeated calls only re-read the INI files after they changed.
+
+Examples:
+>>> from beauti_tex.config import dump_config, get_config
+>>> text = dump_config(get_config("my.ini"), "config.json")
+>>> get_config("config.json") == get_config("my.ini")
+True
 """
 
 
 from pathlib import Path
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
 import configparser
-from dataclasses import dataclass
+import difflib
+import hashlib
+import json
+import os
+import re
+from .cache import config_cache
+from .latex.preamble import render_preamble
+from .profiling import stage
+
+#: Version of the JSON snapshot format written by `dump_config`
+SNAPSHOT_VERSION = 1
+
+_PACKAGE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+class ConfigError(ValueError):
+    """
+    Raised when a configuration file is invalid.
+
+    Attributes:
+        source (str): The file the invalid value comes from.
+        section (str | None): Section of the value.
+        key (str | None): Key of the value.
+    """
+
+    def __init__(self, source:Path|str, message:str, section:str|None=None, key:str|None=None):
+        self.source = str(source)
+        self.section = section
+        self.key = key
+        where = f"[{section}] {key}" if key else f"[{section}]" if section else ""
+        super().__init__(f"{source}: {where}{': ' if where else ''}{message}")
 
 @dataclass
 class Config:
@@ -27,7 +85,8 @@ class Config:
     Attributes:
         folders (list[str]): List of folder names to create in the project.
         chapters (list[str]): List of chapter filenames to generate.
-        style (str): Document style or template identifier.
+        style (str): Name of the template set, see `beauti_tex.styles`. Only used
+                     if `temp_path` is the packaged templates folder.
         temp_path (Path): Path to template files for project generation.
         size (int): Paper size (e.g., 10, 11, 12 pt).
         clas (str): LaTeX class to use (e.g., "article", "report").
@@ -41,46 +100,291 @@ class Config:
     clas:str
     packages: dict[str, str]
 
-def get_config(path:Path | str |None=None)->Config:
+    def freeze(self)->"FrozenConfig":
+        """Return an immutable, hashable copy of this configuration."""
+        return FrozenConfig(self.folders, self.chapters, self.style, self.temp_path, self.size, self.clas, self.packages)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FrozenConfig:
+    """
+    Immutable configuration that can be used as a dict or cache key.
+
+    Lists are stored as tuples and the packages as a read-only mapping.
+    Equality and hashing use `fingerprint`, a SHA-256 of all values that
+    is computed once, so equal configs loaded from different files are
+    interchangeable keys.
+
+    Attributes:
+        folders (tuple[str, ...]): Folder names to create in the project.
+        chapters (tuple[str, ...]): Chapter filenames to generate.
+        style (str): Name of the template set.
+        temp_path (Path): Path to template files for project generation.
+        size (int): Font size (e.g., 10, 11, 12 pt).
+        clas (str): LaTeX class to use.
+        packages (Mapping[str, str]): Read-only LaTeX packages and options, in order.
+        fingerprint (str): Stable hex digest of all values.
+    """
+    folders: tuple[str, ...]
+    chapters: tuple[str, ...]
+    style: str
+    temp_path: Path
+    size: int
+    clas: str
+    packages: Mapping[str, str]
+    fingerprint: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        assign = object.__setattr__
+        assign(self, "folders", tuple(self.folders))
+        assign(self, "chapters", tuple(self.chapters))
+        assign(self, "temp_path", Path(self.temp_path))
+        assign(self, "size", int(self.size))
+        assign(self, "packages", MappingProxyType(dict(self.packages)))
+        values = [
+            list(self.folders), list(self.chapters), self.style, str(self.temp_path),
+            self.size, self.clas, list(self.packages.items()),
+        ]
+        assign(self, "fingerprint", hashlib.sha256(json.dumps(values).encode()).hexdigest())
+
+    def __eq__(self, other:object)->bool:
+        if not isinstance(other, FrozenConfig):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self)->int:
+        return hash(self.fingerprint)
+
+    def __getstate__(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init} | {"packages": dict(self.packages)}
+
+    def __setstate__(self, state):
+        FrozenConfig.__init__(self, **state)
+
+    def thaw(self)->Config:
+        """Return a mutable `Config` with copies of the values."""
+        return Config(list(self.folders), list(self.chapters), self.style, self.temp_path,
+                      self.size, self.clas, dict(self.packages))
+
+
+def _names(value:list)->list[str]:
+    if not all(isinstance(x, str) and x.strip() for x in value):
+        raise ValueError("expected non-empty names")
+    return [x.strip() for x in value]
+
+
+def _text(value:str)->str:
+    if not value.strip():
+        raise ValueError("must not be empty")
+    return value.strip()
+
+
+def _positive(value:int)->int:
+    if isinstance(value, bool) or value < 1:
+        raise ValueError(f"expected a positive number, got {value!r}")
+    return value
+
+
+def _number(value:str)->int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"expected a number, got {value!r}") from None
+
+
+@dataclass(frozen=True, slots=True)
+class _Field:
+    """
+    A `[project]` key: its type, how to parse the INI string and a check run on the value.
+    """
+    kind: type
+    parse: Callable[[str], object]
+    check: Callable[[object], object]
+
+
+#: Keys of the `[project]` section, all required after merging
+SCHEMA: Mapping[str, _Field] = MappingProxyType({
+    "folders": _Field(list, lambda v: [x for x in v.split(",") if x.strip()], _names),
+    "chapters": _Field(list, lambda v: [x for x in v.split(",") if x.strip()], _names),
+    "style": _Field(str, str, _text),
+    "templates": _Field(str, str, _text),
+    "size": _Field(int, _number, _positive),
+    "clas": _Field(str, str, _text),
+})
+
+
+def _value(source:Path, key:str, value:object, *, parse:bool=True)->object:
+    """Convert and check one `[project]` value, an INI string with `parse` or a JSON value."""
+    spec = SCHEMA[key]
+    try:
+        if parse and spec.kind is not str:
+            value = spec.parse(value)
+        elif not isinstance(value, spec.kind):
+            raise ValueError(f"expected {spec.kind.__name__}, got {type(value).__name__}")
+        return spec.check(value)
+    except ValueError as e:
+        raise ConfigError(source, str(e), "project", key) from None
+
+
+def _unknown(source:Path, key:str)->ConfigError:
+    hint = difflib.get_close_matches(key, SCHEMA, n=1)
+    return ConfigError(source, "unknown key" + (f", did you mean {hint[0]!r}?" if hint else f", use one of {', '.join(SCHEMA)}."),
+                       "project", key)
+
+
+def _package(source:Path, key:str, value:object)->str:
+    """Check one `[packages]` entry: a package name and options or LaTeX code with balanced braces."""
+    if not isinstance(value, str):
+        raise ConfigError(source, f"expected str, got {type(value).__name__}", "packages", key)
+    if not _PACKAGE_NAME.fullmatch(key):
+        raise ConfigError(source, "invalid package name", "packages", key)
+    depth = 0
+    for c in re.sub(r"\\[{}]", "", value):
+        depth += (c == "{") - (c == "}")
+        if depth < 0:
+            break
+    if depth:
+        raise ConfigError(source, "unbalanced braces", "packages", key)
+    return value
+
+
+def _build(values:dict, origins:dict, packages:dict, source:Path)->Config:
+    """Create a Config from checked values, resolving the templates folder and rendering the preamble once."""
+    for key in SCHEMA:
+        if key not in values:
+            raise ConfigError(source, "missing key", "project", key)
+    temp_path = Path(values["templates"])
+    if not temp_path.is_absolute():
+        temp_path = origins["templates"].parent / temp_path
+    if not temp_path.is_dir():
+        raise ConfigError(origins["templates"], f"template folder {temp_path} not found!", "project", "templates")
+    try:
+        render_preamble(packages)
+    except ValueError as e:
+        raise ConfigError(source, str(e), "packages") from None
+    return Config(values["folders"], values["chapters"], values["style"], temp_path,
+                  values["size"], values["clas"], packages)
+
+
+def get_config(path:Path | str |None=None, *, frozen:bool=False)->Config|FrozenConfig:
     """
     Load and parse the configuration for a LaTeX project.
 
     Reads default settings from `default.ini` located in the same directory
     as this module. If an optional user configuration file is provided,
-    its settings override the defaults.
+    its settings override the defaults. A `.json` file is loaded as snapshot
+    written by `dump_config` instead, without the defaults. The values are
+    validated against `SCHEMA` once; the result is cached until one of the
+    files changes. Every call returns a fresh copy, or the shared cached
+    instance with `frozen`.
 
     Args:
-        path (Path | str | None): Optional path to a user-provided configuration INI file.
+        path (Path | str | None): Optional path to a user-provided configuration INI file
+                                  or a JSON snapshot.
+        frozen (bool): Return the immutable `FrozenConfig` instead of a `Config`.
 
     Returns:
-        Config: A populated Config dataclass instance with all project settings.
+        Config | FrozenConfig: A populated configuration with all project settings.
 
     Raises:
-        FileNotFoundError: If the default INI file or the user-provided file does not exist,
-                           or if the template directory does not exist.
+        FileNotFoundError: If the default INI file or the user-provided file does not exist.
+        ConfigError: If a file contains unknown sections or keys or invalid values,
+                     or if the template directory does not exist.
     """
-    config = configparser.ConfigParser()
     def_file = Path(__file__).parent / "default.ini"
-    if not def_file.exists():
-        raise FileNotFoundError(f"{def_file} not found!")
-    config.read(def_file)
-
+    files = [def_file]
     if path:
         if path == "":
             raise ValueError("Path must not be an empty string.")
-        path = Path(path)
-        if not path.exists():
-            raise FileNotFoundError(f"{path} not found!")
-        config.read(path)
-    folders=[x.strip() for x in config['project']['folders'].split(',')]
-    chapters = [x.strip() for x in config['project']['chapters'].split(',')]
-    style = config['project']['style']
-    temp_path = Path(config['project']['templates'])
-    if not temp_path.is_absolute():
-        temp_path=Path(__file__).parent / temp_path
-    if not temp_path.exists():
-        raise FileNotFoundError(f"{temp_path} not found!")
-    size = config.getint('project', 'size')
-    clas = config['project']['clas']
-    packages = dict(config['packages'])
-    return Config(folders,chapters,style,temp_path,size,clas,packages)
\ No newline at end of file
+        files = [Path(path)] if Path(path).suffix == ".json" else [def_file, Path(path)]
+    loader = _load_snapshot if files[0].suffix == ".json" else _load_config
+    with stage("config") as st:
+        # one per file: checked by the cache and, on a miss, read
+        st.fs_ops_estimate += len(files)
+        cfg = config_cache.get(files, lambda: loader(files).freeze())
+    return cfg if frozen else cfg.thaw()
+
+
+def _load_config(files:list[Path])->Config:
+    """Read, validate and merge the given INI files into a Config, later files win."""
+    values, origins, packages = {}, {}, {}
+    for file in files:
+        config = configparser.ConfigParser()
+        try:
+            config.read(file)
+        except configparser.Error as e:
+            raise ConfigError(file, str(e).splitlines()[0]) from None
+        if config.defaults():
+            raise ConfigError(file, "unknown section, use [project] and [packages].", "DEFAULT")
+        for section in config.sections():
+            if section not in ("project", "packages"):
+                raise ConfigError(file, "unknown section, use [project] and [packages].", section)
+        if config.has_section("project"):
+            for key, value in config.items("project"):
+                if key not in SCHEMA:
+                    raise _unknown(file, key)
+                values[key] = _value(file, key, value)
+                origins[key] = file
+        if config.has_section("packages"):
+            for key, value in config.items("packages"):
+                packages[key] = _package(file, key, value)
+    return _build(values, origins, packages, files[-1])
+
+
+def _load_snapshot(files:list[Path])->Config:
+    """Read a JSON snapshot written by `dump_config` and check it against the schema."""
+    path = files[0]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise ConfigError(path, f"invalid JSON snapshot: {e}") from None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        raise ConfigError(path, f"not a beauti-tex config snapshot of version {SNAPSHOT_VERSION}.")
+    for section in ("project", "packages"):
+        if not isinstance(data.get(section), dict):
+            raise ConfigError(path, "missing section", section)
+    values = {}
+    for key, value in data["project"].items():
+        if key not in SCHEMA:
+            raise _unknown(path, key)
+        values[key] = _value(path, key, value, parse=False)
+    packages = {key: _package(path, key, value) for key, value in data["packages"].items()}
+    return _build(values, dict.fromkeys(SCHEMA, path), packages, path)
+
+
+def dump_config(cfg:Config|FrozenConfig, dest:Path|str|None=None)->str:
+    """
+    Serialize a merged configuration as JSON snapshot.
+
+    The snapshot holds the resolved values, with lists already split and
+    an absolute `templates` path, and is loaded back by `get_config`
+    without reading `default.ini`.
+
+    Args:
+        cfg (Config | FrozenConfig): The configuration, e.g. from `get_config`.
+        dest (Path | str | None): Write the snapshot to this file, atomically.
+
+    Returns:
+        str: The JSON text.
+    """
+    text = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "project": {
+            "folders": list(cfg.folders),
+            "chapters": list(cfg.chapters),
+            "style": cfg.style,
+            "templates": str(Path(cfg.temp_path).absolute()),
+            "size": cfg.size,
+            "clas": cfg.clas,
+        },
+        "packages": dict(cfg.packages),
+    }, indent=2) + "\n"
+    if dest is not None:
+        dest = Path(dest)
+        tmp = dest.with_name(f".{dest.name}.tmp")
+        try:
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return text
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Generation daemon for beauti-tex.
+
+`beauti-tex serve` keeps a process with warm configuration, template and
+style caches running and accepts generation requests on a Unix domain
+socket. The CLI sends its commands to the daemon if one is running and
+falls back to generating in-process otherwise, so editor integrations and
+CI runners do not pay interpreter startup and template loading per call.
+
+Protocol (JSON lines, one request and one response per line, any number
+of requests per connection):
+
+    -> {"id": 1, "op": "make-project", "params": {"name": "MyPaper", "proj_path": "/abs/path"}}
+    <- {"id": 1, "ok": true, "result": {"path": "/abs/path/MyPaper"}}
+    <- {"id": 1, "ok": false, "error": {"type": "FileExistsError", "message": "..."}}
+
+Operations: `ping`, `make-project`, `make-projects`, `update-project`.
+Paths in requests should be absolute, since the daemon has its own
+working directory.
+
+Included classes:
+- DaemonServer
+    Threaded Unix socket server answering requests.
+- DaemonError
+    Raised by `request` for errors without a built-in exception type.
+- DaemonUnavailable
+    Raised by `request` if no daemon is listening.
+
+Included functions:
+- default_socket() -> Path
+    Socket path used by `serve` and `request` by default.
+- serve(socket_path=None) -> None
+    Run the daemon until interrupted.
+- request(op, params=None, *, socket_path=None, timeout=300.0) -> object
+    Send one request to the daemon and return its result.
+"""
+
+from pathlib import Path
+from collections.abc import Callable, Mapping
+from dataclasses import asdict
+import builtins
+import json
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+import time
+
+# Longest accepted request line, e.g. a large make-projects manifest
+MAX_LINE = 16 * 1024 * 1024
+
+
+class DaemonError(RuntimeError):
+    """
+    Error reported by the daemon.
+
+    Attributes:
+        type (str): Name of the exception raised in the daemon.
+    """
+    def __init__(self, type:str, message:str):
+        super().__init__(f"{type}: {message}")
+        self.type = type
+
+
+class DaemonUnavailable(ConnectionError):
+    """Raised if no daemon is listening on the socket."""
+
+
+def default_socket()->Path:
+    """
+    Return the default socket path.
+
+    `$BEAUTITEX_SOCKET` if set, else `beauti-tex.sock` in `$XDG_RUNTIME_DIR`,
+    else a per-user file in the temporary folder.
+    """
+    if os.environ.get("BEAUTITEX_SOCKET"):
+        return Path(os.environ["BEAUTITEX_SOCKET"])
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"])/"beauti-tex.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return Path(tempfile.gettempdir())/f"beauti-tex-{uid}.sock"
+
+
+# --------------------------------
+# operations, run inside the daemon
+# --------------------------------
+
+def _ping(params:Mapping[str, object])->dict[str, object]:
+    from . import __version__
+    return {"pid": os.getpid(), "version": __version__}
+
+
+def _make_project(params:Mapping[str, object])->dict[str, object]:
+    from .output import DiskBackend
+    from .proj_builder import _prepare_project, _store
+    name, plan = _prepare_project(
+        params["name"], params.get("cfg_path"), params.get("meta"), params.get("precompile", False),
+        params.get("bib_master"), params.get("bib_keys"),
+    )
+    backend = DiskBackend(params.get("proj_path"), store=_store(params.get("link_assets", False)))
+    backend.write(name, plan)
+    return {"path": str(backend.base/name)}
+
+
+def _make_projects(params:Mapping[str, object])->list[dict[str, object]]:
+    from .proj_builder import make_projects
+    results = make_projects(
+        params["specs"],
+        workers=params.get("workers", 4),
+        proj_path=params.get("proj_path"),
+        cfg_path=params.get("cfg_path"),
+        precompile=params.get("precompile", False),
+        link_assets=params.get("link_assets", False),
+    )
+    return [
+        {"name": r.name, "path": str(r.path) if r.path else None, "error": str(r.error) if r.error else None}
+        for r in results
+    ]
+
+
+def _update_project(params:Mapping[str, object])->dict[str, list[str]]:
+    from .proj_builder import update_project
+    return asdict(update_project(
+        params["name"], proj_path=params.get("proj_path"), cfg_path=params.get("cfg_path"),
+    ))
+
+
+OPERATIONS: dict[str, Callable[[Mapping[str, object]], object]] = {
+    "ping": _ping,
+    "make-project": _make_project,
+    "make-projects": _make_projects,
+    "update-project": _update_project,
+}
+
+
+def _handle(line:bytes)->dict[str, object]:
+    """Answer one request line."""
+    req_id = None
+    try:
+        req = json.loads(line)
+        req_id = req.get("id")
+        op = OPERATIONS.get(req.get("op"))
+        if op is None:
+            raise ValueError(f"Unknown operation {req.get('op')!r}.")
+        return {"id": req_id, "ok": True, "result": op(req.get("params") or {})}
+    except Exception as e:
+        return {"id": req_id, "ok": False, "error": {"type": type(e).__name__, "message": str(e)}}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self)->None:
+        while True:
+            line = self.rfile.readline(MAX_LINE)
+            if not line:
+                return
+            if not line.endswith(b"\n"):
+                response = {"id": None, "ok": False, "error": {"type": "ValueError", "message": "Request too long."}}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                return
+            self.wfile.write(json.dumps(_handle(line)).encode() + b"\n")
+
+
+# Windows has no Unix domain sockets; DaemonServer then fails in __init__
+_UnixServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, _UnixServer):
+    """
+    Threaded Unix socket server; every connection is served by its own thread.
+
+    The socket file is only accessible by the current user and is removed
+    by `server_close`.
+
+    Attributes:
+        socket_path (Path): The socket file.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, socket_path:Path|str|None=None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform.")
+        self.socket_path = Path(socket_path) if socket_path is not None else default_socket()
+        if self.socket_path.exists():
+            if _alive(self.socket_path):
+                raise FileExistsError(f"A daemon is already listening on {self.socket_path}.")
+            self.socket_path.unlink()
+        old = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old)
+
+    def server_close(self)->None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _alive(socket_path:Path)->bool:
+    try:
+        request("ping", socket_path=socket_path, timeout=2.0)
+    except (DaemonUnavailable, DaemonError, OSError):
+        return False
+    return True
+
+
+def _warm()->None:
+    """Load the default configuration and templates once."""
+    from .config import get_config
+    from .proj_builder import _load_templates
+    _load_templates(get_config())
+
+
+def serve(socket_path:Path|str|None=None)->None:
+    """
+    Run the daemon until it is interrupted (Ctrl+C / SIGINT) or terminated (SIGTERM).
+
+    Args:
+        socket_path (Path | str | None): Socket to listen on, default `default_socket()`.
+
+    Raises:
+        FileExistsError: If another daemon listens on the socket.
+    """
+    with DaemonServer(socket_path) as server:
+        try:
+            _warm()
+        except Exception:
+            pass  # a broken default config must not prevent requests with their own config
+        print(f"beauti-tex daemon listening on {server.socket_path}", flush=True)
+        # leave the with block on SIGTERM as well, so the socket file is removed
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request(op:str, params:Mapping[str, object]|None=None, *, socket_path:Path|str|None=None, timeout:float=300.0)->object:
+    """
+    Send one request to the daemon and wait for the result.
+
+    Errors raised in the daemon are raised again with the same built-in
+    exception type (e.g. `FileExistsError`), other errors as `DaemonError`.
+
+    Args:
+        op (str): Operation name, e.g. "make-project".
+        params (Mapping[str, object] | None): Parameters of the operation.
+        socket_path (Path | str | None): Socket of the daemon, default `default_socket()`.
+        timeout (float): Seconds to wait for the answer.
+
+    Returns:
+        object: The decoded result of the operation.
+
+    Raises:
+        DaemonUnavailable: If no daemon is listening.
+    """
+    path = str(socket_path if socket_path is not None else default_socket())
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix domain sockets are not supported on this platform.")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                sock.connect(path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise DaemonUnavailable(f"No daemon listening on {path}.") from e
+            except BlockingIOError:
+                # the listen backlog is full, wait for the daemon to accept
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.005)
+        sock.sendall(json.dumps({"id": 1, "op": op, "params": dict(params or {})}).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise DaemonUnavailable(f"The daemon on {path} closed the connection.")
+    response = json.loads(line)
+    if response["ok"]:
+        return response["result"]
+    error = response["error"]
+    exc = getattr(builtins, error["type"], None)
+    if isinstance(exc, type) and issubclass(exc, Exception):
+        raise exc(error["message"])
+    raise DaemonError(error["type"], error["message"])
@@ -0,0 +1,24 @@
+"""
+LaTeX source handling for beauti-tex.
+
+Public API:
+    - Template: Compiled `<<PLACEHOLDER>>` template.
+    - TemplateError: Raised when a template cannot be rendered.
+    - escape_tex: Escape LaTeX special characters.
+    - render_preamble: Render the `[packages]` configuration for `pak.tex`.
+    - PreambleError: Raised for conflicting packages.
+    - precompile_files: Split a document for a precompiled preamble format.
+    - scan_dependencies: Incremental `\\input` dependency graph of a project.
+    - DependencyGraph: Files of a project and their dependencies.
+    - BibIndex: Key to byte offset index of a `.bib` library.
+    - csv_to_table: Stream a CSV file into a booktabs/longtable table.
+"""
+
+from .template import Template, TemplateError, escape_tex
+from .preamble import render_preamble, PreambleError
+from .precompile import precompile_files
+from .deps import scan_dependencies, DependencyGraph
+from .bib import BibIndex
+from .tables import csv_to_table
+
+__all__=["Template","TemplateError","escape_tex","render_preamble","PreambleError","precompile_files","scan_dependencies","DependencyGraph","BibIndex","csv_to_table"]
@@ -0,0 +1,427 @@
+"""
+BibTeX bibliography handling for beauti-tex.
+
+Large `.bib` exports (tens of thousands of entries from a reference
+manager) are never loaded as a whole: `iter_entries` scans a memory mapped
+file and yields the position of every entry, and `BibIndex` keeps the byte
+offset and length of every key in an index file next to the library, so
+an entry is read with a single seek. The index is rebuilt automatically
+when the library's modification time or size changes.
+
+On top of the index:
+
+- `dedupe` removes entries with the same key (case-insensitive) or DOI,
+- `trim` rewrites a project's `literature.bib` with exactly the entries
+  `\\cite`d in the document, pulling missing ones from a master library,
+- `seed` renders the entries for a list of keys, used by `make_project`
+  to start a project from a shared library without copying all of it.
+
+`@string` and `@preamble` blocks are kept whenever entries are written,
+since entries may use the macros defined in them.
+
+Included classes:
+- BibEntry
+    Type, key and byte range of one entry.
+- BibIndex
+    Key to byte range index of a library.
+
+Included functions:
+- iter_entries(path: Path | str) -> Iterator[BibEntry]
+    Stream the entries of a `.bib` file.
+- cited_keys(project, main="main.tex") -> set[str]
+    Keys cited in a project.
+- dedupe(path, dest=None) -> int
+    Remove duplicate entries.
+- trim(project, *, master=None, main="main.tex") -> tuple[list[str], list[str]]
+    Reduce a project's bibliography to the cited entries.
+- seed(master, keys=None) -> str
+    Content of a new project's bibliography.
+
+Examples:
+>>> from beauti_tex.latex.bib import BibIndex
+>>> library = BibIndex.open("~/zotero.bib")
+>>> library.get("knuth1984")
+'@book{knuth1984,\\n  title = {The TeXbook},\\n ...}'
+"""
+
+from pathlib import Path
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+import json
+import mmap
+import os
+import re
+from .deps import _COMMENT, DependencyGraph
+
+#: Bibliography file of a generated project.
+BIB_FILE = "literature.bib"
+
+#: First line of a bibliography seeded from a master library; `trim` uses the named master.
+MASTER_COMMENT = "% beauti-tex master: "
+
+# Blocks that have no key and are kept with every selection of entries
+_MACROS = frozenset({"string", "preamble"})
+
+_START = re.compile(rb"@[ \t]*([A-Za-z]+)[ \t\r\n]*([{(])")
+_DELIMITERS = re.compile(rb'[{}()"]')
+_DOI = re.compile(rb"\bdoi\s*=\s*[{\"]\s*(?:https?://(?:dx\.)?doi\.org/)?([^}\"\s]+)", re.IGNORECASE)
+_CITE = re.compile(r"\\[A-Za-z]*cite[A-Za-z]*\*?(?:\s*\[[^\]]*\]){0,2}\s*\{([^}]*)\}")
+
+
+@dataclass(frozen=True)
+class BibEntry:
+    """
+    Position of one entry in a `.bib` file.
+
+    Attributes:
+        type (str): Entry type in lower case, e.g. "article", "string" or "preamble".
+        key (str): Citation key; the macro name for `@string`, empty for `@preamble`.
+        offset (int): Byte offset of the "@".
+        length (int): Length in bytes, up to and including the closing delimiter.
+    """
+    type: str
+    key: str
+    offset: int
+    length: int
+
+
+def _end(data:mmap.mmap|bytes, start:int, paren:bool)->int:
+    """Return the index after the delimiter closing the entry whose body starts at `start`."""
+    depth = 0
+    quoted = False
+    for m in _DELIMITERS.finditer(data, start):
+        char = m.group()
+        if char == b"{":
+            depth += 1
+        elif char == b"}":
+            if depth == 0 and not paren:
+                return m.end()
+            depth -= 1
+        elif depth == 0 and char == b'"':
+            # a "..." value may contain parentheses
+            quoted = not quoted
+        elif char == b")" and paren and depth == 0 and not quoted:
+            return m.end()
+    return len(data)
+
+
+def _scan(data:mmap.mmap|bytes)->Iterator[BibEntry]:
+    pos = 0
+    while True:
+        m = _START.search(data, pos)
+        if m is None:
+            return
+        kind = m.group(1).decode("ascii").lower()
+        end = _end(data, m.end(), m.group(2) == b"(")
+        pos = end
+        if kind == "comment":
+            continue
+        body = data[m.end():end]
+        if kind == "string":
+            key = body.split(b"=", 1)[0]
+        elif kind == "preamble":
+            key = b""
+        else:
+            key = body.split(b",", 1)[0]
+        yield BibEntry(kind, key.strip().decode("utf-8", errors="replace"), m.start(), end - m.start())
+
+
+def iter_entries(path:Path|str)->Iterator[BibEntry]:
+    """
+    Stream the entries of a `.bib` file in file order.
+
+    The file is memory mapped, so its size does not affect the memory
+    use. `@comment` blocks and text between entries are skipped.
+
+    Args:
+        path (Path | str): The `.bib` file.
+
+    Yields:
+        BibEntry: Type, key and byte range of every entry, `@string` and `@preamble`.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _scan(data)
+
+
+def index_file(path:Path|str)->Path:
+    """Return the index file of the library `path`, a hidden file next to it."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.index.json")
+
+
+class BibIndex:
+    """
+    Index of a `.bib` library: citation key to byte range.
+
+    Use `BibIndex.open` to load the index file or rebuild it when the
+    library changed. If a key occurs more than once, the first entry wins.
+
+    Attributes:
+        path (Path): The library.
+        entries (dict[str, tuple[int, int]]): Offset and length of every entry by key.
+        macros (list[tuple[int, int]]): Offset and length of `@string` and `@preamble` blocks.
+    """
+
+    def __init__(self, path:Path|str, entries:dict[str, tuple[int, int]], macros:list[tuple[int, int]]):
+        self.path = Path(path)
+        self.entries = entries
+        self.macros = macros
+
+    @classmethod
+    def build(cls, path:Path|str)->"BibIndex":
+        """Index `path` by scanning it once."""
+        entries = {}
+        macros = []
+        for entry in iter_entries(path):
+            if entry.type in _MACROS:
+                macros.append((entry.offset, entry.length))
+            else:
+                entries.setdefault(entry.key, (entry.offset, entry.length))
+        return cls(path, entries, macros)
+
+    @classmethod
+    def open(cls, path:Path|str, *, persist:bool=True)->"BibIndex":
+        """
+        Return the index of `path`, rebuilding it only if the library changed.
+
+        Args:
+            path (Path | str): The library.
+            persist (bool): Load and store the index file next to the library.
+                Without it, the library is scanned on every call.
+
+        Returns:
+            BibIndex: The index.
+
+        Raises:
+            FileNotFoundError: If the library does not exist.
+        """
+        path = Path(path).expanduser()
+        st = path.stat()
+        stamp = [st.st_mtime_ns, st.st_size]
+        if persist:
+            try:
+                data = json.loads(index_file(path).read_text())
+                if data["stamp"] == stamp:
+                    return cls(
+                        path,
+                        {key: tuple(span) for key, span in data["entries"].items()},
+                        [tuple(span) for span in data["macros"]],
+                    )
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        index = cls.build(path)
+        if persist:
+            data = json.dumps({"stamp": stamp, "entries": index.entries, "macros": index.macros})
+            tmp = index_file(path).with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_text(data)
+                os.replace(tmp, index_file(path))
+            except OSError:
+                tmp.unlink(missing_ok=True)  # read-only library folders just skip the index file
+        return index
+
+    def __contains__(self, key:object)->bool:
+        return key in self.entries
+
+    def __len__(self)->int:
+        return len(self.entries)
+
+    def keys(self)->list[str]:
+        """Return all keys in file order."""
+        return list(self.entries)
+
+    def _read(self, f, span:tuple[int, int])->str:
+        f.seek(span[0])
+        return f.read(span[1]).decode("utf-8", errors="replace")
+
+    def get(self, key:str)->str|None:
+        """Return the entry for `key` as text, or None if there is none."""
+        span = self.entries.get(key)
+        if span is None:
+            return None
+        with open(self.path, "rb") as f:
+            return self._read(f, span)
+
+    def read(self, keys:Iterable[str])->dict[str, str]:
+        """
+        Return the entries for `keys` as text, in the given order.
+
+        Unknown keys are left out.
+        """
+        found = {}
+        with open(self.path, "rb") as f:
+            for key in keys:
+                if key in self.entries and key not in found:
+                    found[key] = self._read(f, self.entries[key])
+        return found
+
+    def read_macros(self)->list[str]:
+        """Return the `@string` and `@preamble` blocks as text."""
+        with open(self.path, "rb") as f:
+            return [self._read(f, span) for span in self.macros]
+
+
+def _join(entries:Iterable[str])->str:
+    return "".join(entry.strip() + "\n\n" for entry in entries)
+
+
+def _write(path:Path, text:str)->None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def dedupe(path:Path|str, dest:Path|str|None=None)->int:
+    """
+    Remove entries whose key (case-insensitive) or DOI already occurred.
+
+    The first occurrence is kept; `@string` and `@preamble` blocks are
+    kept as they are. Text between entries is dropped.
+
+    Args:
+        path (Path | str): The `.bib` file.
+        dest (Path | str | None): Where to write the result, default `path` itself.
+
+    Returns:
+        int: Number of removed entries.
+    """
+    path = Path(path)
+    keys, dois = set(), set()
+    removed = 0
+    kept = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            for entry in _scan(data):
+                text = data[entry.offset:entry.offset + entry.length]
+                if entry.type not in _MACROS:
+                    doi = _DOI.search(text)
+                    doi = doi.group(1).lower() if doi else None
+                    if entry.key.casefold() in keys or (doi and doi in dois):
+                        removed += 1
+                        continue
+                    keys.add(entry.key.casefold())
+                    if doi:
+                        dois.add(doi)
+                kept.append(text.decode("utf-8", errors="replace"))
+        finally:
+            if size:
+                data.close()
+    _write(Path(dest) if dest is not None else path, _join(kept))
+    return removed
+
+
+def cited_keys(project:Path|str, main:str="main.tex")->set[str]:
+    """
+    Return the keys cited with any `\\cite` variant in the document of a project.
+
+    Only the `.tex` files reached from `main` are searched; comments are
+    ignored. `\\nocite{*}` yields the key "*".
+
+    Raises:
+        FileNotFoundError: If `main` does not exist.
+    """
+    project = Path(project)
+    graph = DependencyGraph.scan(project, main)
+    keys = set()
+    for rel in graph.dependencies():
+        if not rel.endswith(".tex"):
+            continue
+        text = (project/rel).read_text(encoding="utf-8", errors="replace")
+        text = "\n".join(_COMMENT.sub("", line) for line in text.splitlines())
+        for m in _CITE.finditer(text):
+            keys.update(key.strip() for key in m.group(1).split(",") if key.strip())
+    return keys
+
+
+def _master(bib:Path)->Path|None:
+    """Return the master library named in the first line of a seeded bibliography."""
+    try:
+        with open(bib, encoding="utf-8") as f:
+            first = f.readline()
+    except OSError:
+        return None
+    if first.startswith(MASTER_COMMENT):
+        return Path(first[len(MASTER_COMMENT):].strip())
+    return None
+
+
+def trim(project:Path|str, *, master:Path|str|None=None, main:str="main.tex", bib:str=BIB_FILE)->tuple[list[str], list[str]]:
+    """
+    Rewrite a project's bibliography with exactly the cited entries.
+
+    Entries already in the project's bibliography are kept if they are
+    cited; cited keys it lacks are taken from `master`. With `\\nocite{*}`
+    nothing is removed.
+
+    Args:
+        project (Path | str): The project folder.
+        master (Path | str | None): Library to take missing entries from. Default is
+            the master named by `seed`, if any.
+        main (str): Name of the main document.
+        bib (str): Bibliography file, relative to the project.
+
+    Returns:
+        tuple[list[str], list[str]]: The keys written and the cited keys found nowhere.
+
+    Raises:
+        FileNotFoundError: If `main` or `master` does not exist.
+    """
+    project = Path(project)
+    path = project/bib
+    cited = cited_keys(project, main)
+    master = Path(master) if master is not None else _master(path)
+    own = BibIndex.open(path, persist=False) if path.is_file() else None
+    library = BibIndex.open(master) if master is not None else None
+
+    if "*" in cited:
+        cited = (set(own.keys()) if own else set()) | (cited - {"*"})
+    wanted = sorted(cited)
+    found = own.read(wanted) if own else {}
+    macros = own.read_macros() if own else []
+    rest = [key for key in wanted if key not in found]
+    if library is not None and rest:
+        found.update(library.read(rest))
+        macros += [m for m in library.read_macros() if m not in macros]
+
+    header = f"{MASTER_COMMENT}{master}\n\n" if master is not None else ""
+    _write(path, header + _join(macros) + _join(found[key] for key in wanted if key in found))
+    return [key for key in wanted if key in found], [key for key in wanted if key not in found]
+
+
+def seed(master:Path|str, keys:Iterable[str]|None=None)->str:
+    """
+    Return the content of a new project's bibliography taken from a master library.
+
+    Args:
+        master (Path | str): The shared library; it is indexed on first use.
+        keys (Iterable[str] | None): Keys to copy. Without keys only a comment naming the
+            master is written, and `trim` later adds the cited entries from it.
+
+    Returns:
+        str: Content for `literature.bib`.
+
+    Raises:
+        FileNotFoundError: If `master` does not exist.
+        ValueError: If a key is not in the master library.
+    """
+    master = Path(master).expanduser().absolute()
+    library = BibIndex.open(master)
+    if keys is None:
+        return f"{MASTER_COMMENT}{master}\n"
+    keys = list(dict.fromkeys(keys))
+    unknown = [key for key in keys if key not in library]
+    if unknown:
+        raise ValueError(f"Unknown bibliography key(s): {', '.join(unknown)}")
+    return f"{MASTER_COMMENT}{master}\n\n" + _join(library.read_macros()) + _join(library.read(keys).values())
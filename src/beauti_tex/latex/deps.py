@@ -0,0 +1,309 @@
+"""
+Dependency graph of a LaTeX project.
+
+`scan_dependencies` follows the `\\input` and `\\include` chain of a
+project, starting at `main.tex`, and collects every file the document
+reads: included `.tex` files, `\\includegraphics` images (resolved with
+the `\\graphicspath` folders) and `\\addbibresource`/`\\bibliography`
+databases. It tells which outputs are stale without running LaTeX and
+writes Make rules, e.g. for `include main.d` in a Makefile.
+
+Scans are incremental: the references found in every file are stored
+with its modification time and size in `.beauti-tex-deps.json`, and only
+files that changed since are read again.
+
+Included classes:
+- DependencyGraph
+    Files of a project and their direct dependencies.
+
+Included functions:
+- parse_refs(text: str) -> list[tuple[str, str]]
+    References of one LaTeX source.
+- scan_dependencies(project, main="main.tex", *, cache=True) -> DependencyGraph
+    Scan a project, reusing and updating its cache file.
+
+Examples:
+>>> from beauti_tex.latex.deps import scan_dependencies
+>>> graph = scan_dependencies("MyPaper")
+>>> graph.dependencies()
+['chapters/intro.tex', 'figures/plot.pdf', 'literature.bib', 'main.tex', 'pak.tex']
+>>> print(graph.to_make(), end="")
+MyPaper/main.pdf: MyPaper/chapters/intro.tex MyPaper/figures/plot.pdf ...
+"""
+
+from pathlib import Path
+from dataclasses import dataclass, field
+import json
+import os
+import re
+
+#: Cache file of `scan_dependencies`, stored in the project folder.
+DEPS_CACHE = ".beauti-tex-deps.json"
+
+# Extensions tried in this order for \includegraphics without one (pdflatex)
+GRAPHICS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".eps")
+
+# Commands whose argument names a file; \graphicspath takes a list of folders
+_REF = re.compile(
+    r"\\(input|include|includegraphics|addbibresource|bibliography|graphicspath)(?![A-Za-z@])\*?\s*(?:\[[^\]]*\]\s*)*\{"
+)
+# A "%" that is not escaped starts a comment
+_COMMENT = re.compile(r"(?<!\\)%.*")
+
+_KINDS = {
+    "input": "input", "include": "input", "includegraphics": "graphics",
+    "addbibresource": "bib", "bibliography": "bib", "graphicspath": "graphicspath",
+}
+
+
+def _group(text:str, start:int)->tuple[str, int]:
+    """Return the content of the brace group opened before `start` and the index after it."""
+    depth = 1
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i], i + 1
+    return text[start:], len(text)
+
+
+def parse_refs(text:str)->list[tuple[str, str]]:
+    """
+    Find the file references in a LaTeX source.
+
+    Comments are ignored. `\\bibliography{a,b}` yields one reference per
+    database and `\\graphicspath{{a/}{b/}}` one per folder.
+
+    Args:
+        text (str): LaTeX source.
+
+    Returns:
+        list[tuple[str, str]]: (kind, argument) pairs in order of appearance, where
+            kind is "input", "graphics", "bib" or "graphicspath".
+    """
+    text = "\n".join(_COMMENT.sub("", line) for line in text.splitlines())
+    refs = []
+    for m in _REF.finditer(text):
+        arg, _ = _group(text, m.end())
+        command = m.group(1)
+        kind = _KINDS[command]
+        if command == "graphicspath":
+            refs += [(kind, folder.strip()) for folder in re.findall(r"\{([^{}]*)\}", arg)]
+        elif command == "bibliography":
+            refs += [(kind, name.strip() + ".bib") for name in arg.split(",") if name.strip()]
+        elif arg.strip() and "#" not in arg:
+            refs.append((kind, arg.strip()))
+    return refs
+
+
+@dataclass(frozen=True)
+class _Entry:
+    mtime_ns: int
+    size: int
+    refs: tuple[tuple[str, str], ...]
+
+
+def _escape_make(path:str)->str:
+    return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+@dataclass
+class DependencyGraph:
+    """
+    Files of a project and their direct dependencies.
+
+    Attributes:
+        project (Path): The project folder.
+        main (str): Main document the scan started at.
+        files (dict[str, tuple[str, ...]]): Every existing file the document reads, as a
+            relative path with '/', mapped to the files it reads itself.
+        missing (frozenset[str]): Referenced files that do not exist.
+        rescanned (int): Number of files read by the scan; the others came from the cache.
+    """
+    project: Path
+    main: str = "main.tex"
+    files: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    missing: frozenset[str] = frozenset()
+    rescanned: int = 0
+    _entries: dict[str, _Entry] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def scan(cls, project:Path|str, main:str="main.tex", *, previous:"DependencyGraph|None"=None)->"DependencyGraph":
+        """
+        Scan a project, starting at `main`.
+
+        Args:
+            project (Path | str): The project folder.
+            main (str): Main document, relative to the project.
+            previous (DependencyGraph | None): Earlier scan whose entries are reused
+                for files with unchanged modification time and size.
+
+        Returns:
+            DependencyGraph: The graph.
+
+        Raises:
+            FileNotFoundError: If `main` does not exist.
+        """
+        project = Path(project)
+        if not (project/main).is_file():
+            raise FileNotFoundError(f"{project/main} not found!")
+        graph = cls(project, main)
+        old = previous._entries if previous is not None else {}
+        raw: dict[str, list[tuple[str, str]]] = {}
+        missing = set()
+        pending = [Path(main).as_posix()]
+        while pending:
+            rel = pending.pop()
+            if rel in raw:
+                continue
+            try:
+                st = os.stat(project/rel)
+            except OSError:
+                missing.add(rel)
+                continue
+            entry = old.get(rel)
+            if entry is None or (entry.mtime_ns, entry.size) != (st.st_mtime_ns, st.st_size):
+                text = (project/rel).read_text(encoding="utf-8", errors="replace")
+                entry = _Entry(st.st_mtime_ns, st.st_size, tuple(parse_refs(text)))
+                graph.rescanned += 1
+            graph._entries[rel] = entry
+            raw[rel] = list(entry.refs)
+            pending += [graph._input(arg) for kind, arg in reversed(entry.refs) if kind == "input"]
+
+        # \graphicspath applies to the whole document, so graphics are resolved last
+        folders = [arg for refs in raw.values() for kind, arg in refs if kind == "graphicspath"]
+        for rel, refs in raw.items():
+            deps = []
+            for kind, arg in refs:
+                if kind == "input":
+                    dep = graph._input(arg)
+                elif kind == "graphics":
+                    dep = graph._graphics(arg, folders)
+                elif kind == "bib":
+                    dep = arg
+                else:
+                    continue
+                if (project/dep).is_file():
+                    graph.files.setdefault(dep, ())
+                else:
+                    missing.add(dep)
+                deps.append(dep)
+            graph.files[rel] = tuple(dict.fromkeys(deps))
+        graph.missing = frozenset(missing)
+        return graph
+
+    def _input(self, arg:str)->str:
+        """Resolve an \\input/\\include argument like LaTeX: 'name.tex' before 'name'."""
+        if arg.endswith(".tex"):
+            return Path(arg).as_posix()
+        with_tex = Path(arg + ".tex").as_posix()
+        if (self.project/with_tex).is_file() or not (self.project/arg).is_file():
+            return with_tex
+        return Path(arg).as_posix()
+
+    def _graphics(self, arg:str, folders:list[str])->str:
+        extensions = ("",) if Path(arg).suffix else GRAPHICS_EXTENSIONS
+        candidates = [Path(folder + arg + ext).as_posix() for folder in ["", *folders] for ext in extensions]
+        return next((c for c in candidates if (self.project/c).is_file()), candidates[0])
+
+    def dependencies(self, file:str|None=None)->list[str]:
+        """
+        Return all files `file` (default: the main document) reads, directly or indirectly.
+
+        Returns:
+            list[str]: Sorted relative paths including `file`; missing files are left out.
+        """
+        start = Path(file or self.main).as_posix()
+        seen = set()
+        pending = [start]
+        while pending:
+            rel = pending.pop()
+            if rel in seen or rel not in self.files:
+                continue
+            seen.add(rel)
+            pending += self.files[rel]
+        return sorted(seen)
+
+    def stale(self, output:str|None=None)->list[str]:
+        """
+        Return the dependencies that changed after `output` was written.
+
+        Args:
+            output (str | None): Output file relative to the project, default the PDF of the main document.
+
+        Returns:
+            list[str]: Dependencies newer than `output`, all of them if `output` does not exist.
+        """
+        output = output or Path(self.main).with_suffix(".pdf").as_posix()
+        deps = self.dependencies()
+        try:
+            built = os.stat(self.project/output).st_mtime_ns
+        except OSError:
+            return deps
+        return [rel for rel in deps if os.stat(self.project/rel).st_mtime_ns > built]
+
+    def to_make(self, target:str|None=None)->str:
+        """
+        Return a Make rule for `target` (default: the PDF of the main document).
+
+        Paths are prefixed with the project folder as it was given to `scan`.
+        Like `gcc -MP`, every dependency also gets an empty rule, so make
+        does not fail when a file is removed.
+        """
+        target = target or Path(self.main).with_suffix(".pdf").as_posix()
+        deps = [_escape_make((self.project/rel).as_posix()) for rel in self.dependencies()]
+        lines = [f"{_escape_make((self.project/target).as_posix())}: " + " ".join(deps), ""]
+        lines += [f"{dep}:" for dep in deps]
+        return "\n".join(lines) + "\n"
+
+    def save(self, path:Path|str)->None:
+        """Store the scanned entries, so the next scan only reads changed files."""
+        data = {
+            "main": self.main,
+            "files": {rel: [e.mtime_ns, e.size, [list(r) for r in e.refs]] for rel, e in self._entries.items()},
+        }
+        tmp = Path(path).with_name(Path(path).name + ".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path:Path|str, project:Path|str)->"DependencyGraph|None":
+        """Return the entries stored by `save` as a graph for `scan(previous=...)`, or None if unreadable."""
+        try:
+            data = json.loads(Path(path).read_text())
+            entries = {
+                rel: _Entry(mtime, size, tuple((kind, arg) for kind, arg in refs))
+                for rel, (mtime, size, refs) in data["files"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cls(Path(project), data.get("main", "main.tex"), _entries=entries)
+
+
+def scan_dependencies(project:Path|str, main:str="main.tex", *, cache:bool=True)->DependencyGraph:
+    """
+    Scan a project incrementally.
+
+    Args:
+        project (Path | str): The project folder.
+        main (str): Main document, relative to the project.
+        cache (bool): Reuse and update `.beauti-tex-deps.json` in the project.
+
+    Returns:
+        DependencyGraph: The dependency graph.
+
+    Raises:
+        FileNotFoundError: If `main` does not exist.
+    """
+    project = Path(project)
+    cache_file = project/DEPS_CACHE
+    previous = DependencyGraph.load(cache_file, project) if cache else None
+    graph = DependencyGraph.scan(project, main, previous=previous)
+    if cache and graph.rescanned:
+        try:
+            graph.save(cache_file)
+        except OSError:
+            pass  # read-only projects are scanned in full every time
+    return graph
@@ -0,0 +1,143 @@
+"""
+Package preamble rendering for beauti-tex.
+
+Turns the `[packages]` section of a configuration into the contents of
+`pak.tex`. Each entry is either a complete LaTeX snippet (starting with a
+backslash), a list of package options, or empty to load the package
+named by the key without options.
+
+Rendering removes duplicate lines, moves packages that have to be loaded
+late (e.g. `hyperref`) to the end and rejects known package conflicts.
+Results are memoized per package set.
+
+Included classes:
+- PreambleError
+    Raised for conflicting package entries.
+
+Included functions:
+- render_preamble(packages: Mapping[str, str]) -> str
+    Render the package preamble.
+- package_names(snippet: str) -> list[str]
+    Return the packages loaded by a snippet.
+
+Examples:
+>>> print(render_preamble({"hyperref": "hidelinks", "amsmath": ""}), end="")
+% Packages generated by beauti-tex from the [packages] configuration
+\\usepackage{amsmath}
+\\usepackage[hidelinks]{hyperref}
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+import re
+
+_USEPACKAGE = re.compile(r"\\(?:usepackage|RequirePackage)\s*(\[[^\]]*\])?\s*\{([^}]*)\}")
+
+#: Packages that must be loaded after all others, in this order.
+LOAD_LAST = ("hyperref", "bookmark", "cleveref")
+
+#: Pairs of packages that cannot be loaded together.
+CONFLICTS = frozenset(frozenset(pair) for pair in (
+    ("subfig", "subcaption"),
+    ("subfigure", "subcaption"),
+    ("subfigure", "subfig"),
+    ("natbib", "biblatex"),
+    ("cite", "biblatex"),
+    ("times", "mathptmx"),
+    ("fontspec", "inputenc"),
+    ("caption2", "caption"),
+))
+
+_HEADER = "% Packages generated by beauti-tex from the [packages] configuration"
+
+
+class PreambleError(ValueError):
+    """Raised when the configured packages conflict with each other."""
+
+
+def package_names(snippet:str)->list[str]:
+    """
+    Return the names of all packages loaded by a LaTeX snippet.
+
+    Args:
+        snippet (str): LaTeX code, e.g. `\\usepackage[english]{babel}`.
+
+    Returns:
+        list[str]: Package names in load order.
+    """
+    names = []
+    for match in _USEPACKAGE.finditer(snippet):
+        names.extend(name.strip() for name in match.group(2).split(",") if name.strip())
+    return names
+
+
+def _snippet(key:str, value:str)->str:
+    value = value.strip()
+    if not value:
+        return f"\\usepackage{{{key}}}"
+    if not value.startswith("\\"):
+        return f"\\usepackage[{value}]{{{key}}}"
+    return value
+
+
+def _priority(names:list[str])->int:
+    ranks = [LOAD_LAST.index(name) + 1 for name in names if name in LOAD_LAST]
+    return max(ranks, default=0)
+
+
+def render_preamble(packages:Mapping[str, str])->str:
+    """
+    Render the package preamble for `pak.tex`.
+
+    Args:
+        packages (Mapping[str, str]): Package entries as in `Config.packages`.
+
+    Returns:
+        str: The preamble text, ending with a newline.
+
+    Raises:
+        PreambleError: If two entries load the same package with different
+                       options, or if conflicting packages are configured.
+    """
+    return _render(tuple(packages.items()))
+
+
+@lru_cache(maxsize=64)
+def _render(items:tuple[tuple[str, str], ...])->str:
+    loaded = {}
+    blocks = []
+    for key, value in items:
+        lines = []
+        for line in _snippet(key, value).splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            for match in _USEPACKAGE.finditer(line):
+                for name in package_names(match.group(0)):
+                    options = match.group(1) or ""
+                    if name in loaded and loaded[name][1] != options:
+                        raise PreambleError(
+                            f"Package {name} is loaded by [{loaded[name][0]}] and [{key}] with different options."
+                        )
+                    loaded.setdefault(name, (key, options))
+            lines.append(line)
+        blocks.append((key, lines))
+
+    for pair in CONFLICTS:
+        if pair <= loaded.keys():
+            a, b = sorted(pair)
+            raise PreambleError(
+                f"Packages {a} ([{loaded[a][0]}]) and {b} ([{loaded[b][0]}]) cannot be loaded together."
+            )
+
+    # stable sort keeps the configured order except for late packages
+    blocks.sort(key=lambda block: _priority(package_names("\n".join(block[1]))))
+    out = [_HEADER]
+    seen = set()
+    for _, lines in blocks:
+        for line in lines:
+            if line in seen:
+                continue
+            seen.add(line)
+            out.append(line)
+    return "\n".join(out) + "\n"
@@ -0,0 +1,133 @@
+"""
+Precompiled preamble (format file) support for beauti-tex.
+
+Loading a heavy preamble (pgfplots, hyperref, biblatex, ...) dominates
+the compile time of small documents. With the `mylatexformat` package the
+static preamble can be dumped once into a `.fmt` file and reused by every
+following build.
+
+`precompile_files` splits a rendered `main.tex` into
+
+- `preamble.tex`: everything before `\\begin{document}`, ending with
+  `\\endofdump` so `mylatexformat` knows where to stop,
+- `main.tex`: only inputs `preamble.tex` if it was not loaded from a format,
+  so the document still compiles without the format,
+- `latex-build.sh`: dumps the format once and compiles with it.
+
+The format is named after a hash of `preamble.tex` and `pak.tex`, so
+projects sharing the same preamble can share one format file through the
+`BEAUTITEX_FMT_DIR` environment variable.
+
+Included functions:
+- split_preamble(main: str) -> tuple[str, str]
+    Split a document into preamble and body.
+- format_name(preamble: str, pak: str) -> str
+    Name of the format file for a preamble.
+- precompile_files(main: str, pak: str) -> dict[str, str]
+    Files that set up a precompiled preamble for a project.
+"""
+
+import hashlib
+
+SCRIPT_NAME = "latex-build.sh"
+
+_BEGIN_DOCUMENT = "\\begin{document}"
+
+_MAIN_HEAD = r"""% The static preamble lives in preamble.tex. It is skipped if it was
+% already loaded from a precompiled format (see latex-build.sh).
+\ifdefined\beautitexformat\else
+	\input{preamble}
+\fi
+"""
+
+_SCRIPT = """#!/bin/sh
+# Generated by beauti-tex.
+# Dumps the static preamble (preamble.tex + pak.tex) into a format file
+# once and compiles main.tex with it. Set BEAUTITEX_FMT_DIR to share
+# format files between projects with the same preamble.
+set -e
+cd "$(dirname "$0")"
+
+if command -v sha256sum >/dev/null 2>&1; then
+    HASH=$(cat preamble.tex pak.tex | sha256sum | cut -c1-16)
+else
+    HASH=$(cat preamble.tex pak.tex | shasum -a 256 | cut -c1-16)
+fi
+FMT="beautitex-$HASH"
+FMT_DIR="${BEAUTITEX_FMT_DIR:-.}"
+
+if [ ! -f "$FMT_DIR/$FMT.fmt" ]; then
+    mkdir -p "$FMT_DIR"
+    pdftex -ini -interaction=nonstopmode -halt-on-error \\
+        -output-directory="$FMT_DIR" -jobname="$FMT.$$" \\
+        "&pdflatex" mylatexformat.ltx preamble.tex
+    # rename atomically so parallel builds never see a half written format
+    mv "$FMT_DIR/$FMT.$$.fmt" "$FMT_DIR/$FMT.fmt"
+    rm -f "$FMT_DIR/$FMT.$$.log"
+fi
+
+export TEXFORMATS="$FMT_DIR:${TEXFORMATS:-}"
+exec latexmk -pdf -pdflatex="pdflatex -fmt=$FMT %O %S" main.tex
+"""
+
+
+def split_preamble(main:str)->tuple[str, str]:
+    """
+    Split a LaTeX document at `\\begin{document}`.
+
+    Args:
+        main (str): Complete LaTeX document.
+
+    Returns:
+        tuple[str, str]: The preamble and the rest of the document,
+                         starting with `\\begin{document}`.
+
+    Raises:
+        ValueError: If the document has no `\\begin{document}`.
+    """
+    index = main.find(_BEGIN_DOCUMENT)
+    if index < 0:
+        raise ValueError("main.tex has no \\begin{document}, the preamble cannot be precompiled.")
+    return main[:index], main[index:]
+
+
+def format_name(preamble:str, pak:str)->str:
+    """
+    Return the format name used by `latex-build.sh` for a preamble.
+
+    Args:
+        preamble (str): Contents of `preamble.tex`.
+        pak (str): Contents of `pak.tex`.
+
+    Returns:
+        str: Format name without the `.fmt` suffix.
+    """
+    return "beautitex-" + hashlib.sha256((preamble + pak).encode()).hexdigest()[:16]
+
+
+def precompile_files(main:str, pak:str)->dict[str, str]:
+    """
+    Return the files needed to build a project with a precompiled preamble.
+
+    Args:
+        main (str): Rendered `main.tex`.
+        pak (str): Rendered `pak.tex`.
+
+    Returns:
+        dict[str, str]: New contents for `main.tex`, `preamble.tex` and `latex-build.sh`.
+
+    Raises:
+        ValueError: If `main` has no `\\begin{document}`.
+    """
+    head, body = split_preamble(main)
+    preamble = (
+        "% Static preamble, dumped into a format file by latex-build.sh\n"
+        + head.rstrip() + "\n\n"
+        + "\\def\\beautitexformat{}\n"
+        + "\\csname endofdump\\endcsname\n"
+    )
+    return {
+        "main.tex": _MAIN_HEAD + "\n" + body,
+        "preamble.tex": preamble,
+        SCRIPT_NAME: _SCRIPT,
+    }
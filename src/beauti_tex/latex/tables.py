@@ -0,0 +1,259 @@
+"""
+CSV to LaTeX table conversion for the `tables/` folder.
+
+`csv_to_table` streams the rows of a CSV file into a `booktabs` table,
+either a `longtable` that breaks across pages or a `tabular` in a
+`table` float, optionally rotated with `pdflscape`. Rows are read, escaped
+and written in batches, so memory use does not depend on the size of the
+CSV file. The cells of a whole batch are escaped with one `str.translate`
+call.
+
+Very large tables can be split into chunks of `chunk_rows` rows: every
+chunk is a complete table in its own file and the output file only
+`\\input`s the chunks, so editors and LaTeX never have to deal with one
+huge file. All files are written to temporary files first and renamed into
+place at the end; chunk files left over from an earlier, longer run are
+removed.
+
+Included classes:
+- TableResult
+    Number of rows and the files written.
+
+Included functions:
+- escape_cells(cells: list[str]) -> list[str]
+    Escape many cells for LaTeX at once.
+- csv_to_table(source, dest, *, style="longtable", ...) -> TableResult
+    Convert a CSV file into a LaTeX table.
+
+Examples:
+>>> from beauti_tex.latex.tables import csv_to_table
+>>> csv_to_table("results.csv", "tables/results.tex", caption="Results", label="tab:results").rows
+1200
+"""
+
+from pathlib import Path
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import csv
+import itertools
+import os
+import re
+from .template import _TEX_ESCAPES
+
+STYLES = ("longtable", "tabular")
+
+# Rows escaped and written at once
+_BATCH = 1024
+# Rows looked at to guess the column alignment
+_SAMPLE = 100
+# Joins the cells of a batch for escaping; if a cell contains it, the cells are escaped one by one
+_SEPARATOR = "\x1f"
+# Line breaks inside quoted cells would end the table row
+_CELL_ESCAPES = {**_TEX_ESCAPES, ord("\n"): " ", ord("\r"): " "}
+
+
+@dataclass
+class TableResult:
+    """
+    Result of `csv_to_table`.
+
+    Attributes:
+        rows (int): Number of body rows written (without the header).
+        files (list[Path]): The output file, followed by the chunk files if any.
+    """
+    rows: int = 0
+    files: list[Path] = field(default_factory=list)
+
+
+def escape_cells(cells:list[str])->list[str]:
+    """
+    Escape LaTeX special characters in many cells with a single `str.translate`.
+
+    Line breaks in cells become spaces.
+
+    Args:
+        cells (list[str]): Plain text cells.
+
+    Returns:
+        list[str]: The escaped cells, in the same order.
+    """
+    joined = _SEPARATOR.join(cells)
+    if joined.count(_SEPARATOR) != max(len(cells) - 1, 0):
+        return [cell.translate(_CELL_ESCAPES) for cell in cells]
+    return joined.translate(_CELL_ESCAPES).split(_SEPARATOR) if cells else []
+
+
+def _is_number(cell:str)->bool:
+    try:
+        float(cell.replace(",", ""))
+    except ValueError:
+        return False
+    return True
+
+
+def _guess_align(header:list[str]|None, sample:list[list[str]])->str:
+    """Right-align columns whose non-empty cells are all numbers; the header sets the number of columns."""
+    width = len(header) if header else max(len(row) for row in sample)
+    align = ""
+    for i in range(width):
+        cells = [row[i].strip() for row in sample if i < len(row) and row[i].strip()]
+        align += "r" if cells and all(map(_is_number, cells)) else "l"
+    return align
+
+
+def _columns(align:str)->int:
+    """Count the columns of a column specification like "l|r@{}p{3cm}"."""
+    return sum(c.isalpha() for c in re.sub(r"\{[^{}]*\}|\[[^\]]*\]", "", align))
+
+
+def _lines(rows:Iterator[list[str]], width:int)->Iterator[str]:
+    """Escape and format rows in batches."""
+    while True:
+        batch = list(itertools.islice(rows, _BATCH))
+        if not batch:
+            return
+        # pad or cut every row to the table width
+        batch = [row[:width] + [""]*(width - len(row)) for row in batch]
+        cells = iter(escape_cells([cell for row in batch for cell in row]))
+        yield "".join(" & ".join(itertools.islice(cells, width)) + " \\\\\n" for _ in batch)
+
+
+def _head(style:str, align:str, header:str|None, caption:str|None, label:str|None, continued:bool)->str:
+    caption_line = ""
+    if caption and not continued:
+        caption_line = f"\\caption{{{caption}}}" + (f"\\label{{{label}}}" if label else "")
+    elif caption and style == "longtable":
+        # an unnumbered caption, so the chunks count as one table
+        caption_line = f"\\caption*{{{caption} (continued)}}"
+    titles = f"\\toprule\n{header} \\\\\n\\midrule\n" if header is not None else "\\toprule\n"
+    if style == "longtable":
+        head = f"\\begin{{longtable}}{{{align}}}\n"
+        if caption_line:
+            head += caption_line + " \\\\\n"
+        return head + titles + "\\endfirsthead\n" + titles + "\\endhead\n\\bottomrule\n\\endlastfoot\n"
+    head = "\\begin{table}[htbp]\n\\centering\n"
+    if caption_line:
+        head += caption_line + "\n"
+    return head + f"\\begin{{tabular}}{{{align}}}\n" + titles
+
+
+def _foot(style:str)->str:
+    if style == "longtable":
+        return "\\end{longtable}\n"
+    return "\\bottomrule\n\\end{tabular}\n\\end{table}\n"
+
+
+def _input_name(path:Path, relative_to:Path|str|None)->str:
+    """Return the name of a chunk file as written in \\input."""
+    base = Path(relative_to) if relative_to is not None else Path.cwd()
+    try:
+        path = path.absolute().relative_to(base.absolute())
+    except ValueError:
+        path = path.absolute()
+    return path.with_suffix("").as_posix()
+
+
+def _stale_chunks(dest:Path, count:int)->list[Path]:
+    """Return chunk files of `dest` numbered above `count`."""
+    pattern = re.compile(rf"{re.escape(dest.stem)}-(\d{{3,}}){re.escape(dest.suffix)}")
+    stale = []
+    for path in dest.parent.iterdir():
+        match = pattern.fullmatch(path.name)
+        if match and int(match.group(1)) > count:
+            stale.append(path)
+    return sorted(stale)
+
+
+def _tmp(path:Path)->Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def csv_to_table(source:Path|str, dest:Path|str, *, style:str="longtable", caption:str|None=None, label:str|None=None, align:str|None=None, header:bool=True, chunk_rows:int|None=None, landscape:bool=False, delimiter:str=",", encoding:str="utf-8", relative_to:Path|str|None=None)->TableResult:
+    """
+    Convert a CSV file into a booktabs LaTeX table.
+
+    Args:
+        source (Path | str): The CSV file.
+        dest (Path | str): The `.tex` file to write, e.g. `tables/results.tex`.
+        style (str): "longtable" (breaks across pages) or "tabular" (a `table` float).
+        caption (str | None): Caption, LaTeX markup allowed.
+        label (str | None): Label for `\\ref`, e.g. "tab:results".
+        align (str | None): Column specification, e.g. "lrr". Default: numeric
+            columns right-aligned, the others left-aligned, guessed from the first rows.
+        header (bool): The first row holds the column titles.
+        chunk_rows (int | None): Split the table into chunk files of this many rows,
+            `<dest>-001.tex`, ..., which `dest` inputs.
+        landscape (bool): Rotate the table with the `landscape` environment of pdflscape.
+        delimiter (str): CSV field delimiter.
+        encoding (str): Encoding of the CSV file.
+        relative_to (Path | str | None): Folder LaTeX runs in, used for the `\\input`
+            paths of chunks. Default is the current working directory.
+
+    Returns:
+        TableResult: Number of rows and the files written.
+
+    Raises:
+        ValueError: If `style` is unknown, `chunk_rows` is less than 1 or the CSV file is empty.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown table style {style!r}, use {' or '.join(STYLES)}.")
+    if chunk_rows is not None and chunk_rows < 1:
+        raise ValueError("chunk_rows must be at least 1.")
+    dest = Path(dest)
+    result = TableResult(files=[dest])
+    with open(source, newline="", encoding=encoding) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        titles = next(reader, None) if header else None
+        sample = list(itertools.islice(reader, _SAMPLE))
+        if titles is None and not sample:
+            raise ValueError(f"{source} contains no rows.")
+        align = align or _guess_align(titles, sample)
+        width = _columns(align)
+        head_row = " & ".join(escape_cells((titles + [""]*width)[:width])) if titles is not None else None
+        rows = itertools.chain(sample, reader)
+
+        def write_table(out, rows:Iterator[list[str]], continued:bool)->int:
+            written = 0
+            if landscape:
+                out.write("\\begin{landscape}\n")
+            out.write(_head(style, align, head_row, caption, label, continued))
+            for lines in _lines(rows, width):
+                out.write(lines)
+                written += lines.count("\n")
+            out.write(_foot(style))
+            if landscape:
+                out.write("\\end{landscape}\n")
+            return written
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp(dest)
+        # final path -> temporary file of every chunk
+        parts = {}
+        try:
+            with open(tmp, "w", encoding="utf-8") as out:
+                out.write(f"% Generated by beauti-tex from {Path(source).name}\n")
+                if chunk_rows is None:
+                    result.rows = write_table(out, rows, False)
+                else:
+                    for number in itertools.count(1):
+                        first = list(itertools.islice(rows, 1))
+                        if not first and number > 1:
+                            break
+                        part = dest.with_name(f"{dest.stem}-{number:03}{dest.suffix}")
+                        chunk = itertools.chain(first, itertools.islice(rows, chunk_rows - 1))
+                        parts[part] = _tmp(part)
+                        with open(parts[part], "w", encoding="utf-8") as chunk_out:
+                            result.rows += write_table(chunk_out, chunk, number > 1)
+                        result.files.append(part)
+                        out.write(f"\\input{{{_input_name(part, relative_to)}}}\n")
+            # the chunks first, so the new output file never inputs a missing chunk
+            for part, part_tmp in parts.items():
+                os.replace(part_tmp, part)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+            for part_tmp in parts.values():
+                part_tmp.unlink(missing_ok=True)
+    for path in _stale_chunks(dest, len(parts)):
+        path.unlink(missing_ok=True)
+    return result
@@ -0,0 +1,151 @@
+"""
+Placeholder templates for beauti-tex.
+
+Templates are plain LaTeX files containing placeholders of the form
+`<<NAME>>` (upper case letters, digits and underscores). A template is
+parsed once into a list of literal and slot segments and can then be
+rendered any number of times in a single pass.
+
+Included classes:
+- Template
+    Compiled template that renders from a context dict.
+- TemplateError
+    Raised when placeholders cannot be filled.
+
+Included functions:
+- escape_tex(text: str) -> str
+    Escape LaTeX special characters in user supplied text.
+
+Examples:
+>>> t = Template(r"\\documentclass[<<SIZE>>]{<<CLAS>>}")
+>>> t.render({"SIZE": 12, "CLAS": "report"})
+'\\\\documentclass[12]{report}'
+"""
+
+from pathlib import Path
+from collections.abc import Mapping
+import re
+
+_PLACEHOLDER = re.compile(r"<<([A-Z][A-Z0-9_]*)>>")
+
+_TEX_ESCAPES = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+})
+
+
+def escape_tex(text:str)->str:
+    """
+    Escape LaTeX special characters.
+
+    Args:
+        text (str): Plain text, e.g. an author name.
+
+    Returns:
+        str: Text that can be placed verbatim into a LaTeX document.
+    """
+    return text.translate(_TEX_ESCAPES)
+
+
+class TemplateError(ValueError):
+    """
+    Raised when a template cannot be rendered with the given context.
+
+    Attributes:
+        missing (frozenset[str]): Placeholders without a value.
+        unknown (frozenset[str]): Context keys that are not used by the template.
+    """
+    def __init__(self, message:str, *, missing=frozenset(), unknown=frozenset()):
+        super().__init__(message)
+        self.missing = frozenset(missing)
+        self.unknown = frozenset(unknown)
+
+
+class Template:
+    """
+    A template compiled into literal and slot segments.
+
+    Attributes:
+        source (str): The original template text.
+        placeholders (frozenset[str]): Names of all placeholders in the template.
+    """
+    __slots__ = ("source", "placeholders", "_parts", "_slots")
+
+    def __init__(self, source:str):
+        parts = []
+        slots = []
+        pos = 0
+        for match in _PLACEHOLDER.finditer(source):
+            if match.start() > pos:
+                parts.append(source[pos:match.start()])
+            slots.append((len(parts), match.group(1)))
+            parts.append("")
+            pos = match.end()
+        if pos < len(source):
+            parts.append(source[pos:])
+        self.source = source
+        self.placeholders = frozenset(name for _, name in slots)
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+
+    @classmethod
+    def from_file(cls, path:Path|str)->"Template":
+        """
+        Read and compile a template file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        return cls(Path(path).read_text(encoding="utf-8"))
+
+    def missing(self, context:Mapping[str, object])->frozenset[str]:
+        """Return the placeholders that have no value in `context`."""
+        return frozenset(name for name in self.placeholders if name not in context)
+
+    def unknown(self, context:Mapping[str, object])->frozenset[str]:
+        """Return the keys of `context` that are not placeholders of this template."""
+        return frozenset(key for key in context if key not in self.placeholders)
+
+    def render(self, context:Mapping[str, object], *, strict:bool=False)->str:
+        """
+        Fill all placeholders in a single pass.
+
+        Args:
+            context (Mapping[str, object]): Placeholder values, converted with `str()`.
+            strict (bool): Also reject context keys the template does not use.
+
+        Returns:
+            str: The rendered text.
+
+        Raises:
+            TemplateError: If a placeholder is missing, or with `strict`
+                           if the context contains unknown keys.
+        """
+        missing = self.missing(context)
+        if missing:
+            raise TemplateError(
+                f"Missing value(s) for placeholder(s): {', '.join(sorted(missing))}",
+                missing=missing,
+            )
+        if strict:
+            unknown = self.unknown(context)
+            if unknown:
+                raise TemplateError(
+                    f"Unknown placeholder(s): {', '.join(sorted(unknown))}",
+                    unknown=unknown,
+                )
+        parts = list(self._parts)
+        for index, name in self._slots:
+            parts[index] = str(context[name])
+        return "".join(parts)
+
+    def __repr__(self)->str:
+        return f"Template(placeholders={sorted(self.placeholders)!r})"
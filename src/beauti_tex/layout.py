@@ -0,0 +1,125 @@
+"""
+Declarative project layouts for beauti-tex.
+
+A layout file (`layout.ini` in the templates folder) describes the whole
+tree of a generated project: the folders to create and, for every file,
+where its content comes from. It is parsed once into an immutable
+`Layout`; the project builder only expands it per project.
+
+Example layout file:
+
+    [dirs]
+    chapters
+
+    [files]
+    main.tex = template:main.tex
+    pak.tex = preamble
+    literature.bib = empty
+    chapters/{chapter}.tex = chapter
+
+File kinds:
+- template:NAME   Template `NAME` from the templates folder, rendered with the project values.
+- static:NAME     Template `NAME` without placeholders that users never edit, such as a
+                  class file; it may be shared through the asset store (`link_assets`).
+- preamble        The `\\usepackage` lines generated from the `[packages]` configuration.
+- chapter         One file per configured chapter; the path must contain `{chapter}`.
+- empty           An empty file.
+
+Included classes:
+- Layout
+    Immutable, validated project layout.
+- LayoutError
+    Raised for invalid layout files.
+"""
+
+from pathlib import Path, PurePosixPath
+from dataclasses import dataclass
+import configparser
+
+#: Name of the layout file inside a templates folder.
+LAYOUT_FILE = "layout.ini"
+
+KINDS = ("template", "static", "preamble", "chapter", "empty")
+# kinds that take a template name
+_NAMED = ("template", "static")
+
+
+class LayoutError(ValueError):
+    """Raised when a layout file is invalid."""
+
+
+def _check_path(path:str, source:str)->str:
+    pure = PurePosixPath(path)
+    if not path or pure.is_absolute() or ".." in pure.parts or "\\" in path:
+        raise LayoutError(f"{source}: invalid path {path!r}, use relative paths with '/'.")
+    return pure.as_posix()
+
+
+@dataclass(frozen=True)
+class Layout:
+    """
+    The folders and files of a project.
+
+    Attributes:
+        dirs (tuple[str, ...]): Folders created in every project, besides the configured ones.
+        files (tuple[tuple[str, str, str], ...]): Triples of file path, kind and argument
+            (the template name for "template" and "static", else an empty string), in file order.
+    """
+    dirs: tuple[str, ...]
+    files: tuple[tuple[str, str, str], ...]
+
+    @classmethod
+    def parse(cls, text:str, source:str="<layout>")->"Layout":
+        """
+        Parse and validate the content of a layout file.
+
+        Args:
+            text (str): INI text with `[dirs]` and `[files]` sections.
+            source (str): Name used in error messages.
+
+        Returns:
+            Layout: The compiled layout.
+
+        Raises:
+            LayoutError: If a section is missing, a path is not relative,
+                         a kind is unknown or `{chapter}` is misused.
+        """
+        parser = configparser.ConfigParser(allow_no_value=True, interpolation=None, delimiters=("=",), strict=False)
+        parser.optionxform = str
+        try:
+            parser.read_string(text, source)
+        except configparser.Error as e:
+            raise LayoutError(f"{source}: {e}") from None
+        if not parser.has_section("files"):
+            raise LayoutError(f"{source}: missing [files] section.")
+        dirs = [_check_path(d, source) for d in (parser["dirs"] if parser.has_section("dirs") else ())]
+        files = []
+        for path, value in parser["files"].items():
+            path = _check_path(path, source)
+            kind, _, arg = (value or "").strip().partition(":")
+            kind, arg = kind.strip(), arg.strip()
+            if kind not in KINDS:
+                raise LayoutError(f"{source}: unknown kind {kind!r} for {path}, use one of {', '.join(KINDS)}.")
+            if (kind in _NAMED) != bool(arg):
+                raise LayoutError(f"{source}: {path} needs '{kind}:NAME'." if kind in _NAMED
+                                  else f"{source}: {kind} takes no argument ({path}).")
+            if (kind == "chapter") != ("{chapter}" in path):
+                raise LayoutError(f"{source}: {{chapter}} is required in, and only allowed in, chapter paths ({path}).")
+            files.append((path, kind, arg))
+        return cls(tuple(dict.fromkeys(dirs)), tuple(files))
+
+    @classmethod
+    def from_file(cls, path:Path|str)->"Layout":
+        """
+        Read and compile a layout file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            LayoutError: If the layout is invalid.
+        """
+        return cls.parse(Path(path).read_text(encoding="utf-8"), str(path))
+
+    @property
+    def templates(self)->tuple[str, ...]:
+        """tuple[str, ...]: Names of all templates used by the layout."""
+        return tuple(dict.fromkeys(arg for _, kind, arg in self.files if kind in _NAMED))
@@ -0,0 +1,376 @@
+"""
+Writing generated projects for beauti-tex.
+
+A project is first rendered into a `ProjectPlan`, an immutable list of
+directories and files. The plan is then written in one transaction:
+everything goes into a hidden staging folder next to the target, which is
+renamed into place when complete. If anything fails, the staging folder
+is removed and the target never exists in a half-built state.
+
+Where a plan is written is decided by an output backend. Besides the
+disk there are backends that keep projects in memory or stream them into
+a zip or tar archive, so a generated project never has to touch the file
+system.
+
+Included classes:
+- ProjectPlan
+    Immutable set of directories and files making up a project.
+- OutputBackend
+    Interface of all output backends.
+- DiskBackend
+    Writes projects into a base folder on disk.
+- MemoryBackend
+    Keeps projects in a dict.
+- ZipBackend, TarBackend
+    Stream projects into an archive on a file-like object.
+
+Included functions:
+- write_plan(plan: ProjectPlan, target: Path | str, *, store=None, executor=None) -> Path
+    Atomically create a project folder from a plan, optionally writing files concurrently.
+- archive_backend(fileobj, fmt: str) -> OutputBackend
+    Create an archive backend by format name.
+"""
+
+from pathlib import Path, PurePosixPath
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Executor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO
+import errno
+import io
+import os
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from .profiling import stage
+
+if TYPE_CHECKING:
+    from .store import AssetStore
+
+
+@dataclass(frozen=True)
+class ProjectPlan:
+    """
+    Directories and files of a project, relative to the project folder.
+
+    Directories are sorted, so parents always come before their children.
+    Paths use forward slashes on every platform. Text content is written
+    as UTF-8, bytes are written as they are.
+
+    Attributes:
+        dirs (tuple[str, ...]): Directories to create, including all parents of files.
+        files (tuple[tuple[str, str | bytes], ...]): Pairs of file path and content.
+        static (frozenset[str]): Files with content shared by many projects, which
+            may be linked from an `AssetStore` instead of being copied.
+    """
+    dirs: tuple[str, ...]
+    files: tuple[tuple[str, str | bytes], ...]
+    static: frozenset[str] = frozenset()
+
+    @classmethod
+    def build(cls, dirs:Iterable[str], files:Mapping[str, str | bytes], static:Iterable[str]=())->"ProjectPlan":
+        """
+        Create a plan, adding missing parent directories and removing duplicates.
+
+        Args:
+            dirs (Iterable[str]): Directories that should exist, even if empty.
+            files (Mapping[str, str | bytes]): File paths and their content.
+            static (Iterable[str]): Files that may be linked from an asset store.
+
+        Returns:
+            ProjectPlan: The normalized plan.
+        """
+        all_dirs = set()
+        for path in [*dirs, *(str(PurePosixPath(name).parent) for name in files)]:
+            path = PurePosixPath(path)
+            while str(path) not in (".", ""):
+                all_dirs.add(str(path))
+                path = path.parent
+        return cls(tuple(sorted(all_dirs)), tuple(files.items()), frozenset(static) & files.keys())
+
+    @staticmethod
+    def mode(name:str)->int:
+        """Return the permission bits for a file: executable for shell scripts."""
+        return 0o755 if name.endswith(".sh") else 0o644
+
+    @property
+    def size(self)->int:
+        """int: Total number of bytes of all file contents."""
+        return sum(len(_data(content)) for _, content in self.files)
+
+
+def _data(content:str|bytes)->bytes:
+    return content if isinstance(content, bytes) else content.encode()
+
+
+def write_plan(plan:ProjectPlan, target:Path|str, *, store:"AssetStore|None"=None, executor:Executor|None=None)->Path:
+    """
+    Atomically create the folder `target` with the contents of `plan`.
+
+    The project is built in a hidden sibling folder and moved into place
+    with a single rename. On failure the staging folder is removed.
+    Files are written as UTF-8.
+
+    Args:
+        plan (ProjectPlan): Directories and files to create.
+        target (Path | str): The project folder, which must not exist yet.
+        store (AssetStore | None): Link the static files of the plan from this
+            store (copy-on-write reflinks) instead of writing copies.
+        executor (Executor | None): Write the files concurrently with this
+            executor, e.g. a `ThreadPoolExecutor`. The folders are created and
+            the project is committed in the calling thread either way.
+
+    Returns:
+        Path: The created project folder.
+
+    Raises:
+        FileExistsError: If the project folder already exists.
+        PermissionError: If the parent folder is not writable.
+    """
+    target = Path(target)
+    staging = _staging(target)
+    try:
+        _make_dirs(plan, staging)
+        with stage("write") as st:
+            if executor is None:
+                sizes = [_write_file(plan, staging, name, content, store) for name, content in plan.files]
+            else:
+                futures = [executor.submit(_write_file, plan, staging, name, content, store) for name, content in plan.files]
+                # let every write finish before the staging folder may be removed
+                wait(futures)
+                sizes = [future.result() for future in futures]
+            st.bytes_written += sum(sizes)
+            st.fs_ops_estimate += len(sizes)
+        _commit(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def _staging(target:Path)->Path:
+    """Check that `target` can be created and return the path of its staging folder."""
+    if target.exists():
+        raise FileExistsError(f"{target} already exists!")
+    if not os.access(target.parent, os.W_OK):
+        raise PermissionError(f"No write permission in {target}!")
+    return target.parent/f".{target.name}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+def _make_dirs(plan:ProjectPlan, staging:Path)->None:
+    with stage("mkdir") as st:
+        staging.mkdir()
+        for folder in plan.dirs:
+            (staging/folder).mkdir()
+        st.fs_ops_estimate += 1 + len(plan.dirs)
+
+
+def _write_file(plan:ProjectPlan, staging:Path, name:str, content:str|bytes, store:"AssetStore|None"=None)->int:
+    """Write one file of the plan and return the number of bytes written."""
+    path = staging/name
+    data = _data(content)
+    if store is not None and name in plan.static:
+        if store.materialize(data, path, executable=name.endswith(".sh")) != "copy":
+            return 0
+        return len(data)
+    path.write_bytes(data)
+    if name.endswith(".sh"):
+        path.chmod(plan.mode(name))
+    return len(data)
+
+
+def _commit(staging:Path, target:Path)->None:
+    with stage("rename") as st:
+        if target.exists():
+            raise FileExistsError(f"{target} already exists!")
+        try:
+            os.rename(staging, target)
+        except OSError as e:
+            # another writer committed the same project in the meantime
+            if e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                raise FileExistsError(f"{target} already exists!") from None
+            raise
+        # the exists check and the rename
+        st.fs_ops_estimate += 2
+
+
+class OutputBackend:
+    """
+    Destination for generated projects.
+
+    Subclasses implement `write`. Backends may be used from several
+    threads at once (e.g. by `make_projects`).
+    """
+
+    def write(self, name:str, plan:ProjectPlan)->None:
+        """
+        Write one project.
+
+        Args:
+            name (str): Name of the project folder. May contain `/` to
+                        place the project in a sub folder.
+            plan (ProjectPlan): Directories and files of the project.
+
+        Raises:
+            FileExistsError: If a project with this name was already written.
+        """
+        raise NotImplementedError
+
+    def close(self)->None:
+        """Finish the output. The default implementation does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DiskBackend(OutputBackend):
+    """
+    Writes projects atomically into a base folder (see `write_plan`).
+
+    Attributes:
+        base (Path): Folder the projects are created in.
+        store (AssetStore | None): Store to link static files from.
+    """
+
+    def __init__(self, base:Path|str|None=None, *, store:"AssetStore|None"=None):
+        self.base = Path(base) if base is not None else Path.cwd()
+        self.store = store
+
+    def write(self, name:str, plan:ProjectPlan)->None:
+        write_plan(plan, self.base/name, store=self.store)
+
+
+class MemoryBackend(OutputBackend):
+    """
+    Keeps written projects in memory.
+
+    Attributes:
+        dirs (set[str]): All directories, e.g. `"MyPaper/chapters"`.
+        files (dict[str, str | bytes]): File contents by path, e.g. `"MyPaper/main.tex"`.
+    """
+
+    def __init__(self):
+        self.dirs = set()
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def write(self, name:str, plan:ProjectPlan)->None:
+        with stage("write"), self._lock:
+            if name in self.dirs:
+                raise FileExistsError(f"{name} already exists!")
+            self.dirs.add(name)
+            self.dirs.update(f"{name}/{folder}" for folder in plan.dirs)
+            self.files.update((f"{name}/{path}", content) for path, content in plan.files)
+
+
+class _ArchiveBackend(OutputBackend):
+    def __init__(self):
+        self._names = set()
+        self._lock = threading.Lock()
+
+    def write(self, name:str, plan:ProjectPlan)->None:
+        with stage("write") as st, self._lock:
+            if name in self._names:
+                raise FileExistsError(f"{name} already exists!")
+            self._names.add(name)
+            self._add_dir(name)
+            for folder in plan.dirs:
+                self._add_dir(f"{name}/{folder}")
+            for path, content in plan.files:
+                data = _data(content)
+                self._add_file(f"{name}/{path}", data, plan.mode(path))
+                st.bytes_written += len(data)
+
+    def _add_dir(self, name:str)->None:
+        raise NotImplementedError
+
+    def _add_file(self, name:str, data:bytes, mode:int)->None:
+        raise NotImplementedError
+
+
+class ZipBackend(_ArchiveBackend):
+    """
+    Streams projects into a zip archive.
+
+    The file object does not need to be seekable, so the archive can be
+    written directly into e.g. an HTTP response. Call `close` (or use the
+    backend as a context manager) to finish the archive.
+    """
+
+    def __init__(self, fileobj:BinaryIO, *, compression:int=zipfile.ZIP_DEFLATED):
+        super().__init__()
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=compression)
+
+    def _add_dir(self, name:str)->None:
+        info = zipfile.ZipInfo(name + "/", time.localtime()[:6])
+        info.external_attr = (0o40755 << 16) | 0x10
+        self._zip.writestr(info, b"")
+
+    def _add_file(self, name:str, data:bytes, mode:int)->None:
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.external_attr = (0o100000 | mode) << 16
+        info.compress_type = self._zip.compression
+        self._zip.writestr(info, data)
+
+    def close(self)->None:
+        self._zip.close()
+
+
+class TarBackend(_ArchiveBackend):
+    """
+    Streams projects into a tar archive.
+
+    Args:
+        fileobj (BinaryIO): Output stream, does not need to be seekable.
+        compression (str): "" for a plain tar, or "gz", "bz2", "xz".
+    """
+
+    def __init__(self, fileobj:BinaryIO, *, compression:str="gz"):
+        super().__init__()
+        self._tar = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")
+        self._mtime = int(time.time())
+
+    def _add_dir(self, name:str)->None:
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = self._mtime
+        self._tar.addfile(info)
+
+    def _add_file(self, name:str, data:bytes, mode:int)->None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = mode
+        info.mtime = self._mtime
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self)->None:
+        self._tar.close()
+
+
+def archive_backend(fileobj:BinaryIO, fmt:str)->OutputBackend:
+    """
+    Create an archive backend by format name.
+
+    Args:
+        fileobj (BinaryIO): Output stream.
+        fmt (str): One of "zip", "tar", "tar.gz", "tgz", "tar.bz2", "tar.xz".
+
+    Returns:
+        OutputBackend: A `ZipBackend` or `TarBackend`.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt == "zip":
+        return ZipBackend(fileobj)
+    compression = {"tar": "", "tar.gz": "gz", "tgz": "gz", "tar.bz2": "bz2", "tar.xz": "xz"}.get(fmt)
+    if compression is None:
+        raise ValueError(f"Unsupported archive format: {fmt}")
+    return TarBackend(fileobj, compression=compression)
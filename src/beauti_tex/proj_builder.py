@@ -3,30 +3,312 @@
 LaTeX project generation for beauti-tex.
 
 This module provides functionality to create a fully structured LaTeX
-project for academic papers. It builds the required directory layout,
-copies template files, and generates initial `.tex` sources based on
-a user-provided configuration.
+project for academic papers. It builds the directory layout described
+by `layout.ini` in the templates folder, renders the template files,
+and generates initial `.tex` sources based on a user-provided configuration.
+
+Included classes:
+- ProjectResult
+    Dataclass describing the outcome of one project in a batch run.
+- UpdateResult
+    Dataclass listing the files touched by `update_project`.
+
+Included functions:
+- make_project(proj_name, *, proj_path=None, cfg_path=None, meta=None, precompile=False, link_assets=False) -> None
+    Create a single LaTeX project.
+- make_projects(specs, *, workers=4, proj_path=None, cfg_path=None, link_assets=False) -> list[ProjectResult]
+    Create many projects in parallel, loading configs and templates once.
+- update_project(proj_name, *, proj_path=None, cfg_path=None, meta=None, precompile=None) -> UpdateResult
+    Re-render an existing project, rewriting only changed, unedited files.
+- load_manifest(path) -> list[dict]
+    Read a CSV or JSON manifest of project specs.
 
 Typical usage example:
 
-    from beauti_tex.projBuilder import make_project
+    from beauti_tex.proj_builder import make_project
 
     make_project(
-        projName="MyPaper",
-        projPath=Path("~/papers").expanduser(),
-        cfgPath=Path("config.ini"),
+        "MyPaper",
+        proj_path=Path("~/papers").expanduser(),
+        cfg_path=Path("config.ini"),
     )
 
 """
 
 from pathlib import Path
-from .config import get_config
-from .utils import safe_name
-import shutil
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+import contextvars
+import csv
+import hashlib
+import json
 import os
+import uuid
+from .config import FrozenConfig, get_config
+from .cache import load_asset, load_layout, load_template
+from .layout import LAYOUT_FILE, Layout, LayoutError
+from .output import DiskBackend, OutputBackend, ProjectPlan
+from .profiling import stage
+from .latex.bib import BIB_FILE, seed
+from .latex.preamble import render_preamble
+from .latex.precompile import SCRIPT_NAME, precompile_files
+from .latex.template import Template, escape_tex
+from .store import AssetStore
+from .styles import PACKAGE_TEMPLATES, Style, registry
+from .utils import safe_name
+
+# Config fields that may be overridden per project in a batch manifest
+_LIST_FIELDS = ("folders", "chapters")
+_OVERRIDABLE = {"folders", "chapters", "style", "size", "clas"}
+# Titlepage fields, keyed by their lower case placeholder name
+_META_KEYS = {"title", "author", "mnr", "stprog"}
+# Content hashes and generation options of a project, used by update_project
+STATE_FILE = ".beauti-tex.json"
+# Sub folder of the templates whose files are copied verbatim into every project
+ASSETS_DIR = "assets"
+# Templates every templates folder has to provide itself
+_REQUIRED_TEMPLATES = {"main.tex", "titlepage.tex"}
+
+
+@dataclass
+class ProjectResult:
+    """
+    Outcome of a single project in a `make_projects` batch.
+
+    Attributes:
+        name (str): Project name as given in the spec.
+        path (Path | None): Target folder of the project, if it could be resolved.
+        error (Exception | None): The exception raised while building, if any.
+    """
+    name: str
+    path: Path | None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the project was created successfully."""
+        return self.error is None
+
+
+@dataclass
+class UpdateResult:
+    """
+    Files handled by `update_project`, as project-relative paths.
+
+    Attributes:
+        written (list[str]): Files that were created or rewritten.
+        unchanged (list[str]): Files whose content was already up to date.
+        skipped (list[str]): Files edited by the user, left untouched.
+    """
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+
+def _digest(content:str|bytes)->str:
+    return hashlib.sha256(content if isinstance(content, bytes) else content.encode()).hexdigest()
+
+
+def _hashes(files:Mapping[str, str|bytes])->dict[str, str]:
+    return {name: _digest(content) for name, content in files.items()}
+
+
+def _state(hashes:Mapping[str, str], options:Mapping[str, object])->str:
+    """Return the state file recording content hashes and generation options."""
+    state = {
+        "version": 1,
+        "options": dict(options),
+        "files": dict(sorted(hashes.items())),
+    }
+    return json.dumps(state, indent=2) + "\n"
+
+
+def _options(cfg_path:Path|str|None, meta:Mapping[str, str], precompile:bool, overrides:Mapping[str, object]|None=None)->dict[str, object]:
+    return {
+        "config": str(Path(cfg_path).resolve()) if cfg_path else None,
+        "overrides": dict(overrides or {}),
+        "meta": dict(meta),
+        "precompile": precompile,
+    }
+
+
+def _resolve_path(proj_name:str, proj_path:Path|str|None)->Path:
+    if proj_path is None:
+        return Path.cwd()/proj_name
+    return Path(proj_path)/proj_name
+
+
+def _config(cfg_path:Path|str|None)->FrozenConfig:
+    """Load a configuration as `FrozenConfig`, the form used as key of the render caches."""
+    cfg = get_config(cfg_path)
+    return cfg if isinstance(cfg, FrozenConfig) else cfg.freeze()
+
+
+def _style(cfg:FrozenConfig)->Style:
+    """
+    Return the template set of a configuration.
+
+    A `templates` folder other than the packaged one wins over the style,
+    otherwise the style is looked up in the style registry.
+
+    Raises:
+        ValueError: If the style is unknown.
+    """
+    if cfg.temp_path.absolute() != PACKAGE_TEMPLATES.absolute():
+        return registry.folder(cfg.temp_path, cfg.style)
+    return registry.get(cfg.style)
+
+
+def _template_file(style:Style, name:str)->Path:
+    """Return `name` in the style folder, or the packaged one if it is optional and missing."""
+    if name in style.files or name in _REQUIRED_TEMPLATES:
+        return style.path/name
+    default = registry.folder(PACKAGE_TEMPLATES)
+    return (default if name in default.files else style).path/name
+
+
+def _load_templates(cfg:FrozenConfig)->dict[str, Template|bytes|Layout]:
+    """
+    Return the compiled layout and templates needed to build a project.
+
+    The layout is stored under `"layout.ini"`, every template it uses under
+    its name. Files below `templates/assets` are returned as raw bytes under
+    their path, e.g. `"assets/figures/logo.png"`. Folders are looked up in
+    the index of the style registry and never scanned again.
+    """
+    with stage("templates") as st:
+        style = _style(cfg)
+        layout = load_layout(_template_file(style, LAYOUT_FILE))
+        templates = {LAYOUT_FILE: layout}
+        for name in layout.templates:
+            templates[name] = load_template(_template_file(style, name))
+        for name in sorted(style.files):
+            if name.startswith(ASSETS_DIR + "/"):
+                templates[name] = load_asset(style.path/name)
+        st.fs_ops_estimate += len(templates)
+        return templates
+
+
+def _context(proj_name:str, cfg:FrozenConfig, meta:Mapping[str, str]|None)->dict[str, str]:
+    """
+    Build the placeholder values shared by all templates.
+
+    The title defaults to the project name, the other titlepage fields
+    default to empty strings. Titlepage fields are escaped for LaTeX.
+
+    Raises:
+        ValueError: If `meta` contains unknown keys.
+    """
+    meta = dict(meta or {})
+    unknown = set(meta) - _META_KEYS
+    if unknown:
+        raise ValueError(f"Unknown titlepage field(s): {', '.join(sorted(unknown))}")
+    meta.setdefault("title", proj_name)
+    context = {key.upper(): escape_tex(str(meta.get(key, ""))) for key in _META_KEYS}
+    context["SIZE"] = str(cfg.size)
+    context["CLAS"] = cfg.clas
+    context["CHAPTERS"] = "\n".join(f"\\input{{chapters/{c}}}" for c in cfg.chapters)
+    return context
+
+
+def _render_project(cfg:FrozenConfig, templates:Mapping[str, Template|bytes|Layout], context:Mapping[str, str], *, precompile:bool=False)->dict[str, str|bytes]:
+    """
+    Render the contents of every file of the layout.
+
+    Args:
+        cfg (FrozenConfig): Project configuration.
+        templates (Mapping[str, Template | bytes | Layout]): Layout, templates and assets as returned by `_load_templates`.
+        context (Mapping[str, str]): Placeholder values as returned by `_context`.
+        precompile (bool): Split the static preamble into `preamble.tex` and add
+            `latex-build.sh` to build with a precompiled format.
+
+    Returns:
+        dict[str, str | bytes]: Mapping of project-relative file paths to their content.
+
+    Raises:
+        TemplateError: If a template uses a placeholder without a value.
+        PreambleError: If the configured packages conflict.
+        LayoutError: If `precompile` is set but the layout has no `main.tex` or `pak.tex`.
+    """
+    with stage("render"):
+        return _render_files(cfg, templates, context, precompile)
+
+
+@lru_cache(maxsize=256)
+def _tree(cfg:FrozenConfig, layout:Layout)->tuple[tuple[str, str|None, str], ...]:
+    """
+    Expand the layout for a configuration, keyed by the config fingerprint.
+
+    Returns triples of file path, content and template name; the content is
+    None for templates, which depend on the project and are rendered later.
+    """
+    tree = []
+    for path, kind, arg in layout.files:
+        if kind in ("template", "static"):
+            tree.append((path, None, arg))
+        elif kind == "chapter":
+            for chapter in cfg.chapters:
+                tree.append((path.format(chapter=chapter), f"\\chapter{{{chapter.capitalize()}}}", ""))
+        elif kind == "preamble":
+            tree.append((path, render_preamble(cfg.packages), ""))
+        else:
+            tree.append((path, "", ""))
+    return tuple(tree)
+
+
+def _render_files(cfg:FrozenConfig, templates:Mapping[str, Template|bytes|Layout], context:Mapping[str, str], precompile:bool)->dict[str, str|bytes]:
+    files = {
+        path: templates[name].render(context) if content is None else content
+        for path, content, name in _tree(cfg, templates[LAYOUT_FILE])
+    }
+
+    #precompiled preamble
+    if precompile:
+        if "main.tex" not in files or "pak.tex" not in files:
+            raise LayoutError("precompile needs main.tex and pak.tex in the layout.")
+        files.update(precompile_files(files["main.tex"], files["pak.tex"]))
+
+    #static assets
+    for name, content in templates.items():
+        if name.startswith(ASSETS_DIR + "/"):
+            files[name[len(ASSETS_DIR) + 1:]]=content
+    return files
+
+
+def _static(templates:Mapping[str, Template|bytes|Layout])->set[str]:
+    """
+    Return the project files that are the same for every project and never edited by the user.
+
+    Besides the build script and template assets, these are only the files
+    the layout marks as `static:NAME`.
+
+    Raises:
+        LayoutError: If a `static` template has placeholders.
+    """
+    static = {SCRIPT_NAME}
+    static.update(name[len(ASSETS_DIR) + 1:] for name in templates if name.startswith(ASSETS_DIR + "/"))
+    for path, kind, arg in templates[LAYOUT_FILE].files:
+        if kind == "static":
+            if templates[arg].placeholders:
+                raise LayoutError(f"static template {arg} must not have placeholders, use template:{arg}.")
+            static.add(path)
+    return static
+
+
+def _plan(cfg:FrozenConfig, files:Mapping[str, str|bytes], templates:Mapping[str, Template|bytes|Layout])->ProjectPlan:
+    """Collect the configured folders, the layout folders and rendered files into one plan."""
+    return ProjectPlan.build([*cfg.folders, *templates[LAYOUT_FILE].dirs], files, _static(templates))
+
+
+def _store(link_assets:bool|AssetStore)->AssetStore|None:
+    if link_assets is True:
+        return AssetStore()
+    return link_assets or None
 
 
-def make_project(proj_name:str,*,proj_path:Path|str |None=None,cfg_path:Path|str|None=None)->None:
+def make_project(proj_name:str,*,proj_path:Path|str |None=None,cfg_path:Path|str|None=None,meta:Mapping[str, str]|None=None,precompile:bool=False,backend:OutputBackend|None=None,link_assets:bool|AssetStore=False,bib_master:Path|str|None=None,bib_keys:Iterable[str]|None=None)->None:
     """
     Creates a basic LaTeX Project for academic papers
 
@@ -38,55 +320,345 @@ def make_project(proj_name:str,*,proj_path:Path|str |None=None,cfg_path:Path|str
 
         cfg_path (Path |str| None): Optional path to a configuration INI file.
 
+        meta (Mapping[str, str] | None): Optional titlepage fields `title`, `author`,
+            `mnr` (matriculation number) and `stprog` (study program).
+            The title defaults to the project name.
+
+        precompile (bool): Also set up a precompiled preamble: `preamble.tex`,
+            a `main.tex` that uses the format if present and `latex-build.sh`.
+
+        backend (OutputBackend | None): Where to write the project, e.g. a `MemoryBackend`
+            or `ZipBackend`. Default is a `DiskBackend` in `proj_path`.
+
+        link_assets (bool | AssetStore): Materialize static files (template assets,
+            `latex-build.sh`, `static:` layout entries) from a content-addressed `AssetStore` as copy-on-write
+            reflinks where the file system supports them. True uses the
+            default store. Ignored if `backend` is given.
+
+        bib_master (Path | str | None): Shared `.bib` library to seed `literature.bib`
+            from. Only the entries for `bib_keys` are copied, looked up through the
+            library's index; without keys `beauti-tex bib trim` adds the cited
+            entries later. The seeded file counts as user content for `update_project`.
+
+        bib_keys (Iterable[str] | None): Citation keys to copy from `bib_master`.
+
     Raises:
 
         FileExistsError: If the project folder already exists.
 
+        PermissionError: If the base directory is not writable.
+
         FileNotFoundError: If template files are not found
 
+        TemplateError: If a template contains placeholders without a value.
+
+        ValueError: If a key of `bib_keys` is not in `bib_master`.
+
     Example:
 
         >>> make_project("MyPaper")
     """
+    proj_name, plan = _prepare_project(proj_name, cfg_path, meta, precompile, bib_master, bib_keys)
+    if backend is None:
+        backend=DiskBackend(proj_path, store=_store(link_assets))
+    backend.write(proj_name, plan)
+    print("Latex Project Created!")
+
+
+def _prepare_project(proj_name:str, cfg_path:Path|str|None, meta:Mapping[str, str]|None, precompile:bool, bib_master:Path|str|None=None, bib_keys:Iterable[str]|None=None)->tuple[str, ProjectPlan]:
+    """Load the config and templates and render the plan of one project."""
+    meta={"title": proj_name, **(meta or {})}
     proj_name=safe_name(proj_name)
 
-    cfg = get_config(cfg_path)
-    #folders
-    if proj_path is None:
-        proj_path=Path.cwd()/proj_name
-    elif isinstance(proj_path,str):
-        proj_path=Path(proj_path)/proj_name
-    else:
-        proj_path=proj_path/proj_name
-    if proj_path.exists():
-        raise FileExistsError(f"{proj_path} already exists!")
-    if not os.access(proj_path.parent, os.W_OK):
-        raise PermissionError(f"No write permission in {proj_path}!")
-    for folder in cfg.folders:
-        path = proj_path/folder
-        path.mkdir(parents=True)
-    #files
-    #main.tex
-    main=(cfg.temp_path/"main.tex").read_text()
-    main=main.replace("<<SIZE>>",f"{cfg.size}")
-    main=main.replace("<<CLAS>>",cfg.clas)
-    chapters = [f"\\input{{chapters/{c}}}" for c in cfg.chapters]
-    chapters="\n".join(chapters)
-    main=main.replace("<<CHAPTERS>>",chapters)
-    (proj_path/"main.tex").write_text(main)
-
-    #chapters
-    (proj_path/"chapters").mkdir(parents=True, exist_ok=True)
-    for file in cfg.chapters:
-        (proj_path /"chapters"/ f"{file}.tex").write_text(f"\\chapter{{{file.capitalize()}}}")
-
-    #other
-    texs = ["pak.tex", "literature.bib","chapters/appendix.tex"]
-    for tex in texs:
-        (proj_path / tex).touch()
-
-    (proj_path / "chapters" / "abstract.tex").write_text(r"\begin{abstract}"+"\n\n"+r"\end{abstract}")
-    shutil.copy(cfg.temp_path/"titlepage.tex",proj_path/"chapters"/"titlepage.tex")
-    print("Latex Project Created!")
+    cfg = _config(cfg_path)
+    templates = _load_templates(cfg)
+    files=_render_project(cfg, templates, _context(proj_name, cfg, meta), precompile=precompile)
+    files[STATE_FILE]=_state(_hashes(files), _options(cfg_path, meta, precompile))
+    #seeded after hashing, so update_project never replaces the entries
+    if bib_master is not None:
+        files[BIB_FILE]=seed(bib_master, bib_keys)
+    return proj_name, _plan(cfg, files, templates)
+
+
+def update_project(proj_name:str,*,proj_path:Path|str|None=None,cfg_path:Path|str|None=None,meta:Mapping[str, str]|None=None,precompile:bool|None=None)->UpdateResult:
+    """
+    Re-render an existing project after the configuration or templates changed.
+
+    Every generated file is compared with the content hashes recorded in
+    `.beauti-tex.json` when the project was created or last updated:
 
+    - files with up to date content are not touched, so their mtimes stay,
+    - files that still match the recorded hash are replaced,
+    - files the user edited since are skipped,
+    - missing files are created.
 
+    Files are replaced with a new file instead of being overwritten in
+    place, so files linked from an `AssetStore` are never modified.
+
+    Files that are no longer part of the project are never deleted.
+    Options that are not given (config file, titlepage fields, precompile,
+    batch overrides) are taken from the state file.
+
+    Args:
+        proj_name (str): Name of the project / main folder.
+        proj_path (Path | str | None): Optional base directory. Default is the current working directory.
+        cfg_path (Path | str | None): Optional path to a configuration INI file.
+        meta (Mapping[str, str] | None): Titlepage fields, merged over the recorded ones.
+        precompile (bool | None): Set up a precompiled preamble. Default is the recorded choice.
+
+    Returns:
+        UpdateResult: The written, unchanged and skipped files.
+
+    Raises:
+        FileNotFoundError: If the project folder does not exist.
+
+    Example:
+
+        >>> update_project("MyPaper").written
+        ['pak.tex']
+    """
+    proj_path=_resolve_path(safe_name(proj_name), proj_path)
+    if not proj_path.is_dir():
+        raise FileNotFoundError(f"{proj_path} not found!")
+    state_file = proj_path/STATE_FILE
+    state = json.loads(state_file.read_text()) if state_file.exists() else {}
+    recorded = state.get("files", {})
+    options = state.get("options", {})
+
+    if cfg_path is None:
+        cfg_path = options.get("config")
+    meta = {"title": proj_name, **options.get("meta", {}), **(meta or {})}
+    if precompile is None:
+        precompile = options.get("precompile", False)
+    overrides = options.get("overrides", {})
+
+    cfg = _apply_overrides(_config(cfg_path), overrides)
+    templates = _load_templates(cfg)
+    files = _render_project(cfg, templates, _context(proj_name, cfg, meta), precompile=precompile)
+
+    plan = _plan(cfg, files, templates)
+    result = UpdateResult()
+    hashes = {}
+    for folder in plan.dirs:
+        (proj_path/folder).mkdir(exist_ok=True)
+    for name, content in plan.files:
+        target = proj_path/name
+        new = _digest(content)
+        hashes[name] = new
+        if target.exists():
+            current = hashlib.sha256(target.read_bytes()).hexdigest()
+            if current == new:
+                result.unchanged.append(name)
+                continue
+            if current != recorded.get(name):
+                # edited by the user, keep the recorded hash so it stays "edited"
+                result.skipped.append(name)
+                hashes[name] = recorded.get(name)
+                continue
+        _replace(target, content, plan.mode(name))
+        result.written.append(name)
+
+    hashes = {name: h for name, h in hashes.items() if h is not None}
+    new_state = _state(hashes, _options(cfg_path, meta, precompile, overrides))
+    if not state_file.exists() or state_file.read_text(encoding="utf-8") != new_state:
+        _replace(state_file, new_state, 0o644)
+    return result
+
+
+def _replace(target:Path, content:str|bytes, mode:int)->None:
+    """Atomically replace `target` with a new file, breaking any hardlink."""
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        tmp.write_bytes(content if isinstance(content, bytes) else content.encode())
+        tmp.chmod(mode)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _apply_overrides(cfg:FrozenConfig, overrides:Mapping[str, object])->FrozenConfig:
+    """
+    Return a copy of `cfg` with per-project overrides applied.
+
+    List fields accept either a list or a comma separated string,
+    `size` accepts an int or a numeric string.
+
+    Raises:
+        ValueError: If an override key is not a known config field.
+    """
+    unknown = set(overrides) - _OVERRIDABLE
+    if unknown:
+        raise ValueError(f"Unknown override(s): {', '.join(sorted(unknown))}")
+    if not overrides:
+        return cfg
+    values = {}
+    for key, value in overrides.items():
+        if key in _LIST_FIELDS and isinstance(value, str):
+            value = [x.strip() for x in value.split(',')]
+        elif key == "size":
+            value = int(value)
+        values[key] = value
+    return replace(cfg, **values)
+
+
+def make_projects(specs:Iterable[Mapping[str, object]],*,workers:int=4,proj_path:Path|str|None=None,cfg_path:Path|str|None=None,precompile:bool=False,backend:OutputBackend|None=None,link_assets:bool|AssetStore=False)->list[ProjectResult]:
+    """
+    Create many LaTeX projects in parallel.
+
+    Every distinct configuration file and template folder is loaded only
+    once for the whole batch. Projects are written by a thread pool and a
+    failing project (e.g. because its folder already exists) does not abort
+    the remaining ones.
+
+    Args:
+        specs (Iterable[Mapping[str, object]]): One mapping per project with the keys
+            - name (str): Name of the project (required).
+            - path (str | Path): Optional base directory, defaults to `proj_path`.
+            - config (str | Path): Optional configuration INI file, defaults to `cfg_path`.
+            - folders, chapters, style, size, clas: Optional config overrides.
+            - title, author, mnr, stprog: Optional titlepage fields.
+        workers (int): Number of worker threads.
+        proj_path (Path | str | None): Default base directory for all projects.
+        cfg_path (Path | str | None): Default configuration INI file for all projects.
+        precompile (bool): Set up a precompiled preamble in every project.
+            Projects with the same preamble share one format name.
+        backend (OutputBackend | None): Where to write the projects. Spec paths are
+            then used as sub folders inside the backend. Default is the disk.
+        link_assets (bool | AssetStore): Link static files from an asset store,
+            see `make_project`. Ignored if `backend` is given.
+
+    Returns:
+        list[ProjectResult]: One result per spec, in the order of `specs`.
+
+    Example:
+
+        >>> results = make_projects([{"name": "A"}, {"name": "B", "size": 11}])
+        >>> [r.ok for r in results]
+        [True, True]
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    results, jobs = _prepare_batch(specs, proj_path, cfg_path, precompile, backend, link_assets)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # every job runs in a copy of this context, so profiling hooks see its stages
+        futures = [pool.submit(contextvars.copy_context().run, _build_job, job) if job else None for job in jobs]
+        for result, future in zip(results, futures):
+            if future is None:
+                continue
+            try:
+                future.result()
+            except Exception as e:
+                result.error = e
+    return results
+
+
+@dataclass
+class _Job:
+    """A prepared batch project, rendered by `_build_job`."""
+    backend: OutputBackend
+    name: str
+    cfg: FrozenConfig
+    templates: Mapping[str, Template|bytes|Layout]
+    context: Mapping[str, str]
+    options: Mapping[str, object]
+
+    def plan(self)->ProjectPlan:
+        files = _render_project(self.cfg, self.templates, self.context, precompile=self.options["precompile"])
+        files[STATE_FILE] = _state(_hashes(files), self.options)
+        return _plan(self.cfg, files, self.templates)
+
+
+def _build_job(job:_Job)->None:
+    job.backend.write(job.name, job.plan())
+
+
+def _prepare_batch(specs:Iterable[Mapping[str, object]], proj_path:Path|str|None, cfg_path:Path|str|None, precompile:bool, backend:OutputBackend|None, link_assets:bool|AssetStore=False)->tuple[list[ProjectResult], list[_Job|None]]:
+    """
+    Resolve targets, configs and templates of a batch.
+
+    Configs and templates are loaded once per distinct file. Specs that
+    cannot be prepared get a failed result and no job.
+
+    Returns:
+        tuple[list[ProjectResult], list[_Job | None]]: Results and jobs in the order of `specs`.
+    """
+    configs = {}
+    templates = {}
+    # one shared instance per distinct config, so large batches hold each config once
+    interned = {}
+    store = _store(link_assets)
+
+    def prepare(spec:Mapping[str, object]):
+        spec = dict(spec)
+        title = str(spec.pop("name", ""))
+        name = safe_name(title)
+        base = spec.pop("path", None)
+        if backend is None:
+            target = (DiskBackend(base or proj_path, store=store), name)
+            path = target[0].base/name
+        else:
+            target = (backend, f"{base}/{name}" if base else name)
+            path = Path(target[1])
+        cfg_file = spec.pop("config", None) or cfg_path
+        meta = {"title": title, **{key: spec.pop(key) for key in _META_KEYS & spec.keys()}}
+        if cfg_file not in configs:
+            configs[cfg_file] = _config(cfg_file)
+        cfg = _apply_overrides(configs[cfg_file], spec)
+        cfg = interned.setdefault(cfg, cfg)
+        if (cfg.temp_path, cfg.style) not in templates:
+            templates[cfg.temp_path, cfg.style] = _load_templates(cfg)
+        options = _options(cfg_file, meta, precompile, spec)
+        job = _Job(*target, cfg, templates[cfg.temp_path, cfg.style], _context(name, cfg, meta), options)
+        return path, job
+
+    results = []
+    jobs = []
+    for spec in specs:
+        result = ProjectResult(name=str(spec.get("name", "")), path=None)
+        try:
+            result.path, job = prepare(spec)
+        except Exception as e:
+            result.error = e
+            job = None
+        results.append(result)
+        jobs.append(job)
+    return results, jobs
+
+
+def load_manifest(path:Path|str)->list[dict[str, object]]:
+    """
+    Read a batch manifest of project specs.
+
+    JSON manifests contain a list of objects (or an object with a
+    `projects` list). CSV manifests need a `name` column; empty cells
+    are ignored so that the batch defaults apply.
+
+    Args:
+        path (Path | str): Path to a `.json` or `.csv` manifest.
+
+    Returns:
+        list[dict[str, object]]: Specs suitable for `make_projects`.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist.
+        ValueError: If the format is not supported or a spec has no name.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found!")
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        data = json.loads(path.read_text())
+        if isinstance(data, dict):
+            data = data.get("projects", [])
+        specs = [dict(spec) for spec in data]
+    elif suffix == ".csv":
+        with path.open(newline="") as f:
+            specs = [{k: v for k, v in row.items() if k and v not in (None, "")} for row in csv.DictReader(f)]
+    else:
+        raise ValueError(f"Unsupported manifest format: {path.suffix}")
+    for spec in specs:
+        if not spec.get("name"):
+            raise ValueError(f"Every project in {path} needs a name.")
+    return specs
@@ -0,0 +1,129 @@
+"""
+Content-addressed store for static project files.
+
+Static files (template assets, build scripts) are identical in many
+generated projects. Instead of writing a physical copy into every
+project, the content is stored once under its SHA-256 hash and
+materialized in the project as
+
+1. a copy-on-write reflink, if the file system supports it (Btrfs, XFS, ...),
+2. a plain copy otherwise.
+
+Both are private files: editing a project file never changes the store
+or other projects. Hardlinks are deliberately not used, since writing
+to one would rewrite the shared store file.
+
+Included classes:
+- AssetStore
+    The store, by default in `~/.cache/beauti-tex/store`.
+"""
+
+from pathlib import Path
+import errno
+import hashlib
+import os
+import uuid
+
+#: Materialization modes in the order tried by "auto".
+MODES = ("reflink", "copy")
+
+# ioctl request to clone a file on Linux (FICLONE)
+_FICLONE = 0x40049409
+
+
+def _default_root()->Path:
+    if "BEAUTITEX_STORE" in os.environ:
+        return Path(os.environ["BEAUTITEX_STORE"])
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home()/".cache"
+    return Path(cache)/"beauti-tex"/"store"
+
+
+def _reflink(src:Path, dst:Path)->None:
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.ENOTSUP, "reflinks are not supported on this platform") from None
+    with open(src, "rb") as s, open(dst, "xb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dst.unlink()
+            raise
+
+
+class AssetStore:
+    """
+    Content-addressed file store.
+
+    Attributes:
+        root (Path): Folder of the store. Defaults to `$BEAUTITEX_STORE` or
+                     `$XDG_CACHE_HOME/beauti-tex/store`.
+        mode (str): "auto" to try a reflink and fall back to a copy,
+                    or one of them to force it.
+    """
+
+    def __init__(self, root:Path|str|None=None, *, mode:str="auto"):
+        if mode != "auto" and mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, use auto, {', '.join(MODES)}.")
+        self.root = Path(root) if root is not None else _default_root()
+        self.mode = mode
+
+    def path(self, digest:str, *, executable:bool=False)->Path:
+        """Return the store path for a SHA-256 hex digest."""
+        return self.root/digest[:2]/(digest + (".x" if executable else ""))
+
+    def put(self, data:bytes, *, executable:bool=False)->Path:
+        """
+        Add content to the store.
+
+        Args:
+            data (bytes): File content.
+            executable (bool): Store the content as an executable file.
+
+        Returns:
+            Path: The read-only store file holding `data`.
+        """
+        path = self.path(hashlib.sha256(data).hexdigest(), executable=executable)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+            tmp.write_bytes(data)
+            tmp.chmod(0o555 if executable else 0o444)
+            os.replace(tmp, path)
+        return path
+
+    def materialize(self, data:bytes, dest:Path|str, *, executable:bool=False)->str:
+        """
+        Create `dest` with the content `data`, sharing storage where possible.
+
+        Args:
+            data (bytes): File content.
+            dest (Path | str): File to create; it must not exist.
+            executable (bool): Make the file executable.
+
+        Returns:
+            str: The mode that was used: "reflink" or "copy".
+
+        Raises:
+            FileExistsError: If `dest` already exists.
+        """
+        dest = Path(dest)
+        src = self.put(data, executable=executable)
+        modes = MODES if self.mode == "auto" else (self.mode,)
+        for mode in modes:
+            try:
+                if mode == "reflink":
+                    _reflink(src, dest)
+                else:
+                    with open(dest, "xb") as f:
+                        f.write(data)
+                dest.chmod(0o755 if executable else 0o644)
+                return mode
+            except FileExistsError:
+                raise
+            except OSError:
+                if mode == modes[-1]:
+                    raise
+        raise AssertionError("unreachable")
+
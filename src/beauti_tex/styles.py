@@ -0,0 +1,142 @@
+"""
+Named template sets (styles) for beauti-tex.
+
+The `style` of a configuration selects the template folder a project is
+built from. Styles are discovered once per process from
+
+1. the packaged templates (style "IMRaD"),
+2. the user folder `$XDG_CONFIG_HOME/beauti-tex/styles` (`~/.config/...`),
+3. the folders listed in `$BEAUTITEX_STYLE_PATH` (separated by `os.pathsep`),
+
+where every sub folder containing a `main.tex` is a style named after the
+folder. Later sources win. The file listing of every style is indexed on
+first use, so later lookups never scan the folders again; the templates
+themselves are read lazily through `beauti_tex.cache`.
+
+Included classes:
+- Style
+    Name, folder and file index of one template set.
+- StyleRegistry
+    Discovers and indexes styles.
+
+Module attributes:
+- registry
+    The process-wide `StyleRegistry`.
+
+Examples:
+>>> from beauti_tex.styles import registry
+>>> sorted(registry.styles())
+['IMRaD', 'thesis']
+"""
+
+from pathlib import Path
+from collections.abc import Sequence
+from dataclasses import dataclass
+import os
+import threading
+
+#: Templates shipped with the package, registered as this style.
+DEFAULT_STYLE = "IMRaD"
+PACKAGE_TEMPLATES = Path(__file__).parent/"templates"
+
+
+@dataclass(frozen=True)
+class Style:
+    """
+    One indexed template set.
+
+    Attributes:
+        name (str): Name of the style.
+        path (Path): Template folder of the style.
+        files (frozenset[str]): All files in the folder, as relative paths with '/'.
+    """
+    name: str
+    path: Path
+    files: frozenset[str]
+
+    @classmethod
+    def scan(cls, name:str, path:Path)->"Style":
+        """Index the files below `path`."""
+        files = set()
+        for root, _, names in os.walk(path):
+            rel = Path(root).relative_to(path)
+            files.update((rel/n).as_posix() for n in names)
+        return cls(name, path, frozenset(files))
+
+
+def _default_roots()->list[Path]:
+    config = os.environ.get("XDG_CONFIG_HOME") or Path.home()/".config"
+    roots = [Path(config)/"beauti-tex"/"styles"]
+    roots += [Path(p) for p in os.environ.get("BEAUTITEX_STYLE_PATH", "").split(os.pathsep) if p]
+    return roots
+
+
+class StyleRegistry:
+    """
+    Thread-safe registry of styles, discovered on first use.
+
+    Attributes:
+        roots (Sequence[Path] | None): Folders whose sub folders are styles, lowest
+            priority first. Defaults to the user folder and `$BEAUTITEX_STYLE_PATH`.
+    """
+
+    def __init__(self, roots:Sequence[Path|str]|None=None):
+        self.roots = roots
+        self._styles: dict[str, Style]|None = None
+        self._folders: dict[Path, Style] = {}
+        self._lock = threading.Lock()
+
+    def _discover(self)->dict[str, Style]:
+        folders = {DEFAULT_STYLE: PACKAGE_TEMPLATES}
+        roots = _default_roots() if self.roots is None else [Path(r) for r in self.roots]
+        for root in roots:
+            if not root.is_dir():
+                continue
+            for entry in sorted(root.iterdir()):
+                if (entry/"main.tex").is_file():
+                    folders[entry.name] = entry
+        return {name: self._index(name, path) for name, path in folders.items()}
+
+    def _index(self, name:str, path:Path)->Style:
+        path = path.absolute()
+        style = self._folders.get(path)
+        if style is None:
+            style = self._folders[path] = Style.scan(name, path)
+        return style
+
+    def styles(self)->dict[str, Style]:
+        """Return all styles by name, discovering them on the first call."""
+        with self._lock:
+            if self._styles is None:
+                self._styles = self._discover()
+            return dict(self._styles)
+
+    def get(self, name:str)->Style:
+        """
+        Return the style called `name` (case-insensitive).
+
+        Raises:
+            ValueError: If no such style exists.
+        """
+        styles = self.styles()
+        if name in styles:
+            return styles[name]
+        for key, style in styles.items():
+            if key.casefold() == name.casefold():
+                return style
+        raise ValueError(f"Unknown style {name!r}, available: {', '.join(sorted(styles))}.")
+
+    def folder(self, path:Path|str, name:str="")->Style:
+        """Return the indexed style for a template folder outside the registry, e.g. from `templates=`."""
+        with self._lock:
+            return self._index(name, Path(path))
+
+    def refresh(self)->None:
+        """Forget all styles and indexes, so the folders are scanned again on next use."""
+        with self._lock:
+            self._styles = None
+            self._folders.clear()
+
+
+#: Process-wide style registry.
+registry = StyleRegistry()
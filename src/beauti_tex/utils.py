@@ -1,4 +1,4 @@
-"""
+r"""
 This module contains general utility functions that can be reused
 across different parts of the project.
 
@@ -6,26 +6,46 @@ Included functions:
 - safe_name(name: str) -> str
     Converts a given name into a safe format suitable for filenames,
     variable names, etc.
+- safe_names(names: Iterable[str], *, case_sensitive: bool = False) -> list[str]
+    Sanitizes many names at once and makes them unique.
 
 
 Examples:
 >>> from utils import safe_name
 >>> safe_name("my file")
 'my_file'
+>>> safe_names(["Anna Meier", "anna meier", "CON"])
+['Anna_Meier', 'anna_meier_2', 'CON_']
 
 Notes:
 - All functions are independent and can be used individually.
 - Importing this module does not produce any side effects.
 """
 
+from collections.abc import Iterable
+import unicodedata
+
+# invalid characters, spaces and control characters, all mapped to "_"
+_INVALID = str.maketrans({c: "_" for c in '<>:"/\\|?* ' + "".join(map(chr, range(32)))})
+
+# device names Windows refuses as file or folder names, with any extension
+_RESERVED = frozenset(
+    ["CON", "PRN", "AUX", "NUL"]
+    + [f"COM{i}" for i in range(1, 10)]
+    + [f"LPT{i}" for i in range(1, 10)]
+)
+
+
 def safe_name(name:str)->str:
-    """
+    r"""
     Secure a valid folder name.
 
     Rules:
-    - No spaces (converted to underscores)
+    - Unicode is normalized to NFC, so equal looking names are equal
+    - No spaces or control characters (converted to underscores)
     - Cannot contain any of: <>:"/\|?*
-    - Cannot end with a dot
+    - Cannot start with a dot or end with a dot
+    - Cannot be a reserved Windows name like CON or LPT1 (an underscore is appended)
     - Cannot be empty
 
     Args:
@@ -34,20 +54,46 @@ def safe_name(name:str)->str:
     Returns:
         str: validated name.
     """
-
-    if name == "":
-        name="empty"
-    # remove invalid characters
-    err=r'[<>:"/\\|?*]'
-    for e in err:
-        name=name.replace(e,'_')
-    #remove spaces
-    name=name.replace(' ','_')
-
-    #remove dots in beginning and end
-    if name[0]=='.':
-        name=name[1:]
-    if name[-1]=='.':
-        name=name[:-1]+'_'
+    name = unicodedata.normalize("NFC", name).translate(_INVALID).lstrip(".")
+    if not name:
+        return "empty"
+    if name[-1] == ".":
+        name = name[:-1] + "_"
+    stem, dot, rest = name.partition(".")
+    if stem.upper() in _RESERVED:
+        name = f"{stem}_{dot}{rest}"
     return name
 
+
+def safe_names(names:Iterable[str], *, case_sensitive:bool=False)->list[str]:
+    """
+    Secure many folder names and make them unique.
+
+    Every name is sanitized like `safe_name`. Names that collide after
+    sanitizing get a suffix `_2`, `_3`, ... in the order they appear.
+    By default names differing only in case collide as well, since they
+    would share a folder on Windows and macOS.
+
+    Args:
+        names (Iterable[str]): Names to check, e.g. student names of a course.
+        case_sensitive (bool): Only treat names with equal case as collisions.
+
+    Returns:
+        list[str]: Unique validated names, in the order of `names`.
+    """
+    key = str if case_sensitive else str.casefold
+    seen = set()
+    suffixes = {}
+    result = []
+    for name in names:
+        name = safe_name(name)
+        base = key(name)
+        if base in seen:
+            i = suffixes.get(base, 2)
+            while key(f"{name}_{i}") in seen:
+                i += 1
+            suffixes[base] = i + 1
+            name = f"{name}_{i}"
+        seen.add(key(name))
+        result.append(name)
+    return result
@@ -0,0 +1,57 @@
+"""
+test_aio.py
+
+Tests for the beauti_tex.aio module.
+"""
+
+import asyncio
+from pathlib import Path
+from beauti_tex.aio import async_make_project, async_make_projects
+from beauti_tex.output import MemoryBackend
+from beauti_tex.proj_builder import make_project
+
+
+def _tree(root:Path)->dict[str, bytes | None]:
+    return {
+        str(p.relative_to(root)): p.read_bytes() if p.is_file() else None
+        for p in sorted(root.rglob("*"))
+    }
+
+
+def test_async_make_project_matches_sync(tmp_path):
+    """
+    Test that the async API writes exactly the same project as make_project.
+    """
+    (tmp_path / "sync").mkdir()
+    (tmp_path / "async").mkdir()
+    make_project("Paper", proj_path=tmp_path / "sync", meta={"author": "A"}, precompile=True)
+    asyncio.run(async_make_project(
+        "Paper", proj_path=tmp_path / "async", meta={"author": "A"}, precompile=True, limit=2,
+    ))
+    assert _tree(tmp_path / "async" / "Paper") == _tree(tmp_path / "sync" / "Paper")
+    assert ((tmp_path / "async" / "Paper" / "latex-build.sh").stat().st_mode
+            == (tmp_path / "sync" / "Paper" / "latex-build.sh").stat().st_mode)
+
+
+def test_async_make_projects(tmp_path):
+    """
+    Test bounded concurrent batch generation with a failing project.
+    """
+    (tmp_path / "B").mkdir()
+
+    async def main():
+        sem = asyncio.Semaphore(3)
+        return await async_make_projects(
+            [{"name": f"P{i}"} for i in range(10)] + [{"name": "B"}],
+            proj_path=tmp_path, limit=sem,
+        )
+    results = asyncio.run(main())
+
+    assert [r.ok for r in results] == [True] * 10 + [False]
+    assert isinstance(results[-1].error, FileExistsError)
+    assert all((tmp_path / f"P{i}" / "main.tex").exists() for i in range(10))
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+    backend = MemoryBackend()
+    asyncio.run(async_make_projects([{"name": "M"}], backend=backend))
+    assert "M/main.tex" in backend.files
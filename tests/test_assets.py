@@ -0,0 +1,190 @@
+"""
+test_assets.py
+
+Tests for the beauti_tex.assets module and the `assets` CLI command.
+"""
+
+import struct
+import sys
+import zlib
+import pytest
+from beauti_tex import cli
+from beauti_tex.assets import _decode, downsample_png, find_figures, process_figures
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+
+def _png(rows, channels):
+    """
+    Encodes 8 bit rows, cycling through all five filter types.
+    """
+    color = {1: 0, 3: 2, 4: 6}[channels]
+    raw = b""
+    prev = bytes(len(rows[0]))
+    for y, row in enumerate(rows):
+        kind = y % 5
+        out = bytearray()
+        for i, x in enumerate(row):
+            a = row[i - channels] if i >= channels else 0
+            c = prev[i - channels] if i >= channels else 0
+            predictor = [0, a, prev[i], (a + prev[i]) // 2, _paeth(a, prev[i], c)][kind]
+            out.append((x - predictor) & 0xFF)
+        raw += bytes([kind]) + out
+        prev = row
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    width = len(rows[0]) // channels
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, len(rows), 8, color, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _image(width, height):
+    # left half red, right half a gradient of blue, so every 5x5 block is uniform per row
+    return [bytes(b for x in range(width) for b in ((200, 0, 0) if x < width // 2 else (0, 0, 5 * y))) for y in range(height)]
+
+
+def test_decode_all_filters():
+    """
+    Test that rows written with every filter type decode to the original pixels.
+    """
+    rows = _image(12, 10)
+    assert _decode(_png(rows, 3)) == (12, 10, 3, [bytearray(r) for r in rows])
+
+
+def test_downsample_png():
+    """
+    Test box-filter downsampling to the target width and that small images are unchanged.
+    """
+    data = _png(_image(100, 10), 3)
+    # at most 2in x 10dpi = 20 pixels wide -> factor 5
+    width, height, channels, rows = _decode(downsample_png(data, dpi=10, width=2))
+    assert (width, height, channels) == (20, 2, 3)
+    assert rows[0][:3] == bytearray([200, 0, 0])
+    assert rows[1][-3:] == bytearray([0, 0, 35])  # average of 5*5..5*9
+    assert downsample_png(data, dpi=300, width=1) is data
+
+
+def _project(tmp_path):
+    project = tmp_path / "P"
+    (project / "figures").mkdir(parents=True)
+    (project / "main.tex").write_text(
+        "\\graphicspath{{build/figures/}{figures/}}\n"
+        "\\includegraphics{plot}\\includegraphics{photo.jpg}\\includegraphics{drawing}\\includegraphics{logo.png}\n"
+    )
+    (project / "figures" / "plot.png").write_bytes(_png(_image(100, 10), 3))
+    (project / "figures" / "photo.jpg").write_bytes(b"jpeg")
+    (project / "figures" / "drawing.svg").write_text("<svg/>")
+    return project
+
+
+@pytest.fixture
+def rsvg(tmp_path, monkeypatch):
+    """
+    Puts a fake rsvg-convert on the PATH that writes a PDF stub.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "rsvg-convert"
+    script.write_text(f"#!{sys.executable}\nimport sys\nopen(sys.argv[sys.argv.index('-o') + 1], 'wb').write(b'%PDF')\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+
+def test_find_figures(tmp_path):
+    """
+    Test that figures are resolved through the graphics path, without the output folder.
+    """
+    project = _project(tmp_path)
+    found, missing = find_figures(project)
+    assert found == {
+        "plot.png": project / "figures" / "plot.png",
+        "photo.jpg": project / "figures" / "photo.jpg",
+        "drawing.svg": project / "figures" / "drawing.svg",
+    }
+    assert missing == ["logo.png"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_figures(tmp_path, rsvg, workers):
+    """
+    Test conversion, the cache keyed by source and DPI, and removal of outputs that are no longer used.
+    """
+    project = _project(tmp_path)
+    cache = tmp_path / "cache"
+    results = process_figures(project, dpi=10, width=2, workers=workers, cache_dir=cache)
+    assert [(r.source, r.status, r.output) for r in results] == [
+        ("plot.png", "converted", "build/figures/plot.png"),
+        ("photo.jpg", "original", None),
+        ("drawing.svg", "converted", "build/figures/drawing.pdf"),
+    ]
+    assert _decode((project / "build" / "figures" / "plot.png").read_bytes())[:2] == (20, 2)
+    assert (project / "build" / "figures" / "drawing.pdf").read_bytes() == b"%PDF"
+
+    other = project / "build" / "figures" / "notes.txt"
+    other.write_bytes(b"not ours")
+    again = process_figures(project, dpi=10, width=2, workers=workers, cache_dir=cache)
+    assert [r.status for r in again] == ["cached", "original", "cached"]
+    assert process_figures(project, dpi=20, width=2, workers=workers, cache_dir=cache)[0].status == "converted"
+
+    main = project / "main.tex"
+    main.write_text(main.read_text().replace("\\includegraphics{plot}", ""))
+    process_figures(project, dpi=10, width=2, workers=workers, cache_dir=cache)
+    assert not (project / "build" / "figures" / "plot.png").exists()
+    assert (project / "build" / "figures" / "drawing.pdf").exists()
+    assert other.read_bytes() == b"not ours"
+    assert not list((project / "build" / "figures").glob("*.tmp"))
+
+
+def test_svg_without_converter(tmp_path, monkeypatch):
+    """
+    Test that SVG figures fail with a clear message if no converter is installed.
+    """
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    project = _project(tmp_path)
+    result = process_figures(project, workers=1, cache_dir=tmp_path / "cache")[2]
+    assert result.status == "failed" and "rsvg-convert" in result.message
+
+
+def test_assets_cli(tmp_path, rsvg, monkeypatch, capsys):
+    """
+    Test the `assets` command output and missing figure report.
+    """
+    project = _project(tmp_path)
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "assets", str(project), "--dpi", "10", "--width", "2", "-w", "1", "--cache", str(tmp_path / "c"),
+    ])
+    cli.main()
+    out, err = capsys.readouterr()
+    assert "converted" in out and "plot.png -> build/figures/plot.png" in out
+    assert "logo.png" in err
+
+
+def test_path_qualified_include_uses_original(tmp_path, rsvg):
+    """
+    Test that PNG figures LaTeX finds relative to the project folder are not processed,
+    since LaTeX would load the original before searching the graphics path.
+    """
+    project = _project(tmp_path)
+    (project / "shot.png").write_bytes(_png(_image(100, 10), 3))
+    (project / "main.tex").write_text(
+        "\\graphicspath{{build/figures/}{figures/}}\n"
+        "\\includegraphics{figures/plot.png}\\includegraphics{shot}\\includegraphics{figures/drawing}\n"
+    )
+    results = process_figures(project, dpi=10, width=2, workers=1, cache_dir=tmp_path / "cache")
+    assert [(r.source, r.status, r.output) for r in results] == [
+        ("figures/plot.png", "original", None),
+        ("shot.png", "original", None),
+        ("figures/drawing.svg", "converted", "build/figures/figures/drawing.pdf"),
+    ]
+    assert "graphicspath" in results[0].message
+    assert not (project / "build" / "figures" / "figures" / "plot.png").exists()
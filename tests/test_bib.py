@@ -0,0 +1,150 @@
+"""
+test_bib.py
+
+Tests for the beauti_tex.latex.bib module, the `bib` CLI command and
+seeding `literature.bib` in `make_project`.
+"""
+
+import sys
+import pytest
+from beauti_tex import cli
+from beauti_tex.config import Config
+from beauti_tex.latex.bib import BibIndex, cited_keys, dedupe, index_file, iter_entries, seed, trim
+from beauti_tex.proj_builder import make_project, update_project
+
+LIBRARY = """% exported library
+@string{tug = {TeX Users Group}}
+
+@book{knuth1984,
+  title = {The {\\TeX}book},
+  publisher = tug,
+}
+
+@comment{ignored {block}}
+@Article ( lamport1986 ,
+  title = "LaTeX (a document preparation system)",
+  doi = {10.1000/XYZ},
+)
+@article{Knuth1984, title = {Duplicate key}}
+@misc{copy, doi = {https://doi.org/10.1000/xyz}}
+@misc{other, note = {Ünïcode}}
+"""
+
+
+@pytest.fixture
+def library(tmp_path):
+    """
+    Writes a small library with macros, comments, duplicates and paren-delimited entries.
+    """
+    path = tmp_path / "master.bib"
+    path.write_text(LIBRARY, encoding="utf-8")
+    return path
+
+
+def test_iter_entries(library):
+    """
+    Test that entry types, keys and byte ranges are found.
+    """
+    entries = list(iter_entries(library))
+    assert [(e.type, e.key) for e in entries] == [
+        ("string", "tug"), ("book", "knuth1984"), ("article", "lamport1986"),
+        ("article", "Knuth1984"), ("misc", "copy"), ("misc", "other"),
+    ]
+    data = library.read_bytes()
+    last = entries[-1]
+    assert data[last.offset:last.offset + last.length] == "@misc{other, note = {Ünïcode}}".encode()
+
+
+def test_index_is_persisted_and_refreshed(library):
+    """
+    Test lookups through the index file and rebuilding after the library changed.
+    """
+    index = BibIndex.open(library)
+    assert index_file(library).is_file()
+    assert len(index) == 5 and "lamport1986" in index
+    assert index.get("other") == "@misc{other, note = {Ünïcode}}"
+    assert index.get("missing") is None
+
+    # a stale index file must not be used
+    library.write_text("@misc{new, title={x}}\n" + LIBRARY, encoding="utf-8")
+    index = BibIndex.open(library)
+    assert index.keys()[0] == "new"
+    assert index.get("other") == "@misc{other, note = {Ünïcode}}"
+
+
+def test_dedupe(library, tmp_path):
+    """
+    Test that duplicate keys (any case) and DOIs are removed, the first entry is kept.
+    """
+    out = tmp_path / "clean.bib"
+    assert dedupe(library, out) == 2
+    assert [e.key for e in iter_entries(out)] == ["tug", "knuth1984", "lamport1986", "other"]
+
+
+def _project(base, text):
+    project = base / "P"
+    project.mkdir()
+    (project / "main.tex").write_text("\\begin{document}\n\\input{body}\n\\end{document}\n")
+    (project / "body.tex").write_text(text)
+    return project
+
+
+def test_cited_keys(tmp_path):
+    """
+    Test the \\cite variants, optional arguments, key lists and comments.
+    """
+    project = _project(tmp_path, "\\cite{a, b}\\textcite[p.~3]{c}\\parencite[see][]{d}\n% \\cite{e}\n\\nocite{*}")
+    assert cited_keys(project) == {"a", "b", "c", "d", "*"}
+
+
+def test_trim(tmp_path, library):
+    """
+    Test that uncited entries are removed and missing cited ones are added from the master.
+    """
+    project = _project(tmp_path, "\\cite{lamport1986,knuth1984,unknown}")
+    (project / "literature.bib").write_text("@misc{lamport1986, note={own copy}}\n@misc{unused, x={y}}\n")
+    kept, missing = trim(project, master=library)
+    assert kept == ["knuth1984", "lamport1986"]
+    assert missing == ["unknown"]
+    text = (project / "literature.bib").read_text(encoding="utf-8")
+    assert "own copy" in text and "unused" not in text
+    assert "@string{tug" in text
+
+
+def test_seed_and_make_project(tmp_path, library, monkeypatch):
+    """
+    Test seeding a new project from a master library and that updates keep the entries.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "main.tex").write_text("<<CLAS>>\n<<CHAPTERS>>")
+    (template / "titlepage.tex").write_text("<<TITLE>>")
+    cfg = Config([], ["intro"], "IMRaD", template, 12, "report", {})
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+
+    with pytest.raises(ValueError, match="nope"):
+        seed(library, ["nope"])
+    make_project("A", proj_path=tmp_path, bib_master=library, bib_keys=["knuth1984"])
+    bib = (tmp_path / "A" / "literature.bib").read_text(encoding="utf-8")
+    assert [e.key for e in iter_entries(tmp_path / "A" / "literature.bib")] == ["tug", "knuth1984"]
+    assert bib.startswith(f"% beauti-tex master: {library}")
+    assert "literature.bib" in update_project("A", proj_path=tmp_path).skipped
+
+    # without keys, trim finds the master through the comment
+    make_project("B", proj_path=tmp_path, bib_master=library)
+    (tmp_path / "B" / "chapters" / "intro.tex").write_text("\\cite{other}")
+    (tmp_path / "B" / "main.tex").write_text("\\input{chapters/intro}")
+    assert trim(tmp_path / "B") == (["other"], [])
+
+
+def test_bib_cli(library, monkeypatch, capsys):
+    """
+    Test the `bib index` and `bib get` actions.
+    """
+    monkeypatch.setattr(sys, "argv", ["prog", "bib", "index", str(library)])
+    cli.main()
+    assert "5 entries indexed" in capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv", ["prog", "bib", "get", str(library), "knuth1984", "missing"])
+    with pytest.raises(SystemExit, match="missing"):
+        cli.main()
+    assert capsys.readouterr().out.startswith("@book{knuth1984,")
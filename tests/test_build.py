@@ -0,0 +1,143 @@
+"""
+test_build.py
+
+Tests for the beauti_tex.build module and the `build` CLI command,
+using a stub compiler instead of a TeX installation.
+"""
+
+import json
+import sys
+import pytest
+from beauti_tex import cli
+from beauti_tex.build import build_projects, find_projects, source_hash, summarize_log
+
+STUB = r'''
+import sys, time
+from pathlib import Path
+main = Path(sys.argv[-1])
+src = main.read_text()
+with open(".calls.txt", "a") as f:
+    f.write("x")
+if "EDIT" in src:
+    # the user saves a chapter while LaTeX runs
+    Path("chapters/intro.tex").write_text("saved during the build")
+if "SLEEP" in src:
+    time.sleep(30)
+if "FAIL" in src:
+    main.with_suffix(".log").write_text("! Undefined control sequence.\nl.3 \\foo\n")
+    sys.exit(1)
+main.with_suffix(".log").write_text(
+    "LaTeX Warning: Reference `x' undefined.\nOverfull \\hbox (1.0pt too wide)\n"
+)
+main.with_suffix(".pdf").write_bytes(b"%PDF")
+'''
+
+
+@pytest.fixture
+def stub(tmp_path):
+    """
+    Writes the stub compiler and returns its command.
+    """
+    path = tmp_path / "stub.py"
+    path.write_text(STUB)
+    return [sys.executable, str(path)]
+
+
+def _project(base, name, body="ok"):
+    project = base / name
+    (project / "chapters").mkdir(parents=True)
+    (project / "main.tex").write_text(body)
+    (project / "chapters" / "intro.tex").write_text("intro")
+    return project
+
+
+def test_find_projects(tmp_path):
+    """
+    Test that folders are expanded into the projects they contain.
+    """
+    a = _project(tmp_path / "all", "A")
+    b = _project(tmp_path / "all", "B")
+    (tmp_path / "all" / "notes").mkdir()
+    assert find_projects([tmp_path / "all", a]) == [a, b]
+
+
+def test_source_hash_ignores_outputs(tmp_path):
+    """
+    Test that build outputs do not change the source hash, but sources do.
+    """
+    project = _project(tmp_path, "P")
+    digest = source_hash(project)
+    (project / "_minted-main").mkdir()
+    for name in ("main.pdf", "main.log", "chapters/intro.aux", ".beauti-tex-build.json", "_minted-main/x.pygtex"):
+        (project / name).write_text("output")
+    assert source_hash(project) == digest
+    (project / "chapters" / "intro.tex").write_text("changed")
+    assert source_hash(project) != digest
+
+
+def test_summarize_log():
+    """
+    Test that errors with line numbers, warnings and bad boxes are counted.
+    """
+    log = (
+        "Package hyperref Warning: Token not allowed.\n"
+        "! Missing $ inserted.\n<inserted text>\nl.42 a_b\n"
+        "Underfull \\hbox (badness 10000)\nLaTeX Font Warning: Size substitutions.\n"
+    )
+    summary = summarize_log(log)
+    assert summary.errors == ["Missing $ inserted. (l.42)"]
+    assert (summary.warnings, summary.badboxes) == (2, 1)
+
+
+def test_build_projects(tmp_path, stub):
+    """
+    Test parallel builds, failures, timeouts and skipping of unchanged projects.
+    """
+    ok = _project(tmp_path, "Ok")
+    bad = _project(tmp_path, "Bad", "FAIL")
+    slow = _project(tmp_path, "Slow", "SLEEP")
+    seen = []
+    results = build_projects([ok, bad, slow], workers=3, command=stub, timeout=1.0, on_result=seen.append)
+
+    assert [r.status for r in results] == ["built", "failed", "timeout"]
+    assert len(seen) == 3
+    assert results[0].summary.warnings == 1 and results[0].summary.badboxes == 1
+    assert results[1].summary.errors == ["Undefined control sequence. (l.3)"]
+    assert results[2].returncode is None and results[2].duration < 10
+
+    again = build_projects([ok, bad], command=stub)
+    assert [r.status for r in again] == ["skipped", "failed"]
+    assert (ok / ".calls.txt").read_text() == "x"
+    (ok / "main.tex").write_text("changed")
+    assert build_projects([ok], command=stub)[0].status == "built"
+    assert build_projects([ok], command=stub, force=True)[0].status == "built"
+
+
+def test_build_cli(tmp_path, stub, monkeypatch, capsys):
+    """
+    Test the `build` command output, report file and exit status.
+    """
+    _project(tmp_path / "all", "A")
+    _project(tmp_path / "all", "B", "FAIL")
+    report = tmp_path / "report.json"
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "build", str(tmp_path / "all"), "-w", "2",
+        "--command", " ".join(f'"{part}"' for part in stub), "--report", str(report),
+    ])
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "built   " in out and "failed  " in out
+    assert "1 built, 0 skipped, 1 failed, 0 timeout." in out
+    assert [r["status"] for r in json.loads(report.read_text())] == ["built", "failed"]
+
+
+def test_edit_during_build_is_rebuilt(tmp_path, stub):
+    """
+    Test that sources saved while the compiler runs are not recorded as built.
+    """
+    project = _project(tmp_path, "P", "EDIT")
+    assert build_projects([project], command=stub)[0].status == "built"
+    assert build_projects([project], command=stub)[0].status == "built"
+    assert build_projects([project], command=stub)[0].status == "skipped"
@@ -0,0 +1,82 @@
+"""
+test_cache.py
+
+Tests for the beauti_tex.cache module.
+"""
+
+import os
+import pytest
+from beauti_tex import cache
+from beauti_tex import config as bt_config
+from beauti_tex.cache import FileCache
+
+
+def test_file_cache_reloads_changed_files(tmp_path):
+    """
+    Test that values are reused until the source file changes.
+    """
+    src = tmp_path / "a.txt"
+    src.write_text("one")
+    fc = FileCache(maxsize=4)
+    calls = []
+    def loader():
+        calls.append(1)
+        return src.read_text()
+
+    assert fc.get(src, loader) == "one"
+    assert fc.get(str(src), loader) == "one"
+    assert len(calls) == 1
+
+    src.write_text("three")
+    assert fc.get(src, loader) == "three"
+    assert len(calls) == 2
+
+    fc.invalidate(src)
+    assert len(fc) == 0
+    with pytest.raises(FileNotFoundError):
+        fc.get(tmp_path / "missing.txt", loader)
+
+
+def test_file_cache_lru_bound(tmp_path):
+    """
+    Test that the least recently used entry is evicted.
+    """
+    fc = FileCache(maxsize=2)
+    files = []
+    for name in "abc":
+        (tmp_path / name).write_text(name)
+        files.append(tmp_path / name)
+    fc.get(files[0], lambda: "a")
+    fc.get(files[1], lambda: "b")
+    fc.get(files[0], lambda: "a")
+    fc.get(files[2], lambda: "c")
+    assert len(fc) == 2
+    # b was evicted, a was kept
+    assert fc.get(files[1], lambda: "reloaded") == "reloaded"
+    assert fc.get(files[2], lambda: "reloaded") == "c"
+
+
+def test_get_config_is_cached(tmp_path, monkeypatch):
+    """
+    Test that get_config parses the INI files once and returns copies.
+    """
+    (tmp_path / "temp").mkdir()
+    default_ini = tmp_path / "default.ini"
+    default_ini.write_text("[project]\nfolders = f1\nchapters = c1\nstyle = s\n"
+                           "templates = temp\nsize = 11\nclas = report\n[packages]\n")
+    monkeypatch.setattr(bt_config, "__file__", str(tmp_path / "dummy.py"))
+    calls = []
+    load = bt_config._load_config
+    monkeypatch.setattr(bt_config, "_load_config", lambda files: calls.append(1) or load(files))
+
+    cfg = bt_config.get_config()
+    cfg.folders.append("changed")
+    assert bt_config.get_config().folders == ["f1"]
+    assert len(calls) == 1
+
+    cache.invalidate()
+    bt_config.get_config()
+    assert len(calls) == 2
+    os.utime(default_ini, ns=(0, 0))
+    bt_config.get_config()
+    assert len(calls) == 3
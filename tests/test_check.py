@@ -0,0 +1,80 @@
+"""
+test_check.py
+
+Tests for the beauti_tex.check module and the `check` CLI command.
+"""
+
+import json
+import sys
+import pytest
+from beauti_tex import cli
+from beauti_tex.check import check_project, check_projects, walk_projects
+
+
+def _project(base, name, *, title="My Title", pak="\\usepackage{amsmath}\n", chapters=("intro",)):
+    project = base / name
+    (project / "chapters").mkdir(parents=True)
+    inputs = "".join(f"\\input{{chapters/{c}}}\n" for c in ("titlepage", "intro", "methods"))
+    (project / "main.tex").write_text(f"\\input{{pak}}\n\\begin{{document}}\n{inputs}\\end{{document}}\n")
+    (project / "pak.tex").write_text(pak)
+    (project / "chapters" / "titlepage.tex").write_text(f"\\title{{{title}}}\n\n\\author{{<<AUTHOR>>}}\n")
+    for chapter in chapters:
+        (project / "chapters" / f"{chapter}.tex").write_text("text")
+    return project
+
+
+def test_walk_projects(tmp_path):
+    """
+    Test that projects are found lazily, in name order, without searching inside projects or hidden folders.
+    """
+    a = _project(tmp_path / "repo" / "x", "A")
+    b = _project(tmp_path / "repo", "B")
+    _project(tmp_path / "repo" / ".hidden", "C")
+    (a / "nested").mkdir()
+    (a / "nested" / "main.tex").write_text("")
+    walker = walk_projects([tmp_path / "repo"])
+    assert next(walker) == b
+    assert list(walker) == [a]
+
+
+def test_check_project(tmp_path):
+    """
+    Test placeholder, missing file and empty preamble findings.
+    """
+    project = _project(tmp_path, "P", title="<<TITLE>>", pak="% nothing yet\n\n", chapters=())
+    findings = check_project(project)
+    assert [(f.file, f.line, f.code) for f in findings] == [
+        ("pak.tex", 0, "empty-preamble"),
+        ("chapters/titlepage.tex", 1, "placeholder"),
+        ("chapters/titlepage.tex", 3, "placeholder"),
+        ("main.tex", 0, "missing-file"),
+        ("main.tex", 0, "missing-file"),
+    ]
+    assert findings[1].message == "Unfilled placeholder <<TITLE>>"
+    assert findings[-1].message == "References missing file chapters/methods.tex"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_check_projects_streams_in_order(tmp_path, workers):
+    """
+    Test that findings of many projects arrive in project order, also from the process pool.
+    """
+    for i in range(12):
+        _project(tmp_path, f"P{i:02}", chapters=("intro", "methods"))
+    findings = list(check_projects([tmp_path], workers=workers))
+    assert [f.project for f in findings] == [str(tmp_path / f"P{i:02}") for i in range(12)]
+    assert {f.code for f in findings} == {"placeholder"}
+
+
+def test_check_cli(tmp_path, monkeypatch, capsys):
+    """
+    Test that the `check` command prints JSON lines and exits with 1 on findings.
+    """
+    _project(tmp_path, "P", chapters=("intro", "methods"))
+    monkeypatch.setattr(sys, "argv", ["prog", "check", str(tmp_path), "-w", "1"])
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 1
+    out, err = capsys.readouterr()
+    assert [json.loads(line)["code"] for line in out.splitlines()] == ["placeholder"]
+    assert "1 findings." in err
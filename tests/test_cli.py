@@ -71,4 +71,55 @@ def test_make_project_cli(tmp_path, config_fixture, monkeypatch, capsys):
     # Check other files
     for file in ["pak.tex", "literature.bib", "chapters/appendix.tex",
                  "chapters/abstract.tex", "chapters/titlepage.tex"]:
-        assert (proj_dir / file).exists()
\ No newline at end of file
+        assert (proj_dir / file).exists()
+
+def test_make_projects_cli(tmp_path, config_fixture, monkeypatch, capsys):
+    """
+    Test CLI command 'make-projects' with a CSV manifest.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    manifest = tmp_path / "projects.csv"
+    manifest.write_text("name\nFirst\nSecond\n")
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "make-projects",
+        "--manifest", str(manifest),
+        "--project-path", str(tmp_path),
+        "--workers", "2",
+    ])
+
+    cli.main()
+
+    assert (tmp_path / "First" / "main.tex").exists()
+    assert (tmp_path / "Second" / "main.tex").exists()
+    assert "2 of 2 projects created." in capsys.readouterr().out
+
+    # a second run fails for every project and exits with status 1
+    with pytest.raises(SystemExit):
+        cli.main()
+
+
+def test_make_project_archive_cli(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that --archive closes the archive file and removes it if generation fails.
+    """
+    import zipfile
+    from beauti_tex import output
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    opened = []
+    archive_backend = output.archive_backend
+    monkeypatch.setattr(output, "archive_backend", lambda f, fmt: opened.append(f) or archive_backend(f, fmt))
+    archive = tmp_path / "out.zip"
+    monkeypatch.setattr(sys, "argv", ["prog", "make-project", "--name", "Zipped", "--archive", str(archive)])
+
+    cli.main()
+    assert opened[0].closed
+    assert "Zipped/main.tex" in zipfile.ZipFile(archive).namelist()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("beauti_tex.proj_builder.make_project", fail)
+    with pytest.raises(RuntimeError):
+        cli.main()
+    assert opened[1].closed
+    assert not archive.exists()
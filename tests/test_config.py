@@ -114,4 +114,114 @@ clas = article
     assert cfg.size == 12
     assert cfg.clas == "article"
     assert cfg.packages == {"geometry": "margin=1in", "babel": "english"}
-    assert cfg.temp_path.exists() is True
\ No newline at end of file
+    assert cfg.temp_path.exists() is True
+
+def test_frozen_config(tmp_ini):
+    """Test that FrozenConfig is immutable, hashable by fingerprint and round-trips to Config."""
+    import dataclasses
+    import pickle
+
+    cfg = bt_config.Config(["a", "b"], ["intro"], "IMRaD", tmp_ini.parent / "templates", 12, "report", {"amsmath": ""})
+    frozen = cfg.freeze()
+    assert frozen.folders == ("a", "b")
+    assert frozen == cfg.freeze() and hash(frozen) == hash(cfg.freeze())
+    assert {frozen: 1}[cfg.freeze()] == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.size = 11
+    with pytest.raises(TypeError):
+        frozen.packages["babel"] = "english"
+    assert not hasattr(frozen, "__dict__")
+
+    changed = dataclasses.replace(frozen, chapters=["intro", "methods"])
+    assert changed.chapters == ("intro", "methods")
+    assert changed != frozen and changed.fingerprint != frozen.fingerprint
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert frozen.thaw() == cfg
+
+
+def test_get_config_frozen_is_shared(tmp_ini):
+    """Test that frozen configs come straight from the cache while Config copies are independent."""
+    frozen = bt_config.get_config(tmp_ini, frozen=True)
+    assert bt_config.get_config(tmp_ini, frozen=True) is frozen
+    cfg = bt_config.get_config(tmp_ini)
+    cfg.chapters.append("extra")
+    assert bt_config.get_config(tmp_ini) == frozen.thaw()
+
+
+def test_get_config_rejects_unknown_keys(tmp_ini, tmp_path):
+    """Test that unknown sections and keys fail at load time, naming file, section and key."""
+    bad = tmp_path / "bad.ini"
+    bad.write_text("[project]\nchapter = intro\n")
+    with pytest.raises(bt_config.ConfigError, match=r"bad.ini: \[project\] chapter: unknown key, did you mean 'chapters'\?") as exc:
+        bt_config.get_config(bad)
+    assert (exc.value.section, exc.value.key) == ("project", "chapter")
+    bad.write_text("[projekt]\nsize = 12\n")
+    with pytest.raises(bt_config.ConfigError, match=r"\[projekt\]: unknown section"):
+        bt_config.get_config(bad)
+
+
+@pytest.mark.parametrize("line, message", [
+    ("[project]\nsize = twelve\n", r"\[project\] size: expected a number, got 'twelve'"),
+    ("[project]\nsize = 0\n", r"\[project\] size: expected a positive number"),
+    ("[project]\nclas =\n", r"\[project\] clas: must not be empty"),
+    ("[project]\ntemplates = nowhere\n", r"\[project\] templates: template folder .*nowhere not found"),
+    ("[packages]\nfoo = \\usepackage{foo\n", r"\[packages\] foo: unbalanced braces"),
+    ("[packages]\nx y = \n", r"\[packages\] x y: invalid package name"),
+    ("[packages]\nlinks = \\usepackage{hyperref}\n", r"\[packages\]: Package hyperref is loaded by \[hyperref\] and \[links\]"),
+])
+def test_get_config_invalid_values(tmp_path, line, message):
+    """Test the schema checks of [project] values and [packages] entries."""
+    bad = tmp_path / "bad.ini"
+    bad.write_text(line)
+    with pytest.raises(bt_config.ConfigError, match=message):
+        bt_config.get_config(bad)
+
+
+def test_templates_relative_to_config_file(tmp_path):
+    """Test that a relative templates path is resolved against the INI file that sets it."""
+    (tmp_path / "conf" / "mytemplates").mkdir(parents=True)
+    ini = tmp_path / "conf" / "my.ini"
+    ini.write_text("[project]\ntemplates = mytemplates\nchapters = a, ,b\n")
+    cfg = bt_config.get_config(ini)
+    assert cfg.temp_path == tmp_path / "conf" / "mytemplates"
+    assert cfg.chapters == ["a", "b"]
+    assert bt_config.get_config().temp_path == Path(bt_config.__file__).parent / "templates"
+
+
+def test_config_snapshot_round_trip(tmp_ini, tmp_path):
+    """Test that a dumped snapshot loads back to an equal config without the defaults."""
+    frozen = bt_config.get_config(tmp_ini, frozen=True)
+    snapshot = tmp_path / "snap.json"
+    text = bt_config.dump_config(frozen, snapshot)
+    assert snapshot.read_text() == text
+    assert bt_config.get_config(snapshot, frozen=True) == frozen
+
+    snapshot.write_text(text.replace('"size": 12', '"size": "12"'))
+    with pytest.raises(bt_config.ConfigError, match=r"\[project\] size: expected int, got str"):
+        bt_config.get_config(snapshot)
+    snapshot.write_text("{}")
+    with pytest.raises(bt_config.ConfigError, match="not a beauti-tex config snapshot"):
+        bt_config.get_config(snapshot)
+
+
+def test_config_dump_cli(tmp_ini, tmp_path, monkeypatch, capsys):
+    """Test `config dump` to stdout and to a file, and its error message."""
+    import json
+    import sys
+    from beauti_tex import cli
+
+    monkeypatch.setattr(sys, "argv", ["prog", "config", "dump", str(tmp_ini)])
+    cli.main()
+    data = json.loads(capsys.readouterr().out)
+    assert data["project"]["chapters"] == ["chap1", "chap2"]
+    assert data["packages"]["babel"] == "english"
+
+    out = tmp_path / "snap.json"
+    monkeypatch.setattr(sys, "argv", ["prog", "config", "dump", "-o", str(out)])
+    cli.main()
+    assert json.loads(out.read_text())["project"]["clas"] == "scrreprt"
+
+    (tmp_path / "bad.ini").write_text("[project]\nsize = x\n")
+    monkeypatch.setattr(sys, "argv", ["prog", "config", "dump", str(tmp_path / "bad.ini")])
+    with pytest.raises(SystemExit, match="size: expected a number"):
+        cli.main()
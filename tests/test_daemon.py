@@ -0,0 +1,126 @@
+"""
+test_daemon.py
+
+Tests for the beauti_tex.daemon module: protocol, CLI integration and
+a stress test with many concurrent clients.
+"""
+
+import socket
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from beauti_tex import cli
+from beauti_tex.config import Config
+from beauti_tex.daemon import DaemonServer, DaemonUnavailable, request
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def cfg(tmp_path, monkeypatch):
+    """
+    Creates a minimal Config used by the daemon running in this process.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "main.tex").write_text("<<CLAS>>\n<<CHAPTERS>>")
+    (template / "titlepage.tex").write_text("<<TITLE>>")
+    cfg = Config(["figures"], ["intro", "methods"], "IMRaD", template, 12, "report", {})
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+    return cfg
+
+
+@pytest.fixture
+def daemon():
+    """
+    Runs a daemon in a background thread on a short socket path.
+    """
+    folder = Path(tempfile.mkdtemp(prefix="bt"))
+    server = DaemonServer(folder / "d.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    folder.rmdir()
+
+
+def test_ping_and_errors(daemon, cfg, tmp_path):
+    """
+    Test requests, error propagation with the original exception type and unknown operations.
+    """
+    sock = daemon.socket_path
+    assert request("ping", socket_path=sock)["version"]
+    result = request("make-project", {"name": "A", "proj_path": str(tmp_path)}, socket_path=sock)
+    assert result == {"path": str(tmp_path / "A")}
+    assert (tmp_path / "A" / "chapters" / "intro.tex").exists()
+    with pytest.raises(FileExistsError):
+        request("make-project", {"name": "A", "proj_path": str(tmp_path)}, socket_path=sock)
+    with pytest.raises(ValueError, match="Unknown operation"):
+        request("delete-everything", socket_path=sock)
+
+
+def test_unavailable(tmp_path):
+    """
+    Test that a missing daemon raises DaemonUnavailable.
+    """
+    with pytest.raises(DaemonUnavailable):
+        request("ping", socket_path=tmp_path / "none.sock")
+
+
+def test_second_server_refused(daemon):
+    """
+    Test that a second daemon does not take over a socket that is in use.
+    """
+    with pytest.raises(FileExistsError):
+        DaemonServer(daemon.socket_path)
+
+
+def test_cli_uses_daemon(daemon, cfg, tmp_path, monkeypatch, capsys):
+    """
+    Test that the CLI sends make-project to a running daemon and honours --no-daemon.
+    """
+    monkeypatch.setenv("BEAUTITEX_SOCKET", str(daemon.socket_path))
+    calls = []
+    monkeypatch.setattr("beauti_tex.proj_builder.make_project", lambda *a, **k: calls.append(a))
+
+    monkeypatch.setattr(sys, "argv", ["prog", "make-project", "-N", "ViaDaemon", "-pp", str(tmp_path)])
+    cli.main()
+    assert (tmp_path / "ViaDaemon" / "main.tex").exists()
+    assert calls == []
+    assert "Latex Project Created!" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", ["prog", "--no-daemon", "make-project", "-N", "Local", "-pp", str(tmp_path)])
+    cli.main()
+    assert calls == [("Local",)]
+
+
+def test_stress_many_concurrent_clients(daemon, cfg, tmp_path):
+    """
+    Test 32 concurrent clients sending 200 requests, with some intentional conflicts.
+    """
+    sock = daemon.socket_path
+
+    def client(i):
+        # every 10th request repeats an earlier name and must fail cleanly
+        name = f"P{i - 5 if i % 10 == 9 else i}"
+        try:
+            return request("make-project", {"name": name, "proj_path": str(tmp_path)}, socket_path=sock)
+        except FileExistsError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(client, range(200)))
+
+    created = [r for r in results if r is not None]
+    assert len(created) == 180
+    assert len({r["path"] for r in created}) == 180
+    for r in created:
+        assert sorted(p.name for p in Path(r["path"]).iterdir()) == [
+            ".beauti-tex.json", "chapters", "figures", "literature.bib", "main.tex", "pak.tex",
+        ]
+    # no staging folders are left behind
+    assert len(list(tmp_path.glob(".*"))) == 0
@@ -0,0 +1,111 @@
+"""
+test_deps.py
+
+Tests for the beauti_tex.latex.deps module and the `deps` CLI command.
+"""
+
+import os
+import sys
+from beauti_tex import cli
+from beauti_tex.latex.deps import DEPS_CACHE, parse_refs, scan_dependencies
+
+MAIN = r"""\documentclass{report}
+\input{pak}
+\addbibresource{literature.bib}
+\begin{document}
+\input{chapters/intro}
+% \input{chapters/commented}
+\include{chapters/missing}
+\printbibliography
+\end{document}
+"""
+
+
+def _project(base):
+    project = base / "P"
+    (project / "chapters").mkdir(parents=True)
+    (project / "figures").mkdir()
+    (project / "main.tex").write_text(MAIN)
+    (project / "pak.tex").write_text("\\usepackage{graphicx}\n\\graphicspath{{figures/}}\n")
+    (project / "literature.bib").write_text("")
+    (project / "chapters" / "intro.tex").write_text("\\includegraphics[width=\\linewidth]{plot}\n\\input{chapters/intro}\n")
+    (project / "figures" / "plot.png").write_bytes(b"png")
+    return project
+
+
+def test_parse_refs():
+    """
+    Test that commands, options, lists and comments are parsed.
+    """
+    text = (
+        "\\input{a}\\includegraphics*[scale=.5]{fig/b.pdf} \\inputenc{x}\n"
+        "\\bibliography{one, two} 50\\% done % \\input{c}\n"
+        "\\graphicspath{{x/}{y/}}\\include {d}\n"
+    )
+    assert parse_refs(text) == [
+        ("input", "a"), ("graphics", "fig/b.pdf"), ("bib", "one.bib"), ("bib", "two.bib"),
+        ("graphicspath", "x/"), ("graphicspath", "y/"), ("input", "d"),
+    ]
+
+
+def test_scan_dependencies(tmp_path):
+    """
+    Test the graph, graphicspath resolution, missing files and cycles.
+    """
+    project = _project(tmp_path)
+    graph = scan_dependencies(project)
+    assert graph.dependencies() == [
+        "chapters/intro.tex", "figures/plot.png", "literature.bib", "main.tex", "pak.tex",
+    ]
+    assert graph.dependencies("chapters/intro.tex") == ["chapters/intro.tex", "figures/plot.png"]
+    assert graph.missing == {"chapters/missing.tex"}
+    assert (project / DEPS_CACHE).is_file()
+
+    rule = graph.to_make()
+    assert rule.startswith(f"{project.as_posix()}/main.pdf: {project.as_posix()}/chapters/intro.tex ")
+    assert f"\n{project.as_posix()}/pak.tex:\n" in rule
+
+
+def test_incremental_rescan(tmp_path):
+    """
+    Test that only changed files are read again and new references are picked up.
+    """
+    project = _project(tmp_path)
+    assert scan_dependencies(project).rescanned == 3
+    assert scan_dependencies(project).rescanned == 0
+
+    intro = project / "chapters" / "intro.tex"
+    intro.write_text("\\input{chapters/extra}\n")
+    (project / "chapters" / "extra.tex").write_text("extra")
+    graph = scan_dependencies(project)
+    assert graph.rescanned == 2
+    assert "chapters/extra.tex" in graph.dependencies()
+    assert "figures/plot.png" not in graph.dependencies()
+
+
+def test_stale(tmp_path):
+    """
+    Test that dependencies newer than the PDF are stale.
+    """
+    project = _project(tmp_path)
+    graph = scan_dependencies(project)
+    assert len(graph.stale()) == 5
+    pdf = project / "main.pdf"
+    pdf.write_bytes(b"%PDF")
+    later = pdf.stat().st_mtime + 100
+    os.utime(pdf, (later, later))
+    assert graph.stale() == []
+    os.utime(project / "pak.tex", (later + 100, later + 100))
+    assert graph.stale() == ["pak.tex"]
+
+
+def test_deps_cli(tmp_path, monkeypatch, capsys):
+    """
+    Test that the `deps` command writes Make rules and reports missing files.
+    """
+    project = _project(tmp_path)
+    out = tmp_path / "main.d"
+    monkeypatch.setattr(sys, "argv", ["prog", "deps", str(project), "-o", str(out)])
+    cli.main()
+    assert out.read_text().startswith(f"{project.as_posix()}/main.pdf: ")
+    assert "missing chapters/missing.tex" in capsys.readouterr().err
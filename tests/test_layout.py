@@ -0,0 +1,111 @@
+"""
+test_layout.py
+
+Tests for the beauti_tex.layout module and layout driven project generation.
+"""
+
+import pytest
+from beauti_tex.config import Config
+from beauti_tex.layout import Layout, LayoutError
+from beauti_tex.output import MemoryBackend
+from beauti_tex.proj_builder import make_project
+from beauti_tex.store import AssetStore
+
+
+def test_parse_layout():
+    """
+    Test that a layout keeps file order, case and deduplicates folders.
+    """
+    layout = Layout.parse(
+        "[dirs]\nchapters\nData\nchapters\n\n"
+        "[files]\nMain.tex = template:main.tex\nchapters/{chapter}.tex = chapter\n"
+        "pak.tex = preamble\nnotes/todo.txt = empty\nREADME.md = template:main.tex\n"
+        "thesis.cls = static:thesis.cls\n"
+    )
+    assert layout.dirs == ("chapters", "Data")
+    assert [path for path, _, _ in layout.files] == [
+        "Main.tex", "chapters/{chapter}.tex", "pak.tex", "notes/todo.txt", "README.md", "thesis.cls",
+    ]
+    assert layout.templates == ("main.tex", "thesis.cls")
+
+
+@pytest.mark.parametrize(
+    "files",
+    [
+        "main.tex = copy:main.tex",
+        "main.tex = template",
+        "thesis.cls = static",
+        "pak.tex = preamble:x",
+        "chapters/intro.tex = chapter",
+        "{chapter}.tex = empty",
+        "../main.tex = empty",
+        "/main.tex = empty",
+    ],
+)
+def test_invalid_layout(files):
+    """
+    Test that unknown kinds, missing arguments, misplaced {chapter} and escaping paths are rejected.
+    """
+    with pytest.raises(LayoutError):
+        Layout.parse(f"[files]\n{files}\n")
+
+
+def test_missing_files_section():
+    """
+    Test that a layout without [files] is rejected.
+    """
+    with pytest.raises(LayoutError):
+        Layout.parse("[dirs]\nchapters\n")
+
+
+def test_custom_layout(tmp_path, monkeypatch):
+    """
+    Test that `layout.ini` in the templates folder defines the whole project tree.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "main.tex").write_text("<<CLAS>>")
+    (template / "titlepage.tex").write_text("<<TITLE>>")
+    (template / "readme.txt").write_text("Project <<TITLE>>")
+    (template / "layout.ini").write_text(
+        "[dirs]\ndata/raw\n\n"
+        "[files]\nmain.tex = template:main.tex\nREADME.txt = template:readme.txt\n"
+        "sections/{chapter}.tex = chapter\n"
+    )
+    cfg = Config(["figures"], ["intro"], "IMRaD", template, 12, "report", {})
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+
+    backend = MemoryBackend()
+    make_project("Demo", backend=backend)
+    assert backend.dirs == {"Demo", "Demo/data", "Demo/data/raw", "Demo/figures", "Demo/sections"}
+    assert sorted(backend.files) == [
+        "Demo/.beauti-tex.json", "Demo/README.txt", "Demo/main.tex", "Demo/sections/intro.tex",
+    ]
+    assert backend.files["Demo/README.txt"] == "Project Demo"
+    assert backend.files["Demo/sections/intro.tex"] == "\\chapter{Intro}"
+
+
+def test_static_layout_entries(tmp_path, monkeypatch):
+    """
+    Test that only `static:` entries join the store, and that they must not have placeholders.
+    """
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "main.tex").write_text("<<CLAS>>")
+    (template / "notes.tex").write_text("NOTES")
+    (template / "thesis.cls").write_text("CLASS")
+    (template / "layout.ini").write_text("[files]\nmain.tex = template:main.tex\nnotes.tex = template:notes.tex\nthesis.cls = static:thesis.cls\n")
+    cfg = Config([], [], "IMRaD", template, 12, "report", {})
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+
+    store = AssetStore(tmp_path / "store")
+    make_project("Demo", proj_path=tmp_path, link_assets=store)
+    assert (tmp_path / "Demo" / "thesis.cls").read_text() == "CLASS"
+    stored = {p.read_bytes() for p in store.root.rglob("*") if p.is_file()}
+    assert b"CLASS" in stored and b"NOTES" not in stored
+
+    (template / "thesis.cls").write_text("<<TITLE>>")
+    from beauti_tex import cache
+    cache.invalidate()
+    with pytest.raises(LayoutError, match="must not have placeholders"):
+        make_project("Other", backend=MemoryBackend())
@@ -0,0 +1,73 @@
+"""
+test_output.py
+
+Tests for the beauti_tex.output module.
+"""
+
+import io
+import tarfile
+import zipfile
+import pytest
+from beauti_tex.output import ProjectPlan, write_plan, MemoryBackend, ZipBackend, archive_backend
+
+
+def test_plan_build_adds_parents():
+    """
+    Test that directories are deduplicated, sorted and include file parents.
+    """
+    plan = ProjectPlan.build(["figures", "chapters", "figures"], {
+        "main.tex": "x",
+        "chapters/a.tex": "y",
+        "tables/raw/t.tex": "z",
+    })
+    assert plan.dirs == ("chapters", "figures", "tables", "tables/raw")
+    assert plan.size == 3
+
+
+def test_write_plan_is_atomic(tmp_path):
+    """
+    Test that a failing write leaves neither the project nor a staging folder.
+    """
+    target = tmp_path / "Proj"
+    # the parent folder of the file is missing from the plan
+    broken = ProjectPlan(dirs=(), files=(("main.tex", "x"), ("sub/a.tex", "y")))
+    with pytest.raises(FileNotFoundError):
+        write_plan(broken, target)
+    assert list(tmp_path.iterdir()) == []
+
+    plan = ProjectPlan.build([], {"main.tex": "x", "sub/a.tex": "y", "build.sh": "echo"})
+    assert write_plan(plan, target) == target
+    assert (target / "sub" / "a.tex").read_text() == "y"
+    assert (target / "build.sh").stat().st_mode & 0o111
+    assert [p.name for p in tmp_path.iterdir()] == ["Proj"]
+
+    with pytest.raises(FileExistsError):
+        write_plan(plan, target)
+
+
+def test_memory_and_archive_backends():
+    """
+    Test that plans can be written into memory and streamed into archives.
+    """
+    plan = ProjectPlan.build(["figures"], {"main.tex": "x", "build.sh": "echo"})
+
+    mem = MemoryBackend()
+    mem.write("P", plan)
+    assert mem.files == {"P/main.tex": "x", "P/build.sh": "echo"}
+    assert "P/figures" in mem.dirs
+    with pytest.raises(FileExistsError):
+        mem.write("P", plan)
+
+    buf = io.BytesIO()
+    with ZipBackend(buf) as backend:
+        backend.write("P", plan)
+    with zipfile.ZipFile(io.BytesIO(buf.getvalue())) as zf:
+        assert zf.read("P/main.tex") == b"x"
+        assert "P/figures/" in zf.namelist()
+
+    buf = io.BytesIO()
+    with archive_backend(buf, "tar.gz") as backend:
+        backend.write("P", plan)
+    with tarfile.open(fileobj=io.BytesIO(buf.getvalue())) as tf:
+        assert tf.extractfile("P/main.tex").read() == b"x"
+        assert tf.getmember("P/build.sh").mode == 0o755
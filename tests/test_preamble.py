@@ -0,0 +1,54 @@
+"""
+test_preamble.py
+
+Tests for the beauti_tex.latex.preamble module.
+"""
+
+import pytest
+from beauti_tex.latex.preamble import render_preamble, package_names, PreambleError
+
+
+def test_render_preamble_order_and_dedup():
+    """
+    Test option handling, duplicate removal and late loading of hyperref.
+    """
+    packages = {
+        "hyperref": r"\usepackage[hidelinks]{hyperref}",
+        "geometry": "margin=1in",
+        "amsmath": "",
+        "graphicx": "\\usepackage{graphicx}\n\\graphicspath{{figures/}}",
+        "maths": "\\usepackage{amsmath}",
+    }
+    lines = render_preamble(packages).splitlines()
+    assert lines[1:] == [
+        r"\usepackage[margin=1in]{geometry}",
+        r"\usepackage{amsmath}",
+        r"\usepackage{graphicx}",
+        r"\graphicspath{{figures/}}",
+        r"\usepackage[hidelinks]{hyperref}",
+    ]
+
+
+def test_render_preamble_is_memoized():
+    """
+    Test that the same package set returns the same rendered string.
+    """
+    packages = {"amssymb": "", "booktabs": ""}
+    assert render_preamble(packages) is render_preamble(dict(packages))
+
+
+def test_render_preamble_conflicts():
+    """
+    Test that conflicting packages and option clashes are rejected.
+    """
+    with pytest.raises(PreambleError):
+        render_preamble({"subfig": "", "subcaption": ""})
+    with pytest.raises(PreambleError):
+        render_preamble({"babel": "english", "lang": r"\usepackage[ngerman]{babel}"})
+
+
+def test_package_names():
+    """
+    Test that package lists in one \\usepackage are split.
+    """
+    assert package_names(r"\usepackage{amsmath, amssymb}\RequirePackage[x]{y}") == ["amsmath", "amssymb", "y"]
@@ -0,0 +1,44 @@
+"""
+test_precompile.py
+
+Tests for the beauti_tex.latex.precompile module.
+"""
+
+import shutil
+import subprocess
+import pytest
+from beauti_tex.latex.precompile import precompile_files, split_preamble, format_name, SCRIPT_NAME
+
+MAIN = "\\documentclass{report}\n\\input{pak}\n\\begin{document}\nHi\n\\end{document}\n"
+PAK = "\\usepackage{amsmath}\n"
+
+
+def test_precompile_files():
+    """
+    Test that the preamble is split off and main.tex only inputs it without a format.
+    """
+    files = precompile_files(MAIN, PAK)
+    assert set(files) == {"main.tex", "preamble.tex", SCRIPT_NAME}
+    assert files["preamble.tex"].count("\\documentclass{report}") == 1
+    assert files["preamble.tex"].rstrip().endswith("\\csname endofdump\\endcsname")
+    assert "\\ifdefined\\beautitexformat\\else" in files["main.tex"]
+    assert "\\documentclass" not in files["main.tex"]
+    assert files["main.tex"].endswith("\\begin{document}\nHi\n\\end{document}\n")
+
+    with pytest.raises(ValueError):
+        split_preamble("no document")
+
+
+@pytest.mark.skipif(shutil.which("sha256sum") is None, reason="needs sha256sum")
+def test_format_name_matches_build_script(tmp_path):
+    """
+    Test that the Python format name equals the one computed by latex-build.sh.
+    """
+    files = precompile_files(MAIN, PAK)
+    (tmp_path / "preamble.tex").write_text(files["preamble.tex"])
+    (tmp_path / "pak.tex").write_text(PAK)
+    out = subprocess.run(
+        "cat preamble.tex pak.tex | sha256sum | cut -c1-16",
+        shell=True, cwd=tmp_path, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert format_name(files["preamble.tex"], PAK) == f"beautitex-{out}"
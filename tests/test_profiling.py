@@ -0,0 +1,90 @@
+"""
+test_profiling.py
+
+Tests for the beauti_tex.profiling module.
+"""
+
+import json
+import sys
+import threading
+from beauti_tex import cli
+from beauti_tex.profiling import Profiler, stage, add_hook, remove_hook
+from beauti_tex.proj_builder import make_project, make_projects
+
+
+def test_stage_reports_to_hooks():
+    """
+    Test that stages are only reported while a hook is registered.
+    """
+    events = []
+    with stage("outside"):
+        pass
+    add_hook(events.append)
+    try:
+        with stage("inside") as st:
+            st.bytes_written += 10
+            st.fs_ops_estimate += 2
+    finally:
+        remove_hook(events.append)
+    assert [(e.name, e.bytes_written, e.fs_ops_estimate) for e in events] == [("inside", 10, 2)]
+
+
+def test_profiler_collects_pipeline_stages(tmp_path):
+    """
+    Test that make_project reports all stages of the pipeline.
+    """
+    with Profiler() as prof:
+        make_project("Profiled", proj_path=tmp_path)
+
+    summary = prof.summary()
+    assert list(summary) == ["config", "templates", "render", "mkdir", "write", "rename"]
+    assert summary["write"]["bytes_written"] > 0
+    assert summary["mkdir"]["fs_ops_estimate"] > 0
+    assert "write" in prof.format_table()
+    trace = json.loads(prof.to_chrome_trace())["traceEvents"]
+    assert {e["ph"] for e in trace} == {"X"}
+
+
+def test_concurrent_profilers_are_separate():
+    """
+    Test that two profilers active at the same time in different threads only see their own stages.
+    """
+    barrier = threading.Barrier(2)
+    profilers = {}
+
+    def run(name):
+        with Profiler() as prof:
+            barrier.wait()
+            with stage(name):
+                pass
+            barrier.wait()
+        profilers[name] = prof
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {name: [e.name for e in prof.events] for name, prof in profilers.items()} == {"a": ["a"], "b": ["b"]}
+
+
+def test_profiler_sees_batch_workers(tmp_path):
+    """
+    Test that stages run in the thread pool of make_projects reach the profiler.
+    """
+    with Profiler() as prof:
+        make_projects([{"name": "A"}, {"name": "B"}], proj_path=tmp_path, workers=2)
+    assert prof.summary()["write"]["count"] == 2
+
+
+def test_profile_cli(tmp_path, monkeypatch, capsys):
+    """
+    Test that --profile writes a JSON profile to a file.
+    """
+    out = tmp_path / "profile.json"
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "--profile", "--profile-format", "json", "--profile-output", str(out),
+        "make-project", "--name", "P", "--project-path", str(tmp_path),
+    ])
+    cli.main()
+    assert "write" in json.loads(out.read_text())["summary"]
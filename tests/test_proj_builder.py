@@ -6,9 +6,11 @@ Tests for the beauti_tex.proj_builder.make_project function.
 
 import pytest
 from pathlib import Path
+import os
 import shutil
-from beauti_tex.proj_builder import make_project
+from beauti_tex.proj_builder import make_project, make_projects, load_manifest, update_project
 from beauti_tex.config import Config
+from beauti_tex.output import MemoryBackend
 from beauti_tex.config import get_config
 
 @pytest.fixture
@@ -25,7 +27,7 @@ def tmp_template(tmp_path):
         "<<CLAS>> document class, size <<SIZE>>\n<<CHAPTERS>>"
     )
     # titlepage.tex
-    (template / "titlepage.tex").write_text("TITLE PAGE")
+    (template / "titlepage.tex").write_text("TITLE PAGE <<TITLE>> by <<AUTHOR>><<MNR>><<STPROG>>")
     return template
 
 @pytest.fixture
@@ -77,4 +79,156 @@ def test_make_project(tmp_path, config_fixture, monkeypatch):
 
     # Check other files
     for file in ["pak.tex", "literature.bib", "chapters/appendix.tex", "chapters/abstract.tex", "chapters/titlepage.tex"]:
-        assert (proj_dir / file).exists()
\ No newline at end of file
+        assert (proj_dir / file).exists()
+
+
+def test_make_project_titlepage(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that the titlepage placeholders are filled and escaped.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+
+    make_project("My Paper", proj_path=tmp_path, meta={"author": "Smith & Jones"})
+
+    titlepage = (tmp_path / "My_Paper" / "chapters" / "titlepage.tex").read_text()
+    assert titlepage == r"TITLE PAGE My Paper by Smith \& Jones"
+
+def test_make_projects(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that make_projects builds a batch, applies overrides
+    and reports failures without aborting the other projects.
+    """
+    calls = []
+    def fake_get_config(path=None):
+        calls.append(path)
+        return config_fixture
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", fake_get_config)
+    (tmp_path / "Exists").mkdir()
+
+    specs = [
+        {"name": "A"},
+        {"name": "Exists"},
+        {"name": "B", "chapters": "one, two", "size": "11"},
+    ]
+    results = make_projects(specs, workers=2, proj_path=tmp_path)
+
+    # config is loaded only once for the whole batch
+    assert calls == [None]
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, FileExistsError)
+    assert (tmp_path / "A" / "chapters" / "intro.tex").exists()
+    assert (tmp_path / "B" / "chapters" / "two.tex").exists()
+    assert "size 11" in (tmp_path / "B" / "main.tex").read_text()
+
+
+def test_load_manifest(tmp_path):
+    """
+    Test that CSV and JSON manifests are read into specs.
+    """
+    csv_file = tmp_path / "projects.csv"
+    csv_file.write_text("name,path,size\nA,,11\nB,out,\n")
+    assert load_manifest(csv_file) == [
+        {"name": "A", "size": "11"},
+        {"name": "B", "path": "out"},
+    ]
+
+    json_file = tmp_path / "projects.json"
+    json_file.write_text('{"projects": [{"name": "C", "chapters": ["x"]}]}')
+    assert load_manifest(json_file) == [{"name": "C", "chapters": ["x"]}]
+
+    txt_file = tmp_path / "projects.txt"
+    txt_file.write_text("A")
+    with pytest.raises(ValueError):
+        load_manifest(txt_file)
+
+
+def test_make_project_precompile(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that precompile writes preamble.tex and an executable build script.
+    """
+    (config_fixture.temp_path / "main.tex").write_text(
+        "\\documentclass[<<SIZE>>]{<<CLAS>>}\n\\input{pak}\n\\begin{document}\n<<CHAPTERS>>\n\\end{document}"
+    )
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+
+    make_project("Fmt", proj_path=tmp_path, precompile=True)
+
+    proj_dir = tmp_path / "Fmt"
+    assert "\\documentclass[12]{report}" in (proj_dir / "preamble.tex").read_text()
+    assert "\\input{preamble}" in (proj_dir / "main.tex").read_text()
+    assert (proj_dir / "latex-build.sh").stat().st_mode & 0o111
+
+
+def test_update_project(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that update_project only rewrites changed files the user did not edit.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    make_project("Upd", proj_path=tmp_path)
+    proj_dir = tmp_path / "Upd"
+    os.utime(proj_dir / "chapters" / "intro.tex", ns=(0, 0))
+
+    # nothing changed
+    result = update_project("Upd", proj_path=tmp_path)
+    assert result.written == [] and result.skipped == []
+    assert (proj_dir / "chapters" / "intro.tex").stat().st_mtime_ns == 0
+
+    # user edits pak.tex, config changes packages and chapters
+    (proj_dir / "pak.tex").write_text("% mine")
+    config_fixture.packages = {"amsmath": ""}
+    config_fixture.chapters = ["intro", "methods", "results"]
+    result = update_project("Upd", proj_path=tmp_path)
+
+    assert sorted(result.written) == ["chapters/results.tex", "main.tex"]
+    assert result.skipped == ["pak.tex"]
+    assert (proj_dir / "pak.tex").read_text() == "% mine"
+    assert "\\input{chapters/results}" in (proj_dir / "main.tex").read_text()
+    assert (proj_dir / "chapters" / "intro.tex").stat().st_mtime_ns == 0
+
+    # pak.tex stays "edited" on later updates
+    assert update_project("Upd", proj_path=tmp_path).skipped == ["pak.tex"]
+
+
+def test_make_project_leaves_nothing_on_failure(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that a missing template does not leave a half-built project behind.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    (config_fixture.temp_path / "titlepage.tex").unlink()
+
+    with pytest.raises(FileNotFoundError):
+        make_project("Broken", proj_path=tmp_path)
+    assert not (tmp_path / "Broken").exists()
+
+    (config_fixture.temp_path / "titlepage.tex").write_text("TITLE PAGE")
+    make_project("Broken", proj_path=tmp_path)
+    assert (tmp_path / "Broken" / "chapters" / "titlepage.tex").exists()
+
+
+def test_make_projects_memory_backend(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that projects can be generated without touching the file system.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    backend = MemoryBackend()
+
+    results = make_projects([{"name": "A"}, {"name": "B", "path": "sub"}], backend=backend)
+
+    assert [r.ok for r in results] == [True, True]
+    assert "A/main.tex" in backend.files
+    assert "sub/B/chapters/intro.tex" in backend.files
+    assert list(tmp_path.iterdir()) == [config_fixture.temp_path]
+
+
+def test_batch_shares_frozen_configs(tmp_path, config_fixture, monkeypatch):
+    """
+    Test that a batch holds one frozen config per distinct configuration.
+    """
+    from beauti_tex.proj_builder import _prepare_batch
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: config_fixture)
+    specs = [{"name": "A"}, {"name": "B"}, {"name": "C", "size": "11"}, {"name": "D", "size": 11}]
+    results, jobs = _prepare_batch(specs, tmp_path, None, False, MemoryBackend())
+    assert all(r.ok for r in results)
+    assert jobs[0].cfg is jobs[1].cfg
+    assert jobs[2].cfg is jobs[3].cfg
+    assert jobs[2].cfg.size == 11 and jobs[2].cfg != jobs[0].cfg
@@ -0,0 +1,78 @@
+"""
+test_startup.py
+
+Startup-time benchmarks for the beauti-tex CLI.
+
+The CLI is called from editor hooks and shell scripts, so interpreter
+startup dominates its wall time. These tests run a fresh interpreter and
+fail if the CLI eagerly imports heavy modules or if a cold
+`beauti-tex --help` exceeds its time budget.
+
+The budgets can be adjusted with the environment variables
+`BEAUTITEX_IMPORT_BUDGET_MS` (import of `beauti_tex.cli` without the
+standard library parts it shares with every argparse CLI) and
+`BEAUTITEX_HELP_BUDGET_MS` (wall time of `--help`).
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import beauti_tex
+
+IMPORT_BUDGET_MS = float(os.environ.get("BEAUTITEX_IMPORT_BUDGET_MS", 50))
+HELP_BUDGET_MS = float(os.environ.get("BEAUTITEX_HELP_BUDGET_MS", 1000))
+
+# modules only needed once a command actually runs
+HEAVY = ["configparser", "shutil", "concurrent.futures", "zipfile", "tarfile", "beauti_tex.proj_builder"]
+
+
+def _env():
+    env = dict(os.environ)
+    src = str(Path(beauti_tex.__file__).parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return env
+
+
+def _python(*args):
+    return subprocess.run(
+        [sys.executable, *args], env=_env(), capture_output=True, text=True, check=True,
+    )
+
+
+def test_cli_import_is_lazy():
+    """
+    Test that importing the CLI does not load the project builder or its dependencies.
+    """
+    code = "import sys, beauti_tex.cli; print(' '.join(m for m in %r if m in sys.modules))" % HEAVY
+    assert _python("-c", code).stdout.strip() == ""
+
+
+def test_cli_import_time():
+    """
+    Test the cumulative `-X importtime` of beauti_tex modules against the budget.
+    """
+    err = _python("-X", "importtime", "-c", "import beauti_tex.cli").stderr
+    total_us = 0
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if name.strip().startswith("beauti_tex"):
+            total_us += int(self_us)
+    assert total_us / 1000 < IMPORT_BUDGET_MS, f"beauti_tex imports took {total_us / 1000:.1f} ms"
+
+
+def test_help_latency():
+    """
+    Test the wall time of a cold `beauti-tex --help` against the budget.
+    """
+    # best of three to smooth out noise from the machine
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        out = _python("-m", "beauti_tex.cli", "--help").stdout
+        timings.append((time.perf_counter() - start) * 1000)
+    assert "make-project" in out
+    assert min(timings) < HELP_BUDGET_MS, f"--help took {min(timings):.0f} ms"
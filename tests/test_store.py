@@ -0,0 +1,123 @@
+"""
+test_store.py
+
+Tests for the beauti_tex.store module and linked project assets.
+"""
+
+import os
+import pytest
+from beauti_tex.config import Config
+from beauti_tex.output import ProjectPlan, write_plan
+from beauti_tex.proj_builder import make_project, update_project
+import hashlib
+from beauti_tex.store import AssetStore
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    """
+    Creates a Config whose templates contain a titlepage without placeholders and an asset.
+    """
+    template = tmp_path / "template"
+    (template / "assets" / "figures").mkdir(parents=True)
+    (template / "main.tex").write_text("<<CLAS>>\n<<CHAPTERS>>")
+    (template / "titlepage.tex").write_text("STATIC TITLE PAGE")
+    (template / "abstract.tex").write_text("ABSTRACT")
+    (template / "assets" / "figures" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    return Config(
+        folders=["figures"],
+        chapters=["intro"],
+        style="IMRaD",
+        temp_path=template,
+        size=12,
+        clas="report",
+        packages={},
+    )
+
+
+def test_put_is_content_addressed(tmp_path):
+    """
+    Test that equal content is stored once, read-only.
+    """
+    store = AssetStore(tmp_path / "store")
+    path = store.put(b"data")
+    assert store.put(b"data") == path
+    assert path.read_bytes() == b"data"
+    assert not os.access(path, os.W_OK) or os.geteuid() == 0
+    assert store.put(b"other") != path
+
+
+@pytest.mark.parametrize("mode", ["auto", "copy"])
+def test_materialize_modes(tmp_path, mode):
+    """
+    Test materialization modes and the executable bit.
+    """
+    store = AssetStore(tmp_path / "store", mode=mode)
+    dest = tmp_path / "build.sh"
+    assert store.materialize(b"echo", dest, executable=True) in (("reflink", "copy") if mode == "auto" else (mode,))
+    assert dest.read_bytes() == b"echo"
+    assert os.access(dest, os.X_OK)
+    assert dest.stat().st_nlink == 1
+    with pytest.raises(FileExistsError):
+        store.materialize(b"echo", dest)
+
+
+def _assert_intact(store):
+    """
+    Checks that every store file still matches its content-addressed name.
+    """
+    for path in store.root.rglob("*"):
+        if path.is_file():
+            assert hashlib.sha256(path.read_bytes()).hexdigest() == path.name.removesuffix(".x")
+
+
+def test_edit_linked_file_keeps_store(tmp_path):
+    """
+    Test that editing a materialized file changes neither the store nor other copies.
+    """
+    store = AssetStore(tmp_path / "store")
+    a, b = tmp_path / "a.png", tmp_path / "b.png"
+    store.materialize(b"logo", a)
+    store.materialize(b"logo", b)
+    with open(a, "ab") as f:
+        f.write(b" edited")
+    assert store.put(b"logo").read_bytes() == b"logo"
+    assert b.read_bytes() == b"logo"
+    _assert_intact(store)
+
+
+def test_write_plan_links_static_files(tmp_path):
+    """
+    Test that only static files of a plan are materialized from the store.
+    """
+    store = AssetStore(tmp_path / "store")
+    plan = ProjectPlan.build([], {"main.tex": "x", "logo.png": b"png"}, static=["logo.png", "missing"])
+    assert plan.static == {"logo.png"}
+    for name in ("A", "B"):
+        write_plan(plan, tmp_path / name, store=store)
+    assert (tmp_path / "A" / "logo.png").read_bytes() == (tmp_path / "B" / "logo.png").read_bytes() == b"png"
+    assert list(store.root.rglob("*.*")) == []
+    assert store.path(hashlib.sha256(b"png").hexdigest()).exists()
+    assert not store.path(hashlib.sha256(b"x").hexdigest()).exists()
+
+
+def test_make_project_link_assets(tmp_path, cfg, monkeypatch):
+    """
+    Test that only assets go through the store and that editing project files keeps the store intact.
+    """
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+    store = AssetStore(tmp_path / "store")
+    for name in ("A", "B"):
+        make_project(name, proj_path=tmp_path, link_assets=store)
+
+    logo = tmp_path / "A" / "figures" / "logo.png"
+    assert logo.read_bytes() == b"\x89PNG\r\n\x1a\n"
+    stored = {p.read_bytes() for p in store.root.rglob("*") if p.is_file()}
+    assert b"STATIC TITLE PAGE" not in stored and b"ABSTRACT" not in stored
+
+    for path in (tmp_path / "A" / "chapters" / "abstract.tex", logo):
+        with open(path, "ab") as f:
+            f.write(b"edited")
+    assert (tmp_path / "B" / "chapters" / "abstract.tex").read_text() == "ABSTRACT"
+    assert (tmp_path / "B" / "figures" / "logo.png").read_bytes() == b"\x89PNG\r\n\x1a\n"
+    _assert_intact(store)
@@ -0,0 +1,74 @@
+"""
+test_styles.py
+
+Tests for the beauti_tex.styles registry and style selection.
+"""
+
+import pytest
+from beauti_tex.config import Config
+from beauti_tex.output import MemoryBackend
+from beauti_tex.proj_builder import make_projects
+from beauti_tex.styles import DEFAULT_STYLE, PACKAGE_TEMPLATES, StyleRegistry
+
+
+def _style(root, name, main):
+    folder = root / name
+    folder.mkdir(parents=True)
+    (folder / "main.tex").write_text(main)
+    (folder / "titlepage.tex").write_text("<<TITLE>>")
+    return folder
+
+
+def test_discovery_and_priority(tmp_path):
+    """
+    Test that styles are found in all roots, later roots win and lookups ignore case.
+    """
+    _style(tmp_path / "a", "thesis", "A")
+    _style(tmp_path / "b", "thesis", "B")
+    _style(tmp_path / "b", "letter", "L")
+    (tmp_path / "b" / "notes").mkdir()
+    registry = StyleRegistry([tmp_path / "a", tmp_path / "b", tmp_path / "missing"])
+
+    styles = registry.styles()
+    assert sorted(styles) == [DEFAULT_STYLE, "letter", "thesis"]
+    assert styles[DEFAULT_STYLE].path == PACKAGE_TEMPLATES.absolute()
+    assert registry.get("Thesis").path == (tmp_path / "b" / "thesis").absolute()
+    assert registry.get("thesis").files == {"main.tex", "titlepage.tex"}
+    with pytest.raises(ValueError, match="available"):
+        registry.get("ieee")
+
+
+def test_index_is_not_rescanned(tmp_path):
+    """
+    Test that folders are scanned once until the registry is refreshed.
+    """
+    _style(tmp_path, "lab", "x")
+    registry = StyleRegistry([tmp_path])
+    assert registry.get("lab").files == {"main.tex", "titlepage.tex"}
+    _style(tmp_path, "ieee", "y")
+    (tmp_path / "lab" / "extra.tex").write_text("")
+    assert "ieee" not in registry.styles()
+    assert "extra.tex" not in registry.get("lab").files
+    registry.refresh()
+    assert "ieee" in registry.styles()
+    assert "extra.tex" in registry.get("lab").files
+
+
+def test_batch_switches_styles(tmp_path, monkeypatch):
+    """
+    Test that the style of each spec selects its template set.
+    """
+    _style(tmp_path / "styles", "letter", "LETTER <<CLAS>>")
+    registry = StyleRegistry([tmp_path / "styles"])
+    monkeypatch.setattr("beauti_tex.proj_builder.registry", registry)
+    cfg = Config(["figures"], ["intro"], DEFAULT_STYLE, PACKAGE_TEMPLATES, 12, "report", {})
+    monkeypatch.setattr("beauti_tex.proj_builder.get_config", lambda path=None: cfg)
+
+    backend = MemoryBackend()
+    results = make_projects([{"name": "A"}, {"name": "B", "style": "letter"}, {"name": "C", "style": "nope"}],
+                            backend=backend)
+    assert [r.ok for r in results] == [True, True, False]
+    assert "\\documentclass" in backend.files["A/main.tex"]
+    assert backend.files["B/main.tex"] == "LETTER report"
+    # optional files missing in the style come from the packaged templates
+    assert backend.files["B/chapters/abstract.tex"] == backend.files["A/chapters/abstract.tex"]
@@ -0,0 +1,110 @@
+"""
+test_tables.py
+
+Tests for the beauti_tex.latex.tables module and the `table` CLI command.
+"""
+
+import sys
+import pytest
+from beauti_tex import cli
+from beauti_tex.latex.tables import csv_to_table, escape_cells
+
+CSV = 'Name,Share %,Count\nA&B,"1,5",3\n"multi\nline",2.5,\nx_y,-1e3,7,extra\n'
+
+
+def test_escape_cells():
+    """
+    Test batch escaping, line breaks and cells containing the internal separator.
+    """
+    assert escape_cells(["a&b", "50%", "x\ny"]) == ["a\\&b", "50\\%", "x y"]
+    assert escape_cells(["a\x1fb", "_"]) == ["a\x1fb", "\\_"]
+    assert escape_cells([]) == []
+
+
+def test_longtable(tmp_path):
+    """
+    Test header, escaping, numeric alignment and padding of short and long rows.
+    """
+    source = tmp_path / "data.csv"
+    source.write_text(CSV)
+    dest = tmp_path / "tables" / "data.tex"
+    result = csv_to_table(source, dest, caption="Data", label="tab:data")
+    assert result.rows == 3 and result.files == [dest]
+    text = dest.read_text()
+    assert "\\begin{longtable}{lrr}\n\\caption{Data}\\label{tab:data} \\\\\n" in text
+    assert text.count("Name & Share \\% & Count \\\\") == 2  # first head and continued head
+    assert "A\\&B & 1,5 & 3 \\\\\nmulti line & 2.5 &  \\\\\nx\\_y & -1e3 & 7 \\\\\n" in text
+    assert text.endswith("\\end{longtable}\n")
+    assert not list(tmp_path.glob("tables/.*"))
+
+
+def test_tabular_landscape(tmp_path):
+    """
+    Test the tabular float style, explicit alignment and landscape.
+    """
+    source = tmp_path / "data.csv"
+    source.write_text("1;2\n3;4\n")
+    dest = tmp_path / "t.tex"
+    csv_to_table(source, dest, style="tabular", header=False, align="l|p{2cm}", landscape=True, delimiter=";")
+    text = dest.read_text()
+    assert "\\begin{landscape}\n\\begin{table}[htbp]\n\\centering\n\\begin{tabular}{l|p{2cm}}\n\\toprule\n1 & 2 \\\\\n" in text
+    assert text.endswith("\\bottomrule\n\\end{tabular}\n\\end{table}\n\\end{landscape}\n")
+
+
+def test_chunks(tmp_path):
+    """
+    Test that large tables are split into chunk files that the output inputs.
+    """
+    source = tmp_path / "big.csv"
+    source.write_text("n\n" + "".join(f"{i}\n" for i in range(2500)))
+    dest = tmp_path / "tables" / "big.tex"
+    result = csv_to_table(source, dest, chunk_rows=1000, caption="Big", relative_to=tmp_path)
+    assert result.rows == 2500
+    assert [p.name for p in result.files] == ["big.tex", "big-001.tex", "big-002.tex", "big-003.tex"]
+    assert dest.read_text().splitlines()[1:] == [f"\\input{{tables/big-00{i}}}" for i in (1, 2, 3)]
+    last = result.files[-1].read_text()
+    assert "\\caption*{Big (continued)}" in last and last.count(" \\\\\n") == 3 + 500
+    assert "\\label" not in last
+
+
+def test_rerun_removes_stale_chunks(tmp_path):
+    """
+    Test that a shorter rerun removes the extra chunk files and leaves no temporary files.
+    """
+    source = tmp_path / "big.csv"
+    source.write_text("n\n" + "".join(f"{i}\n" for i in range(2500)))
+    dest = tmp_path / "big.tex"
+    csv_to_table(source, dest, chunk_rows=500)
+    (tmp_path / "big-notes.tex").write_text("mine")
+    result = csv_to_table(source, dest, chunk_rows=1000)
+    assert sorted(p.name for p in tmp_path.glob("big*.tex")) == ["big-001.tex", "big-002.tex", "big-003.tex", "big-notes.tex", "big.tex"]
+    assert result.files[-1].read_text().count(" \\\\\n") == 2 + 500
+    csv_to_table(source, dest)
+    assert sorted(p.name for p in tmp_path.glob("big*.tex")) == ["big-notes.tex", "big.tex"]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_errors(tmp_path):
+    """
+    Test unknown styles, invalid chunk sizes and empty files.
+    """
+    source = tmp_path / "empty.csv"
+    source.write_text("")
+    with pytest.raises(ValueError, match="style"):
+        csv_to_table(source, tmp_path / "t.tex", style="fancy")
+    with pytest.raises(ValueError, match="chunk_rows"):
+        csv_to_table(source, tmp_path / "t.tex", chunk_rows=0)
+    with pytest.raises(ValueError, match="no rows"):
+        csv_to_table(source, tmp_path / "t.tex")
+
+
+def test_table_cli(tmp_path, monkeypatch, capsys):
+    """
+    Test that the `table` command writes into tables/ by default.
+    """
+    (tmp_path / "results.csv").write_text(CSV)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["prog", "table", "results.csv", "--caption", "Results"])
+    cli.main()
+    assert (tmp_path / "tables" / "results.tex").is_file()
+    assert "Wrote 3 rows to tables/results.tex." in capsys.readouterr().out
@@ -0,0 +1,45 @@
+"""
+test_template.py
+
+Tests for the beauti_tex.latex.template module.
+"""
+
+import pytest
+from beauti_tex.latex import Template, TemplateError, escape_tex
+
+
+def test_render_reuses_compiled_template():
+    """
+    Test that a compiled template renders repeatedly in one pass
+    and handles repeated and adjacent placeholders.
+    """
+    t = Template("<<A>><<B>> and <<A>>!")
+    assert t.placeholders == {"A", "B"}
+    assert t.render({"A": 1, "B": "x"}) == "1x and 1!"
+    assert t.render({"A": "y", "B": ""}) == "y and y!"
+    # values are not scanned for placeholders again
+    assert t.render({"A": "<<B>>", "B": "z"}) == "<<B>>z and <<B>>!"
+
+
+def test_missing_and_unknown_placeholders():
+    """
+    Test that missing and unknown placeholders are reported.
+    """
+    t = Template(r"\documentclass[<<SIZE>>]{<<CLAS>>}")
+    with pytest.raises(TemplateError) as err:
+        t.render({"SIZE": 12})
+    assert err.value.missing == {"CLAS"}
+
+    context = {"SIZE": 12, "CLAS": "report", "TITLE": "x"}
+    assert t.unknown(context) == {"TITLE"}
+    assert t.render(context) == r"\documentclass[12]{report}"
+    with pytest.raises(TemplateError) as err:
+        t.render(context, strict=True)
+    assert err.value.unknown == {"TITLE"}
+
+
+def test_escape_tex():
+    """
+    Test escaping of LaTeX special characters.
+    """
+    assert escape_tex("Smith & Sons_1 50%") == r"Smith \& Sons\_1 50\%"
@@ -42,4 +42,35 @@ def test_valid_name(name, expected):
     Asserts:
         The output of `safe_name(name)` matches `expected`.
     """
-    assert safe_name(name) == expected
\ No newline at end of file
+    assert safe_name(name) == expected
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        (".", "empty"),
+        ("...", "empty"),
+        ("a\tb", "a_b"),
+        ("CON", "CON_"),
+        ("lpt1.tex", "lpt1_.tex"),
+        ("CONSOLE", "CONSOLE"),
+        ("Müller", "Müller"),
+    ],
+)
+def test_safe_name_edge_cases(name, expected):
+    """
+    Test names that reduce to empty, control characters, reserved Windows names and NFC normalization.
+    """
+    assert safe_name(name) == expected
+
+
+def test_safe_names_resolves_collisions():
+    """
+    Test that `safe_names` makes sanitized names unique, ignoring case by default.
+    """
+    from beauti_tex.utils import safe_names
+    names = ["Anna Meier", "anna meier", "Anna_Meier", "anna meier_2", "", "."]
+    assert safe_names(names) == [
+        "Anna_Meier", "anna_meier_2", "Anna_Meier_3", "anna_meier_2_2", "empty", "empty_2",
+    ]
+    assert safe_names(["A", "a", "A"], case_sensitive=True) == ["A", "a", "A_2"]
+    assert safe_names(iter([])) == []